@@ -5,9 +5,12 @@ import json
 import os
 import re
 import time
+from collections.abc import Mapping
 from pathlib import Path
 from urllib.parse import urlparse
 
+from core.file_durability import DURABILITY_CACHED, flush_deferred_writes, write_bytes_atomic
+from core.logger import logger
 from core.runtime_paths import ensure_runtime_dir, resolve_icon_path_value
 
 try:
@@ -33,7 +36,6 @@ AUTO_ICON_INDEX_VERSION = 1
 WEB_FAILURE_RETRY_SECONDS = 24 * 60 * 60
 
 _AUTO_ICON_INDEX = None
-_AUTO_ICON_INDEX_DIRTY = False
 _LOCAL_SIDECAR_CACHE = {}
 
 
@@ -42,7 +44,7 @@ def _normalize_path_text(value) -> str:
 
 
 def is_web_tool(tool) -> bool:
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return False
     path = _normalize_path_text(tool.get("path"))
     url = _normalize_path_text(tool.get("url"))
@@ -54,7 +56,7 @@ def is_web_tool(tool) -> bool:
 
 
 def get_tool_url(tool) -> str:
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return ""
 
     for field_name in ("path", "url"):
@@ -89,10 +91,9 @@ def get_auto_icon_index_path() -> Path:
 
 
 def clear_auto_icon_index_cache() -> None:
-    global _AUTO_ICON_INDEX, _AUTO_ICON_INDEX_DIRTY
+    global _AUTO_ICON_INDEX
     flush_auto_icon_index()
     _AUTO_ICON_INDEX = None
-    _AUTO_ICON_INDEX_DIRTY = False
     _LOCAL_SIDECAR_CACHE.clear()
 
 
@@ -119,31 +120,30 @@ def _load_index() -> dict:
     return _AUTO_ICON_INDEX
 
 
+def _encode_index(index: dict) -> bytes:
+    return json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+
+
 def _save_index(index: dict) -> None:
+    # 索引可由图标缓存重新生成：按 cached 等级登记，由 flush_auto_icon_index() 或退出时合并写出，
+    # 序列化也推迟到写出时，写出失败由 flush_deferred_writes() 记录日志
     try:
-        path = get_auto_icon_index_path()
-        path.parent.mkdir(parents=True, exist_ok=True)
-        payload = json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True)
-        path.write_text(payload, encoding="utf-8")
-    except Exception:
-        pass
+        write_bytes_atomic(get_auto_icon_index_path(), lambda: _encode_index(index), DURABILITY_CACHED)
+    except OSError as e:
+        logger.warning("保存自动图标索引失败: %s", str(e))
 
 
 def _mark_index_dirty() -> None:
-    global _AUTO_ICON_INDEX_DIRTY
-    _AUTO_ICON_INDEX_DIRTY = True
+    if _AUTO_ICON_INDEX is not None:
+        _save_index(_AUTO_ICON_INDEX)
 
 
 def flush_auto_icon_index() -> None:
-    global _AUTO_ICON_INDEX_DIRTY
-    if not _AUTO_ICON_INDEX_DIRTY or _AUTO_ICON_INDEX is None:
-        return
-    _save_index(_AUTO_ICON_INDEX)
-    _AUTO_ICON_INDEX_DIRTY = False
+    flush_deferred_writes((get_auto_icon_index_path(),))
 
 
 def get_tool_icon_identity(tool) -> str:
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return ""
     parts = (
         _normalize_path_text(tool.get("name")).casefold(),
@@ -169,7 +169,7 @@ def _existing_file(path_text) -> str:
 
 
 def resolve_cached_auto_icon_path(tool) -> str:
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return ""
 
     index = _load_index()
@@ -194,7 +194,7 @@ def resolve_cached_auto_icon_path(tool) -> str:
 
 def record_auto_icon_path(tool, icon_path, source: str) -> str:
     resolved = _existing_file(icon_path)
-    if not isinstance(tool, dict) or not resolved:
+    if not isinstance(tool, Mapping) or not resolved:
         return ""
 
     index = _load_index()
@@ -221,7 +221,7 @@ def record_auto_icon_path(tool, icon_path, source: str) -> str:
 
 
 def mark_auto_icon_failure(tool, source: str) -> None:
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return
     source_key = str(source or "auto").casefold()
     if source_key == "web":
@@ -293,7 +293,7 @@ def _resolve_local_path(path_text: str) -> Path | None:
 
 
 def resolve_local_sidecar_icon_path(tool) -> str:
-    if not isinstance(tool, dict) or is_web_tool(tool):
+    if not isinstance(tool, Mapping) or is_web_tool(tool):
         return ""
 
     candidate = _resolve_local_path(tool.get("path"))
@@ -345,7 +345,7 @@ def resolve_local_sidecar_icon_path(tool) -> str:
 
 
 def resolve_known_tool_icon_path(tool) -> str:
-    if not isinstance(tool, dict) or iter_tianhu_icon_names is None:
+    if not isinstance(tool, Mapping) or iter_tianhu_icon_names is None:
         return ""
 
     seen = set()
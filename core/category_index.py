@@ -0,0 +1,125 @@
+import os
+import re
+
+
+def _slugify_file_part(value):
+    text = str(value or '').strip().lower()
+    text = re.sub(r'\s+', '_', text)
+    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    text = re.sub(r'[^a-z0-9_\-]+', '', text)
+    text = text.strip('_-')
+    return text or 'category'
+
+
+def _name_key(value):
+    return str(value or '').strip().casefold()
+
+
+class CategoryIndex:
+    """分类与子分类的查找表，由 ``DataManager.get_category_index()`` 按分类数据版本缓存。
+
+    构建时遍历一次全部分类和子分类，之后按 id、名称（去除首尾空白并忽略大小写）或拆分文件查找
+    都只是字典访问。分类被保存或从磁盘重新加载后 DataManager 会构建新的索引；索引中的记录与
+    ``load_categories()`` 返回的是同一批对象，只用于读取。
+    """
+
+    def __init__(self, categories, tools_split_dir=None, version=0):
+        self.categories = categories
+        self.version = version
+        self.categories_by_id = {}
+        # 子分类 id -> (所属分类, 子分类)
+        self.subcategories_by_id = {}
+        self.max_category_id = None
+        self.max_subcategory_id = None
+        self._category_ids_by_name = {}
+        self._subcategory_ids_by_name = {}
+        self._labels = None
+
+        for category in categories or []:
+            if not isinstance(category, dict) or category.get('id') is None:
+                continue
+            category_id = category['id']
+            self.categories_by_id[category_id] = category
+            self._category_ids_by_name.setdefault(_name_key(category.get('name')), category_id)
+            self.max_category_id = _max_id(self.max_category_id, category_id)
+            for subcategory in category.get('subcategories', []) or []:
+                if not isinstance(subcategory, dict) or subcategory.get('id') is None:
+                    continue
+                subcategory_id = subcategory['id']
+                self.subcategories_by_id[subcategory_id] = (category, subcategory)
+                self._subcategory_ids_by_name.setdefault(
+                    (category_id, _name_key(subcategory.get('name'))),
+                    subcategory_id,
+                )
+                self.max_subcategory_id = _max_id(self.max_subcategory_id, subcategory_id)
+
+        # 分类 id -> 拆分文件路径（按优先级排序，NN_slug_<分类id>.json），以及反向映射
+        self.split_files = {}
+        self._category_ids_by_split_file = {}
+        if tools_split_dir:
+            ordered_categories = sorted(
+                self.categories_by_id.values(),
+                key=lambda cat: (cat.get('priority', 9999), cat.get('id', 9999))
+            )
+            for category in ordered_categories:
+                category_id = category['id']
+                file_name = f"{int(category.get('priority', 99)):02d}_{_slugify_file_part(category.get('name'))}_{category_id}.json"
+                file_path = os.path.abspath(os.path.join(tools_split_dir, file_name))
+                self.split_files[category_id] = file_path
+                self._category_ids_by_split_file[file_path] = category_id
+
+    def category(self, category_id):
+        return self.categories_by_id.get(category_id)
+
+    def subcategory(self, subcategory_id):
+        """返回 (所属分类, 子分类)，不存在时返回 None。"""
+        return self.subcategories_by_id.get(subcategory_id)
+
+    def subcategory_name(self, subcategory_id, default=''):
+        entry = self.subcategories_by_id.get(subcategory_id)
+        return entry[1].get('name', default) if entry is not None else default
+
+    def category_name(self, category_id, default=''):
+        category = self.categories_by_id.get(category_id)
+        return category.get('name', default) if category is not None else default
+
+    def category_id_for_name(self, name):
+        return self._category_ids_by_name.get(_name_key(name))
+
+    def subcategory_id_for_name(self, category_id, name):
+        return self._subcategory_ids_by_name.get((category_id, _name_key(name)))
+
+    def split_file_for(self, category_id):
+        return self.split_files.get(category_id)
+
+    def category_id_for_split_file(self, file_path):
+        return self._category_ids_by_split_file.get(os.path.abspath(file_path))
+
+    @property
+    def labels(self):
+        """{(分类 id, None): 分类名, (分类 id, 子分类 id): "分类名 / 子分类名"}，首次访问时生成。"""
+        if self._labels is None:
+            labels = {}
+            for category_id, category in self.categories_by_id.items():
+                category_name = str(category.get('name') or '未命名分类').strip()
+                labels[(category_id, None)] = category_name
+                for subcategory in category.get('subcategories', []) or []:
+                    if not isinstance(subcategory, dict) or subcategory.get('id') is None:
+                        continue
+                    subcategory_name = str(subcategory.get('name') or '未命名子分类').strip()
+                    labels[(category_id, subcategory['id'])] = f"{category_name} / {subcategory_name}"
+            self._labels = labels
+        return self._labels
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(version={self.version}, categories={len(self.categories_by_id)}, "
+            f"subcategories={len(self.subcategories_by_id)})"
+        )
+
+
+def _max_id(current, value):
+    try:
+        return value if current is None or value > current else current
+    except TypeError:
+        return current
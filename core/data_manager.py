@@ -1,18 +1,59 @@
+import configparser
+import hashlib
 import os
 import re
 import shutil
-import tempfile
+import sqlite3
+import threading
 import json as std_json
+from contextlib import contextmanager
 from datetime import datetime
+from core.category_index import CategoryIndex
+from core.file_durability import (
+    DURABILITY_NORMAL,
+    DURABILITY_STRICT,
+    flush_deferred_writes,
+    write_bytes_atomic,
+)
 from core.icon_validation import is_valid_icon_file
+from core.json_stream import iter_json_records
 from core.logger import logger
 from core.runtime_paths import (
     get_bundle_path,
     get_runtime_path,
-    resolve_accessible_path_value,
-    resolve_configured_path_value,
+    is_accessible_path_value_missing,
     resolve_icon_path_value,
 )
+from core.tool_cache_index import ToolCacheIndex
+from core.tool_concurrency import (
+    ToolsStorageLock,
+    get_tools_lock_path,
+    merge_tool_records,
+    read_tools_generation,
+)
+from core.tool_record import ToolLibraryView, tool_record_hash
+from core.tool_storage_sqlite import SQLITE_STORE_FILE_NAME, SqliteToolStore
+from core.tool_snapshot import (
+    build_tools_normalization,
+    get_tools_snapshot_path,
+    load_tools_snapshot,
+    write_tools_snapshot,
+)
+from core.tool_usage_store import (
+    ToolUsageStore,
+    apply_tool_usage,
+    get_tool_usage_path,
+    get_tool_usage_state_token,
+    read_tool_usage,
+)
+from core.tool_write_behind import ToolsWriteBehind
+from core.tool_journal import (
+    ToolsJournal,
+    get_tools_journal_path,
+    get_tools_journal_state_token,
+    read_tools_journal_entries,
+    replay_tools_journal,
+)
 
 # 使用更快的JSON解析库orjson
 try:
@@ -26,6 +67,52 @@ except ImportError:
         import json
 
 
+# 超过该大小的工具文件改为流式解析
+STREAMING_JSON_MIN_BYTES = 8 * 1024 * 1024
+
+STORAGE_BACKEND_JSON = "json"
+STORAGE_BACKEND_SQLITE = "sqlite"
+STORAGE_BACKENDS = (STORAGE_BACKEND_JSON, STORAGE_BACKEND_SQLITE)
+
+
+def _read_data_settings(config_dir):
+    """读取 settings.ini；文件不存在或无法解析时返回 None。"""
+    settings_file = os.path.join(config_dir, "settings.ini")
+    if not os.path.isfile(settings_file):
+        return None
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    try:
+        parser.read(settings_file, encoding='utf-8')
+    except (configparser.Error, OSError, UnicodeDecodeError) as e:
+        logger.warning("读取数据存储配置失败，使用默认配置: %s", str(e))
+        return None
+    return parser
+
+
+def _read_storage_backend_setting(config_dir):
+    """读取 settings.ini 中 [data] storage_backend，缺省或无效时使用 JSON 存储。"""
+    parser = _read_data_settings(config_dir)
+    if parser is None:
+        return STORAGE_BACKEND_JSON
+    value = parser.get('data', 'storage_backend', fallback=STORAGE_BACKEND_JSON).strip().lower()
+    if value not in STORAGE_BACKENDS:
+        logger.warning("未知的存储后端 %s，使用 JSON 存储", value)
+        return STORAGE_BACKEND_JSON
+    return value
+
+
+def _read_write_behind_setting(config_dir):
+    """读取 settings.ini 中 [data] write_behind，默认关闭。"""
+    parser = _read_data_settings(config_dir)
+    if parser is None:
+        return False
+    try:
+        return parser.getboolean('data', 'write_behind', fallback=False)
+    except ValueError:
+        logger.warning("无效的 write_behind 配置，已关闭后台写入")
+        return False
+
+
 def _load_default_data_payload(file_name, root_key, fallback_records):
     template_path = os.fspath(get_bundle_path("data", file_name))
     if os.path.exists(template_path) and os.path.getsize(template_path) > 0:
@@ -42,7 +129,13 @@ def _load_default_data_payload(file_name, root_key, fallback_records):
 
 
 def _load_json_records(file_path, root_key='tools'):
-    """从 JSON 文件中读取列表记录，兼容纯列表和带根键的对象结构。"""
+    """从 JSON 文件中读取列表记录，兼容纯列表和带根键的对象结构。
+
+    不小于 STREAMING_JSON_MIN_BYTES 的文件逐条流式解析，不再先把整个文件读成字符串，
+    峰值内存约为解析结果本身；较小的文件整体解析更快。
+    """
+    if os.path.getsize(file_path) >= STREAMING_JSON_MIN_BYTES:
+        return list(iter_json_records(file_path, root_key))
     with open(file_path, 'r', encoding='utf-8') as f:
         file_content = f.read()
         data = json.loads(file_content)
@@ -77,8 +170,7 @@ def _get_active_split_tool_files(tools_split_dir):
     ]
 
 
-def _get_tools_state_token(tools_file, tools_split_dir):
-    """返回工具数据状态令牌，用于缓存失效判断。"""
+def _get_tools_base_state_token(tools_file, tools_split_dir):
     if os.path.isfile(tools_file) and os.path.getsize(tools_file) > 0:
         return (
             (tools_file, os.path.getmtime(tools_file), os.path.getsize(tools_file)),
@@ -94,26 +186,52 @@ def _get_tools_state_token(tools_file, tools_split_dir):
     return ()
 
 
-def _load_tools_from_storage(tools_file, tools_split_dir):
-    """Load tools from disk using the aggregate file as the primary source."""
+def _get_tools_state_token(tools_file, tools_split_dir):
+    """返回工具数据状态令牌，用于缓存失效判断。"""
+    token = _get_tools_base_state_token(tools_file, tools_split_dir)
+    journal_token = get_tools_journal_state_token(get_tools_journal_path(tools_file))
+    if journal_token is not None:
+        token += (journal_token,)
+    usage_token = get_tool_usage_state_token(get_tool_usage_path(tools_file))
+    if token and usage_token is not None:
+        token += (usage_token,)
+    return token
+
+
+def _get_split_file_category_id(file_path):
+    """从拆分文件名 NN_slug_<分类id>.json 中解析分类 id；99_uncategorized.json 等返回 None。"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    _, _, suffix = stem.rpartition('_')
+    try:
+        return int(suffix)
+    except ValueError:
+        return None
+
+
+def _load_tools_base_records(tools_file, tools_split_dir, on_split_file_loaded=None):
     if os.path.isfile(tools_file) and os.path.getsize(tools_file) > 0:
         return _load_json_records(tools_file)
+    return _load_tools_from_split_storage(tools_split_dir, on_split_file_loaded)
 
-    active_split_files = _get_active_split_tool_files(tools_split_dir)
-    if active_split_files:
-        tools = []
-        for file_path in active_split_files:
-            tools.extend(_load_json_records(file_path))
-        return tools
 
-    return []
+def _load_tools_from_storage(tools_file, tools_split_dir, on_split_file_loaded=None):
+    """Load tools from disk using the aggregate file as the primary source, replay the journal, then merge usage stats.
+
+    on_split_file_loaded(file_path, records) is called after each split file is parsed when the aggregate file is missing.
+    """
+    tools = _load_tools_base_records(tools_file, tools_split_dir, on_split_file_loaded)
+    tools = replay_tools_journal(tools, read_tools_journal_entries(get_tools_journal_path(tools_file)))
+    return apply_tool_usage(tools, read_tool_usage(get_tool_usage_path(tools_file)))
 
 
-def _load_tools_from_split_storage(tools_split_dir):
+def _load_tools_from_split_storage(tools_split_dir, on_split_file_loaded=None):
     """Load tools from split files only, without falling back to the aggregate file."""
     tools = []
     for file_path in _get_active_split_tool_files(tools_split_dir):
-        tools.extend(_load_json_records(file_path))
+        records = _load_json_records(file_path)
+        if on_split_file_loaded is not None:
+            on_split_file_loaded(file_path, records)
+        tools.extend(records)
     return tools
 
 
@@ -123,31 +241,12 @@ def _serialize_json(data):
     return std_json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
 
 
-def _write_json_file(file_path, data):
-    target_path = os.path.abspath(file_path)
-    target_dir = os.path.dirname(target_path)
-    os.makedirs(target_dir, exist_ok=True)
-    payload = _serialize_json(data)
-    temp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            'wb',
-            delete=False,
-            dir=target_dir,
-            prefix=f".{os.path.basename(target_path)}.",
-            suffix=".tmp",
-        ) as f:
-            temp_path = f.name
-            f.write(payload)
-            f.flush()
-            os.fsync(f.fileno())
-        os.replace(temp_path, target_path)
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
+def _write_json_file(file_path, data, durability=DURABILITY_STRICT):
+    return _write_json_payload(file_path, _serialize_json(data), durability)
+
+
+def _write_json_payload(file_path, payload, durability=DURABILITY_STRICT):
+    return write_bytes_atomic(file_path, payload, durability)
 
 
 def _should_wrap_records(file_path, root_key='tools', default_wrap=False):
@@ -164,32 +263,66 @@ def _should_wrap_records(file_path, root_key='tools', default_wrap=False):
     return default_wrap
 
 
-def _slugify_file_part(value):
-    text = str(value or '').strip().lower()
-    text = re.sub(r'\s+', '_', text)
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
-    text = re.sub(r'[^a-z0-9_\-]+', '', text)
-    text = text.strip('_-')
-    return text or 'category'
+_RECORD_HASH_MODULUS = 1 << 128
+
+
+def _tool_records_fingerprint(record_hashes):
+    """与记录顺序无关的多重集指纹：记录数、哈希之和（取模）与哈希异或。"""
+    count = 0
+    total = 0
+    mixed = 0
+    for value in record_hashes:
+        count += 1
+        total = (total + value) % _RECORD_HASH_MODULUS
+        mixed ^= value
+    return count, total, mixed
 
 
-def _canonical_tool_record_payload(tool):
-    return std_json.dumps(tool, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+def _get_file_state(path):
+    """文件的 (mtime_ns, size)；不存在或无法访问时为 None。"""
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _unmatched_tool_records(tools, record_hashes, other_hashes):
+    """返回 tools 中在 other_hashes 里找不到对应（按出现次数）的记录。"""
+    available = {}
+    for value in other_hashes:
+        available[value] = available.get(value, 0) + 1
+    unmatched = []
+    for tool, value in zip(tools, record_hashes):
+        if available.get(value, 0) > 0:
+            available[value] -= 1
+        else:
+            unmatched.append(tool)
+    return unmatched
 
 
-def _canonical_tool_record_list(tools):
-    return sorted(
-        _canonical_tool_record_payload(tool)
-        for tool in (tools or [])
-        if isinstance(tool, dict)
-    )
+def _describe_tool_records(tools, limit=20):
+    return [{'id': tool.get('id'), 'name': tool.get('name') or '未命名工具'} for tool in tools[:limit]]
 
 
 class DataManager:
     """数据管理器，负责处理工具分类和工具数据的存储与读取"""
     DEPRECATED_TOOL_FIELDS = ("tags",)
-    def __init__(self, config_dir=None, data_dir=None):
-        """初始化数据管理器"""
+    TOOLS_JOURNAL_COMPACT_THRESHOLD = 200
+    # 各类数据文件的持久性等级（见 core.file_durability）：聚合工具库和分类是权威数据，每次写入都 fsync；
+    # 首次生成的模板文件丢了会重新生成；拆分镜像可随时从聚合文件重建，只保证原子替换
+    TOOLS_FILE_DURABILITY = DURABILITY_STRICT
+    CATEGORIES_FILE_DURABILITY = DURABILITY_STRICT
+    DEFAULT_FILE_DURABILITY = DURABILITY_NORMAL
+    SPLIT_MIRROR_DURABILITY = DURABILITY_NORMAL
+    USAGE_FILE_DURABILITY = DURABILITY_NORMAL
+    WRITE_BEHIND_COALESCE_SECONDS = 0.25
+
+    def __init__(self, config_dir=None, data_dir=None, storage_backend=None, write_behind=None):
+        """初始化数据管理器
+
+        storage_backend / write_behind 为 None 时读取 settings.ini 中 [data] 的同名配置。
+        """
         if config_dir is not None:
             self.config_dir = os.path.abspath(config_dir)
             self.data_dir = os.path.join(self.config_dir, "data")
@@ -203,22 +336,70 @@ class DataManager:
         self.categories_file = os.path.join(self.data_dir, "categories.json")
         self.tools_file = os.path.join(self.data_dir, "tools.json")
         self.tools_split_dir = os.path.join(self.data_dir, "tools")
+        self.tools_journal = ToolsJournal(get_tools_journal_path(self.tools_file))
+        self.usage_store = ToolUsageStore(get_tool_usage_path(self.tools_file), durability=self.USAGE_FILE_DURABILITY)
+        self.tools_snapshot_path = get_tools_snapshot_path(self.config_dir)
+        # 多个实例（或脚本）共享同一数据目录时，所有写入都在这把跨进程锁内完成
+        self.storage_lock = ToolsStorageLock(get_tools_lock_path(self.data_dir))
 
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
         self._initialize_default_files()
 
+        if storage_backend is None:
+            storage_backend = _read_storage_backend_setting(self.config_dir)
+        self.storage_backend = storage_backend if storage_backend in STORAGE_BACKENDS else STORAGE_BACKEND_JSON
+        self.sqlite_store = None
+        if self.storage_backend == STORAGE_BACKEND_SQLITE:
+            self._open_sqlite_store()
+
+        # 后台写入只用于 JSON 存储；SQLite 的整库替换本身就在单个事务里完成。
+        if write_behind is None:
+            write_behind = _read_write_behind_setting(self.config_dir)
+        self._persist_lock = threading.RLock()
+        self.write_behind = None
+        if write_behind and self.sqlite_store is None:
+            self.write_behind = ToolsWriteBehind(
+                self._write_tools_snapshot,
+                coalesce_window=self.WRITE_BEHIND_COALESCE_SECONDS,
+            )
+
         self._categories_cache = None
         self._tools_cache = None
         self._last_categories_modified = 0
         self._last_tools_modified = ()
-        self._category_tools_cache = {}
+        self._tools_index = None
+        self._tools_version = 0
+        self._categories_version = 0
+        self._category_index = None
+        self._tools_view = None
+        self._tools_view_source = None
+        self._tools_view_changes = None
+        self._lazy_category_tools = {}
+        self._split_file_digests = {}
+        self._dirty_split_categories = set()
         self._normalization_cache = None
         self._normalization_cache_key = None
+        self._type_label_lookup = {}
+        self._type_label_lookup_key = None
+        self._audit_fingerprint = None
+        self._audit_record_cache = {}
+        self._audit_icon_roots_state = None
+        self._audit_icon_cache = {}
         self._tools_load_thread = None
         self._tools_load_worker = None
         self._pending_usage_updates = {}
+        self._transaction_depth = 0
+        self._staged_tools = None
+        self._staged_categories = None
+        self._storage_watcher = None
+        self._tools_storage_changed = True
+        self._categories_storage_changed = True
+        self._tools_generation = 0
+        self._synced_tools = None
+        self._synced_storage_state = None
+        self._tools_write_merged = False
 
     def _initialize_default_files(self):
         """初始化默认的数据文件"""
@@ -230,36 +411,246 @@ class DataManager:
                     "categories",
                     self._create_default_categories(),
                 ),
+                self.DEFAULT_FILE_DURABILITY,
             )
         if not os.path.exists(self.tools_file):
             _write_json_file(
                 self.tools_file,
                 _load_default_data_payload("tools.json", "tools", []),
+                self.DEFAULT_FILE_DURABILITY,
             )
 
+    def _open_sqlite_store(self):
+        """打开 SQLite 存储；首次使用时从 tools.json / 拆分镜像和 categories.json 迁移一次。"""
+        store = SqliteToolStore(os.path.join(self.data_dir, SQLITE_STORE_FILE_NAME))
+        try:
+            if not store.is_migrated():
+                tools = self._strip_deprecated_tool_fields(
+                    _load_tools_from_storage(self.tools_file, self.tools_split_dir)
+                )
+                categories = self._read_categories_from_disk() if os.path.isfile(self.categories_file) else []
+                if store.migrate_from_records(tools, categories, source=self.tools_file):
+                    logger.info("已将 %s 个工具和 %s 个分类迁移到 SQLite 存储", len(tools), len(categories))
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.error("初始化 SQLite 存储失败，回退为 JSON 存储: %s", str(e))
+            store.close()
+            self.storage_backend = STORAGE_BACKEND_JSON
+            return
+        self.sqlite_store = store
+
+    def close_storage(self):
+        """写完后台队列并释放存储句柄（SQLite 连接），例如在备份 / 还原运行时数据之前；后续访问会重新打开。"""
+        self.flush_write_behind()
+        if self.sqlite_store is not None:
+            self.sqlite_store.close()
+
+    def flush_write_behind(self, timeout=None):
+        """等待后台写入落盘；后台写入失败时改为同步保存当前缓存。"""
+        if self.write_behind is None or (not self.write_behind.is_busy() and self.write_behind.last_error is None):
+            return True
+        if self.write_behind.flush(timeout):
+            return True
+        if self.write_behind.is_busy():
+            logger.warning("等待后台写入工具数据超时")
+            return False
+        logger.warning("后台写入工具数据失败，改为同步保存: %s", self.write_behind.last_error)
+        self.write_behind.last_error = None
+        return self._persist_tools(self._tools_cache) if self._tools_cache is not None else False
+
+    @staticmethod
+    def _copy_tools_snapshot(tools):
+        return [dict(tool) if isinstance(tool, dict) else tool for tool in tools or []]
+
+    def _prune_tool_usage(self, tools):
+        """整库保存时删除已不存在工具的使用统计。"""
+        try:
+            with self.storage_lock:
+                self.usage_store.reset()
+                self.usage_store.prune({tool.get('id') for tool in tools if isinstance(tool, dict)})
+        except OSError as e:
+            logger.warning("清理工具使用统计失败: %s", str(e))
+
+    def _submit_tools_write(self, tools):
+        """后台写入模式下保存整库：立即替换内存缓存，磁盘写入交给后台线程合并完成。"""
+        self._prune_tool_usage(tools)
+        with self._persist_lock:
+            if tools is not self._tools_cache:
+                self._set_tools_cache(tools, self._current_tools_state_token())
+            # 分类索引和已标记的脏分类在提交线程上取好：后台线程不读分类缓存，也不清空提交之后新标记的分类
+            context = {
+                'source_tools': tools,
+                'category_index': self.get_category_index(),
+                'dirty_split_categories': frozenset(self._dirty_split_categories),
+            }
+            self.write_behind.submit(self._copy_tools_snapshot(tools), context)
+        return True
+
+    def _write_tools_snapshot(self, snapshot, context):
+        """后台线程写入回调：写盘期间持有持久化锁，避免与变更日志追加交错。"""
+        with self._persist_lock:
+            if not self._write_tools_files(snapshot, category_index=context['category_index']):
+                return False
+            self._dirty_split_categories.difference_update(context['dirty_split_categories'])
+            if (
+                self._tools_cache is context['source_tools']
+                and not self._tools_write_merged
+                and not self.write_behind.has_pending()
+            ):
+                self._last_tools_modified = _get_tools_state_token(self.tools_file, self.tools_split_dir)
+        return True
+
+    def enable_file_watch(self):
+        """启用文件监视：文件没有变化时 load_tools / load_categories 直接返回内存缓存，不再逐个 stat。
+
+        只用于 JSON 存储，需要 PyQt5；不可用时返回 False 并保持按状态令牌比对。
+        """
+        if self._storage_watcher is not None:
+            return True
+        if self.sqlite_store is not None:
+            return False
+        try:
+            from core.data_manager_qt import ToolsStorageWatcher
+        except ImportError as e:
+            logger.warning("PyQt5 不可用，无法启用数据文件监视: %s", str(e))
+            return False
+        self._storage_watcher = ToolsStorageWatcher(self)
+        self.mark_storage_changed()
+        return True
+
+    def disable_file_watch(self):
+        watcher, self._storage_watcher = self._storage_watcher, None
+        if watcher is not None:
+            watcher.stop()
+            watcher.deleteLater()
+
+    def mark_storage_changed(self):
+        """数据文件可能被修改，下次读取时重新比对状态令牌。"""
+        self._tools_storage_changed = True
+        self._categories_storage_changed = True
+
+    @property
+    def tools_generation(self):
+        """最近一次读取或写入时 tools.json 记录的数据代数，每次整库写入加一。"""
+        return self._tools_generation
+
+    def _read_tools_storage_state(self):
+        """返回 (数据代数, 聚合文件或拆分镜像状态, 变更日志状态)，用于发现其他实例的写入。"""
+        return (
+            read_tools_generation(self.tools_file),
+            _get_tools_base_state_token(self.tools_file, self.tools_split_dir),
+            self.tools_journal.state_token(),
+        )
+
+    def _mark_tools_synced(self, tools, storage_state):
+        """记录内存缓存对应的磁盘状态和记录，写入时作为三方合并的基准。"""
+        self._synced_tools = tuple(tools or ())
+        self._synced_storage_state = storage_state
+        self._tools_generation = storage_state[0]
+
+    def _tools_storage_diverged(self):
+        """上次读取或写入之后，磁盘上的工具数据是否被其他实例改写过；从未读取过时视为未改写。"""
+        return self._synced_storage_state is not None and self._read_tools_storage_state() != self._synced_storage_state
+
+    def _merge_concurrent_tool_changes(self, tools):
+        """把本实例要写入的工具与磁盘上其他实例写入的结果按记录合并。"""
+        theirs = self._strip_deprecated_tool_fields(_load_tools_from_storage(self.tools_file, self.tools_split_dir))
+        merged, conflicts = merge_tool_records(self._synced_tools or (), tools, theirs)
+        if conflicts:
+            logger.warning("其他实例同时修改了 %s 个工具，以本实例的修改为准: %s", len(conflicts), conflicts[:20])
+        else:
+            logger.info("检测到其他实例写入的工具数据，已合并后保存")
+        return merged
+
     def _set_categories_cache(self, categories, modified_time=0):
+        self._categories_version += 1
         self._categories_cache = categories
         self._last_categories_modified = modified_time
 
+    @property
+    def categories_version(self):
+        """分类数据版本号，内存中的分类每次被重新加载、保存或暂存时加一。"""
+        return self._categories_version
+
+    def get_category_index(self):
+        """返回当前分类数据的 CategoryIndex；分类没有变化时重复调用返回同一个对象。"""
+        categories = self.load_categories()
+        index = self._category_index
+        if index is None or index.version != self._categories_version or index.categories is not categories:
+            index = CategoryIndex(categories, self.tools_split_dir, self._categories_version)
+            self._category_index = index
+        return index
+
     def _set_tools_cache(self, tools, modified_token=()):
+        self._bump_tools_version()
         self._tools_cache = tools
         self._last_tools_modified = modified_token
-        self._category_tools_cache = {}
+        self._tools_index = ToolCacheIndex(tools) if tools is not None else None
+        self._lazy_category_tools = {}
 
     def _invalidate_tools_cache(self):
         self._set_tools_cache(None, ())
         self._normalization_cache = None
         self._normalization_cache_key = None
 
+    @property
+    def tools_version(self):
+        """工具库版本号，内存中的工具数据每变化一次加一。"""
+        return self._tools_version
+
+    def _bump_tools_version(self, changed_positions=None):
+        """工具库版本加一；changed_positions 给出只被替换或追加的下标时，下一个快照可复用未改动的分段。"""
+        self._tools_version += 1
+        if changed_positions is None or self._tools_view_changes is None:
+            self._tools_view_changes = None
+        else:
+            self._tools_view_changes.update(changed_positions)
+
+    def get_tools_view(self):
+        """返回当前工具库的只读快照 ToolLibraryView；工具库没有变化时重复调用返回同一个对象。
+
+        只读取工具的界面和服务应优先使用它，而不是 ``list(load_tools())`` 复制；修改工具仍通过
+        add_tool / update_tool / save_tools 等接口完成。
+        """
+        tools = self.load_tools()
+        view = self._tools_view
+        if view is not None and view.version == self._tools_version and self._tools_view_source is tools:
+            return view
+        if view is not None and self._tools_view_source is tools and self._tools_view_changes is not None:
+            view = view.with_changes(tools, self._tools_view_changes, self._tools_version)
+        else:
+            view = ToolLibraryView(tools or (), self._tools_version)
+        self._tools_view = view
+        self._tools_view_source = tools
+        self._tools_view_changes = set()
+        return view
+
+    def _replace_cached_tool(self, index, position, fields):
+        """写时复制：用合并了 fields 的新记录替换缓存中的记录，已发出的只读快照仍指向旧记录。"""
+        tool = dict(index.tools[position])
+        tool.update(fields)
+        index.tools[position] = tool
+        index.refresh(position)
+        return tool
+
     def invalidate_cache(self):
         """Public cache reset used after external data restores."""
+        # 先等后台写入结束，再清空它会读写的拆分文件摘要
+        self.flush_write_behind()
+        self._bump_tools_version()
         self._categories_cache = None
         self._tools_cache = None
         self._last_categories_modified = 0
         self._last_tools_modified = ()
-        self._category_tools_cache = {}
+        self._tools_index = None
+        self._split_file_digests = {}
         self._normalization_cache = None
         self._normalization_cache_key = None
+        self.tools_journal.reset()
+        self.usage_store.reset()
+        self._synced_tools = None
+        self._synced_storage_state = None
+        self.mark_storage_changed()
+        self.close_storage()
 
     def _read_categories_from_disk(self):
         with open(self.categories_file, 'r', encoding='utf-8') as f:
@@ -272,18 +663,92 @@ class DataManager:
         return categories if isinstance(categories, list) else []
 
     def _load_tools_sync(self):
+        if self._tools_cache is not None and self.write_behind is not None and self.write_behind.is_busy():
+            # 磁盘上还是旧数据，内存缓存才是最新的
+            return self._tools_cache
+        if self.sqlite_store is not None:
+            current_modified = self.sqlite_store.tools_state_token()
+            if self._tools_cache is None or self._last_tools_modified != current_modified:
+                self._set_tools_cache(self.sqlite_store.load_tools(), current_modified)
+            return self._tools_cache
+
+        if self._storage_watcher is not None:
+            if self._tools_cache is not None and not self._tools_storage_changed:
+                return self._tools_cache
+            # 先清标记再读取，读取期间发生的变化会重新置位
+            self._tools_storage_changed = False
+
         current_modified = _get_tools_state_token(self.tools_file, self.tools_split_dir)
         if self._tools_cache is not None and self._last_tools_modified == current_modified:
             return self._tools_cache
 
+        # 先取合并基准的磁盘状态再读数据，读取期间其他实例的写入会在下次保存时被发现
+        storage_state = self._read_tools_storage_state()
+        current_modified = _get_tools_state_token(self.tools_file, self.tools_split_dir)
         if not current_modified:
             self._set_tools_cache([], ())
+            self._mark_tools_synced((), storage_state)
+            return self._tools_cache
+
+        snapshot = load_tools_snapshot(self.tools_snapshot_path, current_modified)
+        if snapshot is not None:
+            tools, normalization = snapshot
+            self._set_tools_cache(tools, current_modified)
+            self._mark_tools_synced(tools, storage_state)
+            self._normalization_cache = normalization
+            self._normalization_cache_key = tools
             return self._tools_cache
 
         tools = self._load_tools_from_disk()
         self._set_tools_cache(tools, current_modified)
+        self._mark_tools_synced(tools, storage_state)
         return self._tools_cache
 
+    def _get_tools_normalization(self, tools):
+        """返回与工具列表按下标对齐的小写名称 / 描述，工具列表或内容变化后重建。"""
+        if (
+            self._normalization_cache_key is not tools
+            or self._normalization_cache is None
+            or len(self._normalization_cache) != len(tools)
+        ):
+            self._normalization_cache = build_tools_normalization(tools)
+            self._normalization_cache_key = tools
+        return self._normalization_cache
+
+    def get_tool_type_label(self, tool):
+        """返回 tool 预先计算的卡片类型标签；只使用已经建好的规范化数据（如启动快照），没有时返回 None。"""
+        tools = self._tools_cache
+        normalization = self._normalization_cache
+        if tools is None or normalization is None or self._normalization_cache_key is not tools:
+            return None
+        if self._type_label_lookup_key is not normalization:
+            self._type_label_lookup = {
+                id(cached_tool): (cached_tool, item[2])
+                for cached_tool, item in zip(tools, normalization)
+            }
+            self._type_label_lookup_key = normalization
+        # 写时复制替换的记录不在表里；按对象身份核对，避免 id 被复用后取到别的记录的标签
+        entry = self._type_label_lookup.get(id(tool))
+        if entry is None or entry[0] is not tool:
+            return None
+        return entry[1]
+
+    def save_tools_snapshot(self):
+        """把当前工具缓存写成启动快照；仅在缓存与磁盘一致时写入，SQLite 存储不使用快照。"""
+        if self.sqlite_store is not None or self._pending_usage_updates:
+            return False
+        if self.write_behind is not None and self.write_behind.is_busy():
+            return False
+        try:
+            tools = self._load_tools_sync()
+        except (OSError, ValueError) as e:
+            logger.warning("写入工具快照前读取工具数据失败: %s", str(e))
+            return False
+        token = self._last_tools_modified
+        if not token or token != _get_tools_state_token(self.tools_file, self.tools_split_dir):
+            return False
+        return write_tools_snapshot(self.tools_snapshot_path, token, tools, self._get_tools_normalization(tools))
+
     def _store_pending_usage_update(self, tool_id, usage_count, last_used):
         self._pending_usage_updates[tool_id] = {
             'usage_count': int(usage_count or 0),
@@ -292,18 +757,25 @@ class DataManager:
 
     def _apply_pending_usage_updates_to_tools(self, tools, pending_updates):
         changed = False
-        for tool in tools:
+        changed_positions = []
+        for position, tool in enumerate(tools):
             tool_id = tool.get('id')
             if tool_id not in pending_updates:
                 continue
             pending = pending_updates.get(tool_id) or {}
+            fields = {}
             usage_count = pending.get('usage_count')
             if usage_count is not None:
-                tool['usage_count'] = int(usage_count or 0)
+                fields['usage_count'] = int(usage_count or 0)
             last_used = pending.get('last_used')
             if last_used:
-                tool['last_used'] = last_used
+                fields['last_used'] = last_used
+            if fields:
+                tools[position] = {**tool, **fields}
+                changed_positions.append(position)
             changed = True
+        if changed_positions and tools is self._tools_cache:
+            self._bump_tools_version(changed_positions)
         return changed
 
     def _strip_deprecated_tool_fields(self, tools):
@@ -332,6 +804,7 @@ class DataManager:
         return cleaned_tools
 
     def _load_tools_from_disk(self):
+        self.usage_store.reset()
         return _load_tools_from_storage(self.tools_file, self.tools_split_dir)
 
     @staticmethod
@@ -343,31 +816,68 @@ class DataManager:
         except TypeError:
             callback(tools)
 
-    def _build_split_file_map(self, categories):
-        file_map = {}
-        ordered_categories = sorted(
-            categories,
-            key=lambda cat: (cat.get('priority', 9999), cat.get('id', 9999))
-        )
-        for category in ordered_categories:
-            category_id = category.get('id')
-            if category_id is None:
-                continue
-            priority = category.get('priority', 99)
-            slug = _slugify_file_part(category.get('name'))
-            file_name = f"{int(priority):02d}_{slug}_{category_id}.json"
-            file_map[category_id] = os.path.join(self.tools_split_dir, file_name)
-        return file_map
-
-    def _write_tools_aggregate_file(self, tools):
+    def _write_tools_aggregate_file(self, tools, generation=0):
+        """写聚合 tools.json；带根键的格式把数据代数写在第一个键，纯列表格式保持原样、不记录代数。"""
         wrap = _should_wrap_records(self.tools_file, 'tools', default_wrap=True)
-        payload = {'tools': tools} if wrap else tools
-        _write_json_file(self.tools_file, payload)
+        payload = {'generation': generation, 'tools': tools} if wrap else tools
+        _write_json_file(self.tools_file, payload, self.TOOLS_FILE_DURABILITY)
+
+    def _mark_split_categories_dirty(self, *category_ids):
+        """记录单条修改涉及的分类，压缩日志时只需重写这些分类的拆分文件。"""
+        for category_id in category_ids:
+            try:
+                self._dirty_split_categories.add(category_id)
+            except TypeError:
+                self._dirty_split_categories.add(repr(category_id))
+
+    def _is_split_file_unchanged_on_disk(self, file_path):
+        record = self._split_file_digests.get(file_path)
+        if record is None:
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        return (stat.st_size, stat.st_mtime_ns) == record[1:]
+
+    def _write_split_file_if_changed(self, file_path, records, force=False):
+        """序列化拆分文件并与上次写入 / 磁盘内容比较摘要，内容未变时跳过写入和 fsync。"""
+        wrap = _should_wrap_records(file_path, 'tools', default_wrap=True)
+        payload = _serialize_json({'tools': records} if wrap else records)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if not force:
+            record = self._split_file_digests.get(file_path)
+            if record is not None and record[0] == digest and self._is_split_file_unchanged_on_disk(file_path):
+                return False
+            if record is None:
+                try:
+                    if os.path.getsize(file_path) == len(payload):
+                        with open(file_path, 'rb') as f:
+                            if f.read() == payload:
+                                stat = os.stat(file_path)
+                                self._split_file_digests[file_path] = (digest, stat.st_size, stat.st_mtime_ns)
+                                return False
+                except OSError:
+                    pass
+        try:
+            _write_json_payload(file_path, payload, self.SPLIT_MIRROR_DURABILITY)
+        except OSError as e:
+            logger.warning("写入拆分工具文件失败，可在数据体检中重建拆分镜像 %s: %s", file_path, str(e))
+            self._split_file_digests.pop(file_path, None)
+            return False
+        stat = os.stat(file_path)
+        self._split_file_digests[file_path] = (digest, stat.st_size, stat.st_mtime_ns)
+        return True
+
+    def _save_tools_split_files(self, tools, dirty_category_ids=None, force=False, category_index=None):
+        """按分类写拆分镜像。
 
-    def _save_tools_split_files(self, tools):
+        dirty_category_ids 为 None 时逐个比较内容摘要；传入集合时，未涉及且自上次写入后
+        未被外部改动的分类文件直接跳过，不再序列化。不清除脏分类标记，由调用方清除已写入的分类。
+        后台线程调用时传入提交时取得的 category_index。
+        """
         os.makedirs(self.tools_split_dir, exist_ok=True)
-        categories = self.load_categories()
-        file_map = self._build_split_file_map(categories)
+        file_map = (category_index or self.get_category_index()).split_files
 
         grouped_tools = {}
         uncategorized_tools = []
@@ -378,32 +888,61 @@ class DataManager:
             else:
                 uncategorized_tools.append(tool)
 
+        def is_clean(file_path, *category_ids):
+            if force or dirty_category_ids is None:
+                return False
+            if any(category_id in dirty_category_ids for category_id in category_ids):
+                return False
+            return self._is_split_file_unchanged_on_disk(file_path)
+
         target_files = set()
+        written_files = 0
         for category_id, file_path in file_map.items():
             category_tools = grouped_tools.get(category_id, [])
             if not category_tools:
                 continue
-            wrap = _should_wrap_records(file_path, 'tools', default_wrap=True)
-            payload = {'tools': category_tools} if wrap else category_tools
-            _write_json_file(file_path, payload)
-            target_files.add(os.path.abspath(file_path))
+            target_files.add(file_path)
+            if is_clean(file_path, category_id):
+                continue
+            written_files += int(self._write_split_file_if_changed(file_path, category_tools, force=force))
 
         if uncategorized_tools:
-            uncategorized_path = os.path.join(self.tools_split_dir, '99_uncategorized.json')
-            wrap = _should_wrap_records(uncategorized_path, 'tools', default_wrap=True)
-            payload = {'tools': uncategorized_tools} if wrap else uncategorized_tools
-            _write_json_file(uncategorized_path, payload)
-            target_files.add(os.path.abspath(uncategorized_path))
+            uncategorized_path = os.path.abspath(os.path.join(self.tools_split_dir, '99_uncategorized.json'))
+            target_files.add(uncategorized_path)
+            dirty_uncategorized = [
+                category_id for category_id in (dirty_category_ids or ())
+                if category_id not in file_map
+            ]
+            if not is_clean(uncategorized_path, *dirty_uncategorized):
+                written_files += int(
+                    self._write_split_file_if_changed(uncategorized_path, uncategorized_tools, force=force)
+                )
 
         for existing_path in _get_split_tool_files(self.tools_split_dir):
-            if os.path.abspath(existing_path) not in target_files:
+            existing_path = os.path.abspath(existing_path)
+            if existing_path not in target_files:
                 try:
                     os.remove(existing_path)
+                    self._split_file_digests.pop(existing_path, None)
                 except OSError as e:
                     logger.error("删除旧拆分工具文件失败 %s: %s", existing_path, str(e))
 
+        logger.debug("拆分镜像保存完成，重写 %s / %s 个文件", written_files, len(target_files))
+        return written_files
+
     def _audit_tools_split_consistency(self, aggregate_tools=None):
         aggregate_tools = list(aggregate_tools if aggregate_tools is not None else self._load_tools_sync())
+        if self.sqlite_store is not None:
+            return {
+                'consistent': True,
+                'reason': 'sqlite_backend',
+                'aggregate_count': len(aggregate_tools),
+                'split_count': 0,
+                'split_file_count': len(_get_active_split_tool_files(self.tools_split_dir)),
+                'missing_in_split': 0,
+                'extra_in_split': 0,
+                'message': '当前使用 SQLite 存储，拆分镜像仅作为导出副本，不参与一致性校验。',
+            }
         split_files = _get_active_split_tool_files(self.tools_split_dir)
         if not split_files:
             if not aggregate_tools:
@@ -429,7 +968,13 @@ class DataManager:
             }
 
         try:
-            split_tools = _load_tools_from_split_storage(self.tools_split_dir)
+            split_tools = apply_tool_usage(
+                replay_tools_journal(
+                    _load_tools_from_split_storage(self.tools_split_dir),
+                    self.tools_journal.read_entries(),
+                ),
+                read_tool_usage(self.usage_store.usage_path),
+            )
         except (OSError, ValueError, TypeError) as e:
             return {
                 'consistent': False,
@@ -442,27 +987,31 @@ class DataManager:
                 'message': f'读取拆分镜像失败: {e}',
             }
 
-        aggregate_payloads = _canonical_tool_record_list(aggregate_tools)
-        split_payloads = _canonical_tool_record_list(split_tools)
-        aggregate_counter = {}
-        split_counter = {}
-        for payload in aggregate_payloads:
-            aggregate_counter[payload] = aggregate_counter.get(payload, 0) + 1
-        for payload in split_payloads:
-            split_counter[payload] = split_counter.get(payload, 0) + 1
+        aggregate_records = [tool for tool in aggregate_tools if isinstance(tool, dict)]
+        split_records = [tool for tool in split_tools if isinstance(tool, dict)]
+        aggregate_hashes = [tool_record_hash(tool) for tool in aggregate_records]
+        split_hashes = [tool_record_hash(tool) for tool in split_records]
 
-        missing = 0
-        extra = 0
-        all_payloads = set(aggregate_counter) | set(split_counter)
-        for payload in all_payloads:
-            aggregate_count = aggregate_counter.get(payload, 0)
-            split_count = split_counter.get(payload, 0)
-            if aggregate_count > split_count:
-                missing += aggregate_count - split_count
-            elif split_count > aggregate_count:
-                extra += split_count - aggregate_count
+        # 指纹相同即视为一致，不再序列化排序；只有不一致时才逐条配对找出差异记录
+        if _tool_records_fingerprint(aggregate_hashes) == _tool_records_fingerprint(split_hashes):
+            missing_records = []
+            extra_records = []
+        else:
+            missing_records = _unmatched_tool_records(aggregate_records, aggregate_hashes, split_hashes)
+            extra_records = _unmatched_tool_records(split_records, split_hashes, aggregate_hashes)
+        missing = len(missing_records)
+        extra = len(extra_records)
 
         consistent = missing == 0 and extra == 0
+        message = (
+            f'聚合 tools.json 与 {len(split_files)} 个拆分镜像一致。'
+            if consistent
+            else f'聚合工具 {len(aggregate_tools)} 个，拆分镜像 {len(split_tools)} 个，缺失 {missing} 个，额外 {extra} 个。'
+        )
+        if missing_records:
+            message += f" 拆分镜像缺少或内容不同：{'、'.join(item['name'] for item in _describe_tool_records(missing_records, 5))}。"
+        if extra_records:
+            message += f" 拆分镜像多出或内容不同：{'、'.join(item['name'] for item in _describe_tool_records(extra_records, 5))}。"
         return {
             'consistent': consistent,
             'reason': 'ok' if consistent else 'content_mismatch',
@@ -471,11 +1020,9 @@ class DataManager:
             'split_file_count': len(split_files),
             'missing_in_split': missing,
             'extra_in_split': extra,
-            'message': (
-                f'聚合 tools.json 与 {len(split_files)} 个拆分镜像一致。'
-                if consistent
-                else f'聚合工具 {len(aggregate_tools)} 个，拆分镜像 {len(split_tools)} 个，缺失 {missing} 个，额外 {extra} 个。'
-            ),
+            'missing_records': _describe_tool_records(missing_records),
+            'extra_records': _describe_tool_records(extra_records),
+            'message': message,
         }
 
     def audit_tools_split_consistency(self):
@@ -495,7 +1042,8 @@ class DataManager:
                 suffix += 1
             shutil.copytree(self.tools_split_dir, backup_path)
 
-        self._save_tools_split_files(tools)
+        with self.storage_lock:
+            self._save_tools_split_files(tools, force=True)
         self._invalidate_tools_cache()
         consistency = self._audit_tools_split_consistency(tools)
         return {
@@ -507,6 +1055,12 @@ class DataManager:
 
     def load_categories(self):
         """加载所有分类和子分类数据，使用缓存机制减少重复加载"""
+        if self.sqlite_store is not None:
+            return self._load_categories_from_sqlite()
+        if self._storage_watcher is not None:
+            if self._categories_cache is not None and not self._categories_storage_changed:
+                return self._categories_cache
+            self._categories_storage_changed = False
         try:
             if os.path.exists(self.categories_file) and os.path.getsize(self.categories_file) > 0:
                 current_modified = os.path.getmtime(self.categories_file)
@@ -533,6 +1087,17 @@ class DataManager:
             self._set_categories_cache(categories, 0)
             return self._categories_cache
 
+    def _load_categories_from_sqlite(self):
+        try:
+            current_modified = self.sqlite_store.categories_state_token()
+            if self._categories_cache is None or self._last_categories_modified != current_modified:
+                self._set_categories_cache(self.sqlite_store.load_categories(), current_modified)
+            return self._categories_cache
+        except (sqlite3.Error, ValueError) as e:
+            logger.error("从 SQLite 加载分类数据失败: %s", str(e))
+            self._set_categories_cache(self._create_default_categories(), 0)
+            return self._categories_cache
+
     def _create_default_categories(self):
         """创建默认分类"""
         default_categories = [
@@ -549,18 +1114,31 @@ class DataManager:
 
     def save_categories(self, categories):
         """保存分类数据"""
+        if self._transaction_depth:
+            self._stage_categories(categories)
+            return True
+        return self._persist_categories(categories)
+
+    def _persist_categories(self, categories):
         try:
+            if self.sqlite_store is not None:
+                self.sqlite_store.save_categories(categories)
+                self._categories_cache = None
+                self._last_categories_modified = 0
+                self._invalidate_tools_cache()
+                return True
             os.makedirs(os.path.dirname(self.categories_file), exist_ok=True)
             data_to_save = categories
-            if _should_wrap_records(self.categories_file, 'categories', default_wrap=False):
-                data_to_save = {'categories': categories}
-            _write_json_file(self.categories_file, data_to_save)
+            with self.storage_lock:
+                if _should_wrap_records(self.categories_file, 'categories', default_wrap=False):
+                    data_to_save = {'categories': categories}
+                _write_json_file(self.categories_file, data_to_save, self.CATEGORIES_FILE_DURABILITY)
 
             self._categories_cache = None
             self._last_categories_modified = 0
             self._invalidate_tools_cache()
             return True
-        except (PermissionError, IOError, TypeError, ValueError) as e:
+        except (PermissionError, IOError, TypeError, ValueError, sqlite3.Error) as e:
             logger.error("保存分类数据失败: %s", str(e))
             return False
 
@@ -573,9 +1151,15 @@ class DataManager:
                 logger.error("工具数据格式错误，返回空列表: %s", str(e))
                 self._set_tools_cache([], ())
                 return self._tools_cache
-            except (FileNotFoundError, PermissionError, IOError) as e:
+            except (FileNotFoundError, PermissionError, IOError, sqlite3.Error) as e:
                 logger.error("加载工具数据失败: %s", str(e))
                 return []
+        elif self.sqlite_store is not None:
+            try:
+                tools = self.load_tools()
+                self._invoke_tools_callback(callback, tools, None)
+            except Exception as load_error:
+                self._on_tools_load_error(callback, load_error)
         else:
             try:
                 from core.data_manager_qt import QThread, ToolsLoadWorker
@@ -594,8 +1178,10 @@ class DataManager:
                 self.tools_file,
                 self.tools_split_dir,
                 self._tools_cache,
-                self._last_tools_modified
+                self._last_tools_modified,
+                snapshot_path=self.tools_snapshot_path,
             )
+            self._tools_load_worker.split_file_loaded.connect(self._on_split_file_loaded)
             self._tools_load_worker.moveToThread(self._tools_load_thread)
             self._tools_load_thread.started.connect(self._tools_load_worker.run)
             self._tools_load_worker.finished.connect(self._on_tools_loaded)
@@ -612,6 +1198,7 @@ class DataManager:
     def _on_tools_loaded(self, tools):
         """处理后台加载工具完成后的回调"""
         self._set_tools_cache(tools, _get_tools_state_token(self.tools_file, self.tools_split_dir))
+        self._mark_tools_synced(tools, self._read_tools_storage_state())
 
     def _on_tools_load_error(self, callback, error):
         """处理后台加载工具异常，确保线程能正确退出。"""
@@ -650,51 +1237,240 @@ class DataManager:
 
     def save_tools(self, tools):
         """保存工具数据"""
+        if self._transaction_depth:
+            self._stage_tools(self._strip_deprecated_tool_fields(tools))
+            return True
+        if self.write_behind is not None:
+            return self._submit_tools_write(self._strip_deprecated_tool_fields(tools))
+        return self._persist_tools(tools)
+
+    def _current_tools_state_token(self):
+        if self.sqlite_store is not None:
+            return self.sqlite_store.tools_state_token()
+        return _get_tools_state_token(self.tools_file, self.tools_split_dir)
+
+    def _current_categories_state_token(self):
+        if self.sqlite_store is not None:
+            return self.sqlite_store.categories_state_token()
         try:
-            tools = self._strip_deprecated_tool_fields(tools)
-            os.makedirs(os.path.dirname(self.tools_file), exist_ok=True)
-            split_mode = os.path.isdir(self.tools_split_dir) or bool(_get_split_tool_files(self.tools_split_dir))
-            if not split_mode and tools:
-                categories = self.load_categories()
-                valid_category_ids = {category.get('id') for category in categories if category.get('id') is not None}
-                split_mode = any(tool.get('category_id') in valid_category_ids for tool in tools)
-            self._write_tools_aggregate_file(tools)
-            if split_mode:
-                try:
-                    self._save_tools_split_files(tools)
-                except Exception as split_error:
-                    logger.warning("保存拆分工具文件失败，聚合工具文件已保存: %s", str(split_error))
+            return os.path.getmtime(self.categories_file)
+        except OSError:
+            return 0
+
+    def _stage_tools(self, tools):
+        """事务内只替换内存缓存，磁盘状态令牌不变，后续 load_tools 直接返回暂存列表。"""
+        self._staged_tools = tools
+        if tools is not self._tools_cache:
+            self._set_tools_cache(tools, self._current_tools_state_token())
+
+    def _stage_categories(self, categories):
+        self._staged_categories = categories
+        self._set_categories_cache(categories, self._current_categories_state_token())
+
+    @contextmanager
+    def transaction(self):
+        """批量修改上下文。
+
+        块内的 save_tools / save_categories 和单条工具修改只作用于内存中的暂存数据，
+        正常退出时一次性写入分类、聚合 tools.json 和拆分镜像（SQLite 存储为单个事务）；
+        块内抛出异常时丢弃暂存数据并从磁盘重新加载。嵌套调用并入最外层事务。
+        提交失败时抛出 OSError。
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self._transaction_depth = 1
+        self._staged_tools = None
+        self._staged_categories = None
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth = 0
+            self._rollback_transaction()
+            raise
+        self._transaction_depth = 0
+        if not self._commit_transaction():
+            raise OSError("保存批量修改失败，已放弃本次修改。")
+
+    def _rollback_transaction(self):
+        staged = self._staged_tools is not None or self._staged_categories is not None
+        self._staged_tools = None
+        self._staged_categories = None
+        self._dirty_split_categories = set()
+        if staged:
+            self.flush_write_behind()
+            self._categories_cache = None
+            self._last_categories_modified = 0
+            self._invalidate_tools_cache()
+
+    def _commit_transaction(self):
+        tools, self._staged_tools = self._staged_tools, None
+        categories, self._staged_categories = self._staged_categories, None
+        if tools is None and categories is None:
+            return True
+
+        if self.sqlite_store is not None:
+            try:
+                self.sqlite_store.save_records(tools=tools, categories=categories)
+            except sqlite3.Error as e:
+                logger.error("保存批量修改到 SQLite 失败: %s", str(e))
+                self._rollback_transaction()
+                return False
+            self._categories_cache = None
+            self._last_categories_modified = 0
+            self._invalidate_tools_cache()
+            return True
+
+        if categories is not None and not self._persist_categories(categories):
+            self._rollback_transaction()
+            return False
+        if tools is not None and self.write_behind is not None:
+            return self._submit_tools_write(tools)
+        if tools is not None and not self._persist_tools(tools):
+            self._rollback_transaction()
+            return False
+        return True
+
+    def _persist_tools(self, tools, dirty_split_categories=None):
+        if self.sqlite_store is not None:
+            try:
+                self.sqlite_store.save_tools(self._strip_deprecated_tool_fields(tools))
+            except Exception as e:
+                logger.error("保存工具数据失败: %s", str(e))
+                return False
+            self._invalidate_tools_cache()
+            return True
+        self._prune_tool_usage(tools)
+        with self._persist_lock:
+            written_categories = (
+                set(self._dirty_split_categories) if dirty_split_categories is None else dirty_split_categories
+            )
+            if not self._write_tools_files(tools, dirty_split_categories):
+                return False
+            self._dirty_split_categories.difference_update(written_categories)
             self._invalidate_tools_cache()
+        return True
+
+    def _write_tools_files(self, tools, dirty_split_categories=None, category_index=None):
+        """写聚合 tools.json 与拆分镜像并清空变更日志，不触碰内存缓存。
+
+        写入在跨进程锁内进行，数据代数加一；上次读取之后其他实例改写过数据时，
+        先与磁盘上的记录三方合并再写入，并让下次读取重新加载合并结果。
+        """
+        try:
+            with self.storage_lock:
+                tools = self._strip_deprecated_tool_fields(tools)
+                self._tools_write_merged = self._tools_storage_diverged()
+                if self._tools_write_merged:
+                    tools = self._merge_concurrent_tool_changes(tools)
+                    dirty_split_categories = None
+                os.makedirs(os.path.dirname(self.tools_file), exist_ok=True)
+                split_mode = os.path.isdir(self.tools_split_dir) or bool(_get_split_tool_files(self.tools_split_dir))
+                if category_index is None:
+                    category_index = self.get_category_index()
+                if not split_mode and tools:
+                    valid_category_ids = category_index.categories_by_id
+                    split_mode = any(tool.get('category_id') in valid_category_ids for tool in tools)
+                self._write_tools_aggregate_file(tools, read_tools_generation(self.tools_file) + 1)
+                self.tools_journal.clear()
+                if split_mode:
+                    try:
+                        self._save_tools_split_files(
+                            tools,
+                            dirty_category_ids=dirty_split_categories,
+                            category_index=category_index,
+                        )
+                    except Exception as split_error:
+                        logger.warning("保存拆分工具文件失败，聚合工具文件已保存: %s", str(split_error))
+                self._mark_tools_synced(tools, self._read_tools_storage_state())
+                if self._tools_write_merged:
+                    self._tools_storage_changed = True
             return True
         except Exception as e:
             logger.error("保存工具数据失败: %s", str(e))
             return False
 
-    def get_favorite_tools(self):
+    def _get_tools_index(self):
+        """返回与当前工具缓存对应的索引，缓存被替换时重建。"""
         tools = self.load_tools()
-        return [tool for tool in tools if tool.get('is_favorite', False)]
+        index = self._tools_index
+        if index is None or index.tools is not tools or index.size != len(tools):
+            index = ToolCacheIndex(tools)
+            if tools is self._tools_cache:
+                self._tools_index = index
+        return index
 
-    def get_tools_by_category(self, category_id, subcategory_id=None):
-        cache_key = f"{category_id}_{subcategory_id}"
-        if cache_key in self._category_tools_cache:
-            return self._category_tools_cache[cache_key]
+    def get_favorite_tools(self):
+        return self._get_tools_index().favorites()
 
-        tools = self.load_tools()
-        filtered_tools = []
-        for tool in tools:
-            if tool.get('category_id') == category_id:
-                if subcategory_id is None or tool.get('subcategory_id') == subcategory_id:
-                    filtered_tools.append(tool)
+    def get_tools_by_category(self, category_id, subcategory_id=None):
+        lazy_tools = self._get_lazy_category_tools(category_id)
+        if lazy_tools is not None:
+            if subcategory_id is None:
+                return lazy_tools
+            return [tool for tool in lazy_tools if tool.get('subcategory_id') == subcategory_id]
+        return self._get_tools_index().by_category(category_id, subcategory_id)
+
+    def _can_load_split_lazily(self):
+        """只有聚合文件缺失、没有待回放的变更日志、整库还没加载时，才按分类单独读取拆分文件。"""
+        if self._tools_cache is not None or self.sqlite_store is not None or self._transaction_depth:
+            return False
+        if os.path.isfile(self.tools_file) and os.path.getsize(self.tools_file) > 0:
+            return False
+        return self.tools_journal.state_token() is None
 
-        self._category_tools_cache[cache_key] = filtered_tools
-        return filtered_tools
+    @staticmethod
+    def _split_file_token(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _on_split_file_loaded(self, file_path, records):
+        """后台加载线程每读完一个拆分文件就先登记，整库加载完成前点开的分类可以直接使用。"""
+        if self._tools_cache is not None:
+            return
+        category_id = _get_split_file_category_id(file_path)
+        if category_id is not None:
+            self._lazy_category_tools[category_id] = (file_path, self._split_file_token(file_path), records)
+
+    def _get_lazy_category_tools(self, category_id):
+        if not self._can_load_split_lazily():
+            return None
+        entry = self._lazy_category_tools.get(category_id)
+        if entry is not None and self._split_file_token(entry[0]) == entry[1]:
+            records = entry[2]
+        else:
+            file_path = next(
+                (
+                    path for path in _get_active_split_tool_files(self.tools_split_dir)
+                    if _get_split_file_category_id(path) == category_id
+                ),
+                None,
+            )
+            if file_path is None:
+                return None
+            try:
+                token = self._split_file_token(file_path)
+                records = _load_json_records(file_path)
+            except (OSError, ValueError) as e:
+                logger.warning("按分类读取拆分工具文件失败，改为加载整库 %s: %s", file_path, str(e))
+                return None
+            self._lazy_category_tools[category_id] = (file_path, token, records)
+        tools = [
+            tool for tool in records
+            if isinstance(tool, dict) and tool.get('category_id') == category_id
+        ]
+        return apply_tool_usage(tools, self.usage_store.load())
 
     def get_tool_by_id(self, tool_id):
-        tools = self.load_tools()
-        for tool in tools:
-            if tool.get('id') == tool_id:
-                return tool
-        return None
+        return self._get_tools_index().get(tool_id)
 
     def add_tool(self, tool_data):
         tools = self.load_tools()
@@ -704,21 +1480,95 @@ class DataManager:
         tool_data['last_used'] = None
         if 'is_favorite' not in tool_data:
             tool_data['is_favorite'] = False
+        tool_data = self._strip_deprecated_tool_fields([tool_data])[0]
+        index = self._get_tools_index()
         tools.append(tool_data)
-        return self.save_tools(tools)
+        index.refresh(len(tools) - 1)
+        self._mark_split_categories_dirty(tool_data.get('category_id'))
+        return self._commit_tool_mutations([{'op': 'upsert', 'tool': tool_data}], (len(tools) - 1,))
 
     def update_tool(self, tool_id, updated_data):
-        tools = self.load_tools()
-        for i, tool in enumerate(tools):
-            if tool['id'] == tool_id:
-                updated_data['id'] = tool_id
-                if 'usage_count' not in updated_data:
-                    updated_data['usage_count'] = tool.get('usage_count', 0)
-                if 'last_used' not in updated_data:
-                    updated_data['last_used'] = tool.get('last_used')
-                tools[i] = updated_data
-                return self.save_tools(tools)
-        return False
+        index = self._get_tools_index()
+        position = index.position_of(tool_id)
+        if position is None:
+            return False
+        tool = index.tools[position]
+        updated_data['id'] = tool_id
+        if 'usage_count' not in updated_data:
+            updated_data['usage_count'] = tool.get('usage_count', 0)
+        if 'last_used' not in updated_data:
+            updated_data['last_used'] = tool.get('last_used')
+        updated_data = self._strip_deprecated_tool_fields([updated_data])[0]
+        index.tools[position] = updated_data
+        index.refresh(position)
+        self._mark_split_categories_dirty(tool.get('category_id'), updated_data.get('category_id'))
+        return self._commit_tool_mutations([{'op': 'upsert', 'tool': updated_data}], (position,))
+
+    def _commit_tool_mutations(self, entries, changed_positions=None):
+        """持久化已应用到内存缓存的单条变更：JSON 存储追加到变更日志，SQLite 存储按记录覆盖。
+
+        changed_positions 是这些变更在缓存列表中替换或追加的下标，用于增量生成下一个只读快照。
+        """
+        self._normalization_cache = None
+        self._bump_tools_version(changed_positions)
+        if self._transaction_depth:
+            self._stage_tools(self._tools_cache if self._tools_cache is not None else [])
+            return True
+        if self.sqlite_store is not None:
+            return self._commit_tool_mutations_to_sqlite(entries)
+        with self._persist_lock:
+            if self.write_behind is not None and self.write_behind.is_busy():
+                # 整库快照还没落盘，追加日志会被随后的写入清掉，改为合并进下一次后台写入
+                return self._submit_tools_write(self._tools_cache or [])
+            try:
+                with self.storage_lock:
+                    diverged = self._tools_storage_diverged()
+                    if not diverged:
+                        self.tools_journal.append(entries)
+                        self._mark_tools_synced(self._tools_cache, self._read_tools_storage_state())
+            except OSError as e:
+                logger.warning("写入工具变更日志失败，回退为整库保存: %s", str(e))
+                return self.save_tools(self._tools_cache or [])
+            if diverged:
+                # 其他实例已改写数据（新工具的 id 可能与本实例相同），不再追加日志，改为合并后整库保存
+                return self.save_tools(self._tools_cache or [])
+
+            self._last_tools_modified = _get_tools_state_token(self.tools_file, self.tools_split_dir)
+        if self.tools_journal.entry_count >= self.TOOLS_JOURNAL_COMPACT_THRESHOLD:
+            self.compact_tools_journal()
+        return True
+
+    def _commit_tool_mutations_to_sqlite(self, entries):
+        tools_by_id = {}
+        for entry in entries:
+            if entry.get('op') == 'upsert':
+                tool = entry.get('tool')
+            else:
+                tool = self.get_tool_by_id(entry.get('id'))
+            if isinstance(tool, dict):
+                tools_by_id[tool.get('id')] = tool
+        try:
+            self.sqlite_store.upsert_tools(list(tools_by_id.values()))
+        except sqlite3.Error as e:
+            logger.error("写入 SQLite 工具记录失败: %s", str(e))
+            self._invalidate_tools_cache()
+            return False
+        self._last_tools_modified = self.sqlite_store.tools_state_token()
+        return True
+
+    def compact_tools_journal(self):
+        """把变更日志合并回聚合 tools.json 和拆分镜像，然后清空日志。"""
+        if self._transaction_depth or self.sqlite_store is not None or self.tools_journal.state_token() is None:
+            return True
+        if self.write_behind is not None and self.write_behind.is_busy():
+            # 后台写入完成时会一并清空日志
+            return True
+        try:
+            tools = self._load_tools_sync()
+        except (OSError, ValueError) as e:
+            logger.error("压缩工具变更日志前读取工具数据失败: %s", str(e))
+            return False
+        return self._persist_tools(tools, dirty_split_categories=set(self._dirty_split_categories))
 
     def _discard_pending_usage_updates(self, tool_ids):
         for tool_id in tool_ids:
@@ -769,6 +1619,92 @@ class DataManager:
             "remaining": len(remaining_tools),
         }
 
+    def update_tools(self, patches):
+        """按 id 批量修改工具字段，返回与 delete_tools 相同形式的汇总。
+
+        patches 为 {工具 id: 要修改的字段}。一次遍历完成全部修改（写时复制替换记录），
+        然后只持久化一次：JSON 存储追加一批 patch 日志，修改条数达到压缩阈值时直接整库保存。
+        id 与已废弃字段会被忽略，不存在的 id 计入 missing，值没有变化的记录不写入。
+        """
+        requested = {
+            tool_id: fields for tool_id, fields in dict(patches or {}).items()
+            if tool_id is not None and isinstance(fields, dict)
+        }
+        index = self._get_tools_index()
+        entries = []
+        positions = []
+        missing = 0
+        for tool_id, fields in requested.items():
+            position = index.position_of(tool_id)
+            if position is None:
+                missing += 1
+                continue
+            tool = index.tools[position]
+            changed_fields = {
+                key: value for key, value in fields.items()
+                if key != 'id'
+                and key not in self.DEPRECATED_TOOL_FIELDS
+                and (key not in tool or tool[key] != value)
+            }
+            if not changed_fields:
+                continue
+            updated_tool = self._replace_cached_tool(index, position, changed_fields)
+            self._mark_split_categories_dirty(tool.get('category_id'), updated_tool.get('category_id'))
+            entries.append({'op': 'patch', 'id': tool_id, 'fields': changed_fields})
+            positions.append(position)
+
+        summary = {
+            "success": True,
+            "requested": len(requested),
+            "updated": len(entries),
+            "missing": missing,
+        }
+        if not entries:
+            return summary
+
+        if (
+            len(entries) >= self.TOOLS_JOURNAL_COMPACT_THRESHOLD
+            and self.sqlite_store is None
+            and not self._transaction_depth
+        ):
+            # 先追加日志又立即压缩等于写两遍，大批量修改直接整库保存
+            self._normalization_cache = None
+            self._bump_tools_version()
+            success = self.save_tools(self._tools_cache)
+        else:
+            success = self._commit_tool_mutations(entries, positions)
+        if not success:
+            self._invalidate_tools_cache()
+            summary.update(success=False, updated=0)
+        return summary
+
+    def set_favorites(self, tool_ids, is_favorite=True):
+        """把一组工具统一设为收藏或取消收藏，返回 update_tools 的汇总。"""
+        return self.update_tools({tool_id: {'is_favorite': bool(is_favorite)} for tool_id in tool_ids or []})
+
+    def move_tools_to_category(self, tool_ids, category_id, subcategory_id=None):
+        """把一组工具移动到指定分类（及子分类），返回 update_tools 的汇总。
+
+        分类不存在或子分类不属于该分类时不做修改，汇总中 success 为 False。
+        """
+        tool_ids = [tool_id for tool_id in (tool_ids or []) if tool_id is not None]
+        category_index = self.get_category_index()
+        subcategory = category_index.subcategory(subcategory_id) if subcategory_id is not None else None
+        if category_index.category(category_id) is None or (
+            subcategory_id is not None and (subcategory is None or subcategory[0].get('id') != category_id)
+        ):
+            logger.warning("移动工具失败，目标分类不存在: %s / %s", category_id, subcategory_id)
+            return {
+                "success": False,
+                "requested": len(set(tool_ids)),
+                "updated": 0,
+                "missing": 0,
+            }
+        return self.update_tools({
+            tool_id: {'category_id': category_id, 'subcategory_id': subcategory_id}
+            for tool_id in tool_ids
+        })
+
     def delete_all_tools(self):
         """Clear all tool records without touching local tool files or notes."""
         tools = self.load_tools()
@@ -801,29 +1737,38 @@ class DataManager:
         return bool(result.get("success") and result.get("deleted", 0) > 0)
 
     def toggle_favorite(self, tool_id):
-        tools = self.load_tools()
-        for tool in tools:
-            if tool['id'] == tool_id:
-                tool['is_favorite'] = not tool.get('is_favorite', False)
-                return self.save_tools(tools)
-        return False
+        index = self._get_tools_index()
+        position = index.position_of(tool_id)
+        if position is None:
+            return False
+        tool = self._replace_cached_tool(index, position, {
+            'is_favorite': not index.tools[position].get('is_favorite', False),
+        })
+        self._mark_split_categories_dirty(tool.get('category_id'))
+        return self._commit_tool_mutations([
+            {'op': 'patch', 'id': tool_id, 'fields': {'is_favorite': tool['is_favorite']}},
+        ], (position,))
 
     def update_tool_usage(self, tool_id):
         if tool_id is None:
             return False
 
-        tool = self.get_tool_by_id(tool_id)
-        if tool is None:
+        index = self._get_tools_index()
+        position = index.position_of(tool_id)
+        if position is None:
             return False
 
+        tool = index.tools[position]
         last_used = datetime.now().isoformat() + 'Z'
         usage_count = int(tool.get('usage_count', 0) or 0) + 1
-        tool['usage_count'] = usage_count
-        tool['last_used'] = last_used
+        # 写时复制：已发出的只读快照和合并基线仍指向旧记录，下一个快照只重建这条记录所在的分段
+        self._replace_cached_tool(index, position, {'usage_count': usage_count, 'last_used': last_used})
+        self._bump_tools_version((position,))
         self._store_pending_usage_update(tool_id, usage_count, last_used)
         return True
 
     def flush_pending_usage_updates(self):
+        """写回缓冲的使用统计：JSON 存储只写 usage.json，SQLite 存储只覆盖对应记录，不重写工具库。"""
         pending_updates = dict(self._pending_usage_updates)
         if not pending_updates:
             return True
@@ -835,10 +1780,28 @@ class DataManager:
             self._pending_usage_updates = {}
             return True
 
-        if self.save_tools(tools):
+        if self.sqlite_store is not None:
+            entries = [{'op': 'patch', 'id': tool_id, 'fields': fields} for tool_id, fields in pending_updates.items()]
+            if not self._commit_tool_mutations_to_sqlite(entries):
+                return False
             self._pending_usage_updates = {}
             return True
-        return False
+
+        known_ids = {tool.get('id') for tool in tools}
+        try:
+            with self.storage_lock:
+                # 其他实例可能也写过使用统计，在锁内重新读取后再合并
+                self.usage_store.reset()
+                self.usage_store.update({
+                    tool_id: fields for tool_id, fields in pending_updates.items() if tool_id in known_ids
+                })
+        except OSError as e:
+            logger.error("保存工具使用统计失败: %s", str(e))
+            return False
+        if self._tools_cache is tools and not (self.write_behind is not None and self.write_behind.is_busy()):
+            self._last_tools_modified = _get_tools_state_token(self.tools_file, self.tools_split_dir)
+        self._pending_usage_updates = {}
+        return True
 
     def reorder_tools(self, ordered_tool_ids):
         if not ordered_tool_ids:
@@ -866,15 +1829,15 @@ class DataManager:
         tools = self.load_tools()
         keyword = keyword.lower()
         results = []
-        for tool in tools:
-            if (keyword in (tool.get('name') or '').lower() or
-                keyword in (tool.get('description') or '').lower()):
+        for tool, (name, description, _type_label) in zip(tools, self._get_tools_normalization(tools)):
+            if keyword in name or keyword in description:
                 results.append(tool)
         return results
 
     def add_category(self, category_data):
-        categories = self.load_categories()
-        new_id = max((cat.get('id') or 0) for cat in categories) + 1 if categories else 1
+        category_index = self.get_category_index()
+        categories = category_index.categories
+        new_id = (category_index.max_category_id or 0) + 1
         category_data['id'] = new_id
         if 'subcategories' not in category_data:
             category_data['subcategories'] = []
@@ -882,22 +1845,17 @@ class DataManager:
         return self.save_categories(categories)
 
     def add_subcategory(self, parent_id, subcategory_data):
-        categories = self.load_categories()
-        existing_sub_ids = {
-            sub.get('id')
-            for category in categories
-            for sub in category.get('subcategories', [])
-            if sub.get('id') is not None
-        }
-        for category in categories:
-            if category['id'] == parent_id:
-                new_id = max(existing_sub_ids) + 1 if existing_sub_ids else parent_id * 100 + 1
-                subcategory_data['id'] = new_id
-                subcategory_data['parent_id'] = parent_id
-                if 'subcategories' not in category:
-                    category['subcategories'] = []
-                category['subcategories'].append(subcategory_data)
-                return self.save_categories(categories)
+        category_index = self.get_category_index()
+        category = category_index.category(parent_id)
+        if category is None:
+            return None
+        max_sub_id = category_index.max_subcategory_id
+        subcategory_data['id'] = max_sub_id + 1 if max_sub_id is not None else parent_id * 100 + 1
+        subcategory_data['parent_id'] = parent_id
+        if 'subcategories' not in category:
+            category['subcategories'] = []
+        category['subcategories'].append(subcategory_data)
+        return self.save_categories(category_index.categories)
 
     def rename_category(self, category_id, new_name):
         categories = self.load_categories()
@@ -912,20 +1870,12 @@ class DataManager:
         return False
 
     def rename_subcategory(self, subcategory_id, new_name):
-        categories = self.load_categories()
-        changed = False
-        for category in categories:
-            subs = category.get('subcategories', [])
-            for sub in subs:
-                if sub.get('id') == subcategory_id:
-                    sub['name'] = new_name
-                    changed = True
-                    break
-            if changed:
-                break
-        if changed:
-            return self.save_categories(categories)
-        return False
+        category_index = self.get_category_index()
+        entry = category_index.subcategory(subcategory_id)
+        if entry is None:
+            return False
+        entry[1]['name'] = new_name
+        return self.save_categories(category_index.categories)
 
     def delete_category(self, category_id):
         categories = self.load_categories()
@@ -942,58 +1892,51 @@ class DataManager:
         return self.load_categories()
 
     def get_subcategories_by_category(self, category_id):
-        categories = self.load_categories()
-        for category in categories:
-            if category['id'] == category_id:
-                return category.get('subcategories', [])
-        return []
+        category = self.get_category_index().category(category_id)
+        return category.get('subcategories', []) if category is not None else []
 
     def delete_subcategory(self, subcategory_id):
-        categories = self.load_categories()
+        category_index = self.get_category_index()
         tools = self.load_tools()
         for tool in tools:
             if tool.get('subcategory_id') == subcategory_id:
                 return False, "该子分类下存在工具，无法删除！"
-        for category in categories:
-            if 'subcategories' in category:
-                original_len = len(category['subcategories'])
-                category['subcategories'] = [sub for sub in category['subcategories'] if sub['id'] != subcategory_id]
-                if len(category['subcategories']) < original_len:
-                    return self.save_categories(categories), ""
-        return False, "子分类不存在！"
+        entry = category_index.subcategory(subcategory_id)
+        if entry is None:
+            return False, "子分类不存在！"
+        category = entry[0]
+        category['subcategories'] = [sub for sub in category['subcategories'] if sub.get('id') != subcategory_id]
+        return self.save_categories(category_index.categories), ""
 
     def update_tool_background(self, tool_id, background_image_path):
-        tools = self.load_tools()
-        for tool in tools:
-            if tool['id'] == tool_id:
-                tool['background_image'] = background_image_path
-                return self.save_tools(tools)
-        return False
+        index = self._get_tools_index()
+        position = index.position_of(tool_id)
+        if position is None:
+            return False
+        tool = self._replace_cached_tool(index, position, {'background_image': background_image_path})
+        self._mark_split_categories_dirty(tool.get('category_id'))
+        return self._commit_tool_mutations([
+            {'op': 'patch', 'id': tool_id, 'fields': {'background_image': background_image_path}},
+        ], (position,))
 
     def audit_tools_data(self):
         tools = self.load_tools()
-        categories = self.load_categories()
+        category_index = self.get_category_index()
         split_consistency = self._audit_tools_split_consistency(tools)
 
-        category_map = {}
-        subcategory_map = {}
-        for category in categories:
-            category_id = category.get('id')
-            if category_id is None:
-                continue
-            category_map[category_id] = category
-            for subcategory in category.get('subcategories', []) or []:
-                sub_id = subcategory.get('id')
-                if sub_id is None:
-                    continue
-                subcategory_map[sub_id] = {
-                    'parent_id': category_id,
-                    'name': subcategory.get('name', ''),
-                }
-
         issues = []
         duplicate_groups = {}
 
+        # 只依赖记录内容和分类的检查结果按记录对象缓存：缓存中的记录写时复制，对象不变即内容未变，
+        # 分类变化时整体失效。图标按图标值缓存并跟随文件状态；本地路径是否存在每次都重新检查。
+        if self._audit_fingerprint != category_index.version:
+            self._audit_fingerprint = category_index.version
+            self._audit_record_cache = {}
+        previous_record_cache = self._audit_record_cache
+        record_cache = {}
+        icon_findings = {}
+        self._refresh_audit_icon_cache()
+
         for tool in tools:
             tool_id = tool.get('id')
             name = (tool.get('name') or '').strip() or '未命名工具'
@@ -1002,8 +1945,8 @@ class DataManager:
 
             category_id = tool.get('category_id')
             subcategory_id = tool.get('subcategory_id')
-            category_name = category_map.get(category_id, {}).get('name', '未知分类')
-            subcategory_name = subcategory_map.get(subcategory_id, {}).get('name', '') if subcategory_id is not None else ''
+            category_name = category_index.category_name(category_id, '未知分类')
+            subcategory_name = category_index.subcategory_name(subcategory_id)
 
             issue_context = {
                 'tool_id': tool_id,
@@ -1014,119 +1957,22 @@ class DataManager:
                 'subcategory_name': subcategory_name,
             }
 
+            cached = previous_record_cache.get(id(tool))
+            if cached is not None and cached[0] is tool:
+                record_findings = cached[1]
+            else:
+                record_findings = self._audit_tool_record(tool, category_index)
+            record_cache[id(tool)] = (tool, record_findings)
+
             icon_value = (tool.get('icon') or '').strip()
-            if not icon_value:
-                issues.append({
-                    **issue_context,
-                    'issue_type': 'missing_icon',
-                    'title': '缺失图标',
-                    'message': 'icon 为空，卡片会回退到默认图标。',
-                })
-            elif not self._is_icon_resolvable(icon_value):
-                issues.append({
-                    **issue_context,
-                    'issue_type': 'invalid_icon',
-                    'title': '图标无效',
-                    'message': f'图标资源无法解析：{icon_value}',
-                })
+            if icon_value not in icon_findings:
+                icon_findings[icon_value] = self._audit_tool_icon(icon_value)
 
-            path_value = (tool.get('path') or '').strip()
-            is_web_tool = bool(tool.get('is_web_tool', False))
-            if is_web_tool:
-                if not path_value:
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'invalid_path',
-                        'title': '网页地址缺失',
-                        'message': '网页工具没有配置 URL。',
-                    })
-                elif not self._is_valid_web_url(path_value):
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'invalid_path',
-                        'title': '网页地址无效',
-                        'message': f'网页工具 URL 不是 http/https：{path_value}',
-                    })
-            else:
-                if not path_value:
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'invalid_path',
-                        'title': '本地路径缺失',
-                        'message': '本地工具没有配置路径。',
-                    })
-                elif self._is_intentional_placeholder_path(path_value):
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'placeholder_path',
-                        'title': '本地路径未配置',
-                        'message': f'本地工具路径仍是占位值：{path_value}。请编辑工具并配置真实路径，或确认它只是模板占位。',
-                    })
-                else:
-                    resolved_path = resolve_accessible_path_value(path_value, base_dir=self.config_dir)
-                    if resolved_path is not None and not os.path.exists(os.fspath(resolved_path)):
-                        issues.append({
-                            **issue_context,
-                            'issue_type': 'invalid_path',
-                            'title': '本地路径失效',
-                            'message': f'本地工具路径不存在：{path_value}',
-                        })
-
-                working_directory = (tool.get('working_directory') or '').strip()
-                if working_directory and not self._is_intentional_placeholder_path(working_directory):
-                    resolved_working_directory = resolve_configured_path_value(
-                        working_directory,
-                        base_dir=self.config_dir,
-                        allow_command_name=False,
-                    )
-                    if resolved_working_directory is not None and not os.path.isdir(os.fspath(resolved_working_directory)):
-                        issues.append({
-                            **issue_context,
-                            'issue_type': 'invalid_path',
-                            'title': '工作目录失效',
-                            'message': f'working_directory 不存在：{working_directory}',
-                        })
-
-            if category_id not in category_map:
-                issues.append({
-                    **issue_context,
-                    'issue_type': 'invalid_category',
-                    'title': '分类无效',
-                    'message': f'category_id 不存在：{category_id}',
-                })
-            elif subcategory_id is not None:
-                subcategory_info = subcategory_map.get(subcategory_id)
-                if subcategory_info is None:
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'invalid_category',
-                        'title': '子分类无效',
-                        'message': f'subcategory_id 不存在：{subcategory_id}',
-                    })
-                elif subcategory_info.get('parent_id') != category_id:
-                    issues.append({
-                        **issue_context,
-                        'issue_type': 'invalid_category',
-                        'title': '子分类无效',
-                        'message': f'subcategory_id {subcategory_id} 不属于 category_id {category_id}',
-                    })
-
-            field_messages = []
-            last_used = tool.get('last_used')
-            if last_used not in (None, '') and not self._is_valid_iso_datetime(last_used):
-                field_messages.append(f'last_used 格式异常: {last_used}')
-
-            for bool_field in ('is_favorite', 'is_web_tool', 'run_in_terminal'):
-                if bool_field in tool and not isinstance(tool.get(bool_field), bool):
-                    field_messages.append(f'{bool_field} 不是布尔值')
-
-            if field_messages:
-                issues.append({
-                    **issue_context,
-                    'issue_type': 'field_inconsistency',
-                    'title': '字段格式不一致',
-                    'message': '；'.join(field_messages),
-                })
+            issues.extend({**issue_context, **finding} for finding in icon_findings[icon_value])
+            issues.extend({**issue_context, **finding} for finding in record_findings)
+            issues.extend({**issue_context, **finding} for finding in self._audit_tool_local_paths(tool))
+
+        self._audit_record_cache = record_cache
 
         for normalized_name, grouped_tools in duplicate_groups.items():
             if not normalized_name or len(grouped_tools) < 2:
@@ -1140,9 +1986,9 @@ class DataManager:
                     'tool_id': tool.get('id'),
                     'tool_name': tool.get('name') or '未命名工具',
                     'category_id': category_id,
-                    'category_name': category_map.get(category_id, {}).get('name', '未知分类'),
+                    'category_name': category_index.category_name(category_id, '未知分类'),
                     'subcategory_id': subcategory_id,
-                    'subcategory_name': subcategory_map.get(subcategory_id, {}).get('name', '') if subcategory_id is not None else '',
+                    'subcategory_name': category_index.subcategory_name(subcategory_id),
                     'issue_type': 'duplicate_name',
                     'title': '名称重复',
                     'message': f'与其他工具重名，重复 ID: {duplicate_ids}，名称: {duplicate_names}。建议人工确认来源、用途后改名或合并，不会自动删除任何工具。',
@@ -1194,6 +2040,150 @@ class DataManager:
             'split_consistency': split_consistency,
         }
 
+    def _refresh_audit_icon_cache(self):
+        """图标目录本身有文件增删时，图标值可能解析到别的文件，清空按图标值缓存的检查结果。"""
+        roots_state = tuple(
+            _get_file_state(root)
+            for root in (get_runtime_path('resources', 'icons'), get_bundle_path('resources', 'icons'))
+        )
+        if self._audit_icon_roots_state != roots_state:
+            self._audit_icon_roots_state = roots_state
+            self._audit_icon_cache = {}
+
+    def _audit_tool_icon(self, icon_value):
+        if not icon_value:
+            return [{
+                'issue_type': 'missing_icon',
+                'title': '缺失图标',
+                'message': 'icon 为空，卡片会回退到默认图标。',
+            }]
+        if self._is_icon_resolvable(icon_value):
+            return []
+        return [{
+            'issue_type': 'invalid_icon',
+            'title': '图标无效',
+            'message': f'图标资源无法解析：{icon_value}',
+        }]
+
+    def _is_icon_resolvable(self, icon_value):
+        """按图标值缓存检查结果；解析到的文件（或无法解析的绝对路径）的 (mtime_ns, size) 变化时重新检查。"""
+        cached = self._audit_icon_cache.get(icon_value)
+        if cached is not None:
+            watched_path, file_state, resolvable = cached
+            if watched_path is None or _get_file_state(watched_path) == file_state:
+                return resolvable
+
+        try:
+            resolved_path = resolve_icon_path_value(icon_value)
+            resolvable = resolved_path is not None and is_valid_icon_file(resolved_path)
+        except Exception:
+            resolved_path = None
+            resolvable = False
+        if resolved_path is not None:
+            watched_path = os.fspath(resolved_path)
+        elif os.path.isabs(icon_value):
+            watched_path = icon_value
+        else:
+            watched_path = None
+        file_state = _get_file_state(watched_path) if watched_path is not None else None
+        self._audit_icon_cache[icon_value] = (watched_path, file_state, resolvable)
+        return resolvable
+
+    def _audit_tool_record(self, tool, category_index):
+        """检查只取决于记录内容和分类的问题，记录对象不变时结果可以复用。"""
+        findings = []
+        path_value = (tool.get('path') or '').strip()
+        if bool(tool.get('is_web_tool', False)):
+            if not path_value:
+                findings.append({
+                    'issue_type': 'invalid_path',
+                    'title': '网页地址缺失',
+                    'message': '网页工具没有配置 URL。',
+                })
+            elif not self._is_valid_web_url(path_value):
+                findings.append({
+                    'issue_type': 'invalid_path',
+                    'title': '网页地址无效',
+                    'message': f'网页工具 URL 不是 http/https：{path_value}',
+                })
+        elif not path_value:
+            findings.append({
+                'issue_type': 'invalid_path',
+                'title': '本地路径缺失',
+                'message': '本地工具没有配置路径。',
+            })
+        elif self._is_intentional_placeholder_path(path_value):
+            findings.append({
+                'issue_type': 'placeholder_path',
+                'title': '本地路径未配置',
+                'message': f'本地工具路径仍是占位值：{path_value}。请编辑工具并配置真实路径，或确认它只是模板占位。',
+            })
+
+        category_id = tool.get('category_id')
+        subcategory_id = tool.get('subcategory_id')
+        if category_index.category(category_id) is None:
+            findings.append({
+                'issue_type': 'invalid_category',
+                'title': '分类无效',
+                'message': f'category_id 不存在：{category_id}',
+            })
+        elif subcategory_id is not None:
+            subcategory_entry = category_index.subcategory(subcategory_id)
+            if subcategory_entry is None:
+                findings.append({
+                    'issue_type': 'invalid_category',
+                    'title': '子分类无效',
+                    'message': f'subcategory_id 不存在：{subcategory_id}',
+                })
+            elif subcategory_entry[0].get('id') != category_id:
+                findings.append({
+                    'issue_type': 'invalid_category',
+                    'title': '子分类无效',
+                    'message': f'subcategory_id {subcategory_id} 不属于 category_id {category_id}',
+                })
+
+        field_messages = []
+        last_used = tool.get('last_used')
+        if last_used not in (None, '') and not self._is_valid_iso_datetime(last_used):
+            field_messages.append(f'last_used 格式异常: {last_used}')
+
+        for bool_field in ('is_favorite', 'is_web_tool', 'run_in_terminal'):
+            if bool_field in tool and not isinstance(tool.get(bool_field), bool):
+                field_messages.append(f'{bool_field} 不是布尔值')
+
+        if field_messages:
+            findings.append({
+                'issue_type': 'field_inconsistency',
+                'title': '字段格式不一致',
+                'message': '；'.join(field_messages),
+            })
+        return findings
+
+    def _audit_tool_local_paths(self, tool):
+        """检查本地工具路径和工作目录是否存在，依赖文件系统当前状态，不缓存。"""
+        if bool(tool.get('is_web_tool', False)):
+            return []
+        findings = []
+        path_value = (tool.get('path') or '').strip()
+        if path_value and not self._is_intentional_placeholder_path(path_value):
+            if is_accessible_path_value_missing(path_value, base_dir=self.config_dir):
+                findings.append({
+                    'issue_type': 'invalid_path',
+                    'title': '本地路径失效',
+                    'message': f'本地工具路径不存在：{path_value}',
+                })
+
+        working_directory = (tool.get('working_directory') or '').strip()
+        if working_directory and not self._is_intentional_placeholder_path(working_directory):
+            # 与 resolve_configured_path_value 的结果一致：相对路径按配置目录拼接，直接检查而不做 realpath
+            if not os.path.isdir(os.path.join(self.config_dir or '', working_directory)):
+                findings.append({
+                    'issue_type': 'invalid_path',
+                    'title': '工作目录失效',
+                    'message': f'working_directory 不存在：{working_directory}',
+                })
+        return findings
+
     def _normalize_tool_name(self, value):
         text = str(value or '').strip().casefold()
         text = re.sub(r'\s+', ' ', text)
@@ -1207,16 +2197,6 @@ class DataManager:
         text = str(value or '').strip().upper()
         return text.startswith('CHANGE_ME_')
 
-    def _is_icon_resolvable(self, icon_value):
-        try:
-            icon_text = str(icon_value or '').strip()
-            if not icon_text:
-                return False
-            resolved_path = resolve_icon_path_value(icon_text)
-            return resolved_path is not None and is_valid_icon_file(resolved_path)
-        except Exception:
-            return False
-
     def _is_valid_iso_datetime(self, value):
         try:
             text = str(value or '').strip()
@@ -1234,7 +2214,28 @@ class DataManager:
             self.flush_pending_usage_updates()
         except Exception as e:
             logger.error("写回工具使用统计失败: %s", str(e))
+        try:
+            self.flush_write_behind()
+        except Exception as e:
+            logger.error("写完后台工具数据失败: %s", str(e))
+        try:
+            self.compact_tools_journal()
+        except Exception as e:
+            logger.error("压缩工具变更日志失败: %s", str(e))
+        try:
+            self.save_tools_snapshot()
+        except Exception as e:
+            logger.error("写入工具快照失败: %s", str(e))
+        # 快照等可重建缓存按 cached 等级登记，在这里统一写出
+        flush_deferred_writes()
         try:
             self._stop_tools_load_thread()
+            self.disable_file_watch()
         except Exception as e:
             logger.error("清理资源失败: %s", str(e))
+        try:
+            self.close_storage()
+            if self.write_behind is not None:
+                self.write_behind.stop()
+        except Exception as e:
+            logger.error("关闭存储失败: %s", str(e))
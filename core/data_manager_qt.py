@@ -1,6 +1,9 @@
-from PyQt5.QtCore import QObject, QThread, pyqtSignal
+import os
 
-from core.data_manager import _get_tools_state_token, _load_tools_from_storage
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QThread, pyqtSignal
+
+from core.data_manager import _get_split_tool_files, _get_tools_state_token, _load_tools_from_storage
+from core.tool_snapshot import load_tools_snapshot, write_tools_snapshot
 
 
 class ToolsLoadWorker(QObject):
@@ -8,13 +11,16 @@ class ToolsLoadWorker(QObject):
 
     finished = pyqtSignal(list)
     error = pyqtSignal(Exception)
+    # 聚合文件缺失、逐个读取拆分文件时，每读完一个文件发出 (文件路径, 记录)
+    split_file_loaded = pyqtSignal(str, list)
 
-    def __init__(self, tools_file, tools_split_dir, tools_cache, last_tools_modified):
+    def __init__(self, tools_file, tools_split_dir, tools_cache, last_tools_modified, snapshot_path=None):
         super().__init__()
         self.tools_file = tools_file
         self.tools_split_dir = tools_split_dir
         self.tools_cache = tools_cache
         self.last_tools_modified = last_tools_modified
+        self.snapshot_path = snapshot_path
 
     def run(self):
         try:
@@ -27,6 +33,62 @@ class ToolsLoadWorker(QObject):
                 self.finished.emit([])
                 return
 
-            self.finished.emit(_load_tools_from_storage(self.tools_file, self.tools_split_dir))
+            snapshot = load_tools_snapshot(self.snapshot_path, current_modified)
+            if snapshot is not None:
+                self.finished.emit(snapshot[0])
+                return
+
+            tools = _load_tools_from_storage(
+                self.tools_file,
+                self.tools_split_dir,
+                on_split_file_loaded=self.split_file_loaded.emit,
+            )
+            if self.snapshot_path:
+                write_tools_snapshot(self.snapshot_path, current_modified, tools)
+            self.finished.emit(tools)
         except Exception as e:
             self.error.emit(e)
+
+
+class ToolsStorageWatcher(QObject):
+    """监视工具数据文件，文件有变化时才让 DataManager 重新比对状态令牌。
+
+    原子替换（os.replace）会让 QFileSystemWatcher 丢掉对旧文件的监视，
+    因此每次收到通知后都会重新登记仍然存在的路径。
+    """
+
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+        self.refresh_paths()
+
+    def watched_paths(self):
+        data_manager = self.data_manager
+        paths = [
+            data_manager.data_dir,
+            data_manager.tools_split_dir,
+            data_manager.tools_file,
+            data_manager.categories_file,
+            data_manager.tools_journal.journal_path,
+            data_manager.usage_store.usage_path,
+        ]
+        paths.extend(_get_split_tool_files(data_manager.tools_split_dir))
+        return [path for path in paths if os.path.exists(path)]
+
+    def refresh_paths(self):
+        current_paths = set(self._watcher.files()) | set(self._watcher.directories())
+        missing_paths = [path for path in self.watched_paths() if path not in current_paths]
+        if missing_paths:
+            self._watcher.addPaths(missing_paths)
+
+    def stop(self):
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _on_path_changed(self, _path):
+        self.data_manager.mark_storage_changed()
+        self.refresh_paths()
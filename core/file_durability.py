@@ -0,0 +1,118 @@
+import atexit
+import os
+import tempfile
+import threading
+
+from core.logger import logger
+
+# 持久性等级：写入方按数据能否重建选择，代价从高到低
+DURABILITY_STRICT = "strict"  # 权威数据：临时文件 fsync 后原子替换，再 fsync 所在目录，断电后也不会丢失已返回的写入
+# 原子替换但不 fsync：进程崩溃时仍是完整的旧文件或新文件，断电可能回到旧内容
+DURABILITY_NORMAL = "normal"
+# 可重建的缓存：只登记待写内容，由 flush_deferred_writes() 在关闭或退出时按 normal 写出；
+# 同一文件多次登记只写最后一次，进程异常退出时会丢失，读取方必须能重新生成
+DURABILITY_CACHED = "cached"
+DURABILITY_LEVELS = (DURABILITY_STRICT, DURABILITY_NORMAL, DURABILITY_CACHED)
+
+_deferred_writes_lock = threading.Lock()
+_deferred_writes = {}
+
+
+def fsync_directory(dir_path):
+    """把目录项（新建或替换的文件名）刷到磁盘；Windows 不支持打开目录，直接跳过。"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        logger.debug("同步目录失败 %s: %s", dir_path, str(e))
+    finally:
+        os.close(fd)
+
+
+def write_bytes_atomic(file_path, payload, durability=DURABILITY_STRICT):
+    """先写同目录的临时文件再 os.replace，读取方只会看到完整的旧文件或新文件。
+
+    durability 决定是否 fsync（见 DURABILITY_*）。写入失败时抛出 OSError，目标文件保持不变。
+    cached 等级只登记 payload 并返回 True；payload 也可以是返回 bytes 的函数，写出时才调用。
+    """
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"未知的持久性等级: {durability}")
+    target_path = os.path.abspath(os.fspath(file_path))
+    if durability == DURABILITY_CACHED:
+        # 目录在登记时建好，写出时目录已不存在就说明缓存不再需要
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    with _deferred_writes_lock:
+        if durability == DURABILITY_CACHED:
+            _deferred_writes[target_path] = payload
+            return True
+        # 立即写入的内容更新，丢弃之前登记的延迟写入
+        _deferred_writes.pop(target_path, None)
+    return _replace_file(target_path, payload, durability)
+
+
+def _replace_file(target_path, payload, durability):
+    target_dir = os.path.dirname(target_path)
+    temp_path = None
+    try:
+        os.makedirs(target_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            'wb',
+            delete=False,
+            dir=target_dir,
+            prefix=f".{os.path.basename(target_path)}.",
+            suffix=".tmp",
+        ) as f:
+            temp_path = f.name
+            f.write(payload)
+            if durability == DURABILITY_STRICT:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, target_path)
+        temp_path = None
+        if durability == DURABILITY_STRICT:
+            fsync_directory(target_dir)
+        return True
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def flush_deferred_writes(file_paths=None):
+    """写出登记的缓存文件（file_paths 为空时写出全部），返回成功写出的文件数。
+
+    失败只记录日志；目标目录在登记后被删除的直接丢弃。
+    """
+    with _deferred_writes_lock:
+        if file_paths is None:
+            pending = list(_deferred_writes.items())
+            _deferred_writes.clear()
+        else:
+            pending = []
+            for file_path in file_paths:
+                target_path = os.path.abspath(os.fspath(file_path))
+                if target_path in _deferred_writes:
+                    pending.append((target_path, _deferred_writes.pop(target_path)))
+
+    written = 0
+    for target_path, payload in pending:
+        if not os.path.isdir(os.path.dirname(target_path)):
+            continue
+        try:
+            if callable(payload):
+                payload = payload()
+            _replace_file(target_path, payload, DURABILITY_NORMAL)
+            written += 1
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("写入缓存文件失败 %s: %s", target_path, str(e))
+    return written
+
+
+atexit.register(flush_deferred_writes)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import shutil
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -76,7 +77,7 @@ class IconResolutionService:
         return ""
 
     def resolve(self, tool, theme_name=None) -> IconResolution:
-        if not isinstance(tool, dict):
+        if not isinstance(tool, Mapping):
             return self._default_resolution(theme_name, "non-dict tool")
 
         pinned = bool(tool.get("icon_pinned", False))
@@ -121,7 +122,7 @@ class IconResolutionService:
         return self.resolve(tool, theme_name=theme_name)
 
     def pin_icon(self, tool, icon_path):
-        if not isinstance(tool, dict):
+        if not isinstance(tool, Mapping):
             raise TypeError("tool must be a dict")
         resolved = resolve_icon_path_value(icon_path) or Path(icon_path)
         if not Path(resolved).exists():
@@ -0,0 +1,125 @@
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_VALUE_TERMINATORS = ',]}:'
+
+
+class _ChunkedText:
+    """按块读取文本并向前解析，已消费的内容会被丢弃，缓冲区只保留当前块和正在解析的值。"""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # 各条记录的字段名相同，共享同一批 key 字符串，避免每条记录各存一份
+        self._keys = {}
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """跳过空白并返回下一个字符，文件结束时返回空字符串。"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"JSON 格式错误：位置 {self.pos} 处应为 {' 或 '.join(chars)}，实际为 {char or '文件结尾'}")
+        self.pos += 1
+        return char
+
+    def decode_value(self):
+        while True:
+            self.peek()
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 数字可能在块边界被截断（"12." 会被解析成 12），值之后必须已经读到分隔符才算完整
+            after = _WHITESPACE.match(self.buffer, end).end()
+            if (after >= len(self.buffer) or self.buffer[after] not in _VALUE_TERMINATORS) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(text):
+    text.expect('[')
+    if text.peek() == ']':
+        text.pos += 1
+        return
+    keys = text._keys
+    while True:
+        value = text.decode_value()
+        if isinstance(value, dict):
+            value = {keys.setdefault(key, key): item for key, item in value.items()}
+        yield value
+        if text.expect(',]') == ']':
+            return
+
+
+def iter_json_stream_records(stream, root_key='tools', header=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """从文本流中逐条读取记录，兼容纯列表和 {root_key: [...]} 两种结构。
+
+    内存占用只与块大小和单条记录大小有关，与文件总大小无关。根对象中的其他键写入 header（如果提供），
+    位于列表之前的键在产出第一条记录前即可读取，之后的键要等迭代结束。根键不存在或不是列表时不产出记录；
+    JSON 格式错误时抛出 ValueError，此前已产出的记录不会撤回。
+    """
+    text = _ChunkedText(stream, chunk_size)
+    first = text.peek()
+    if first == '[':
+        yield from _iter_array(text)
+    elif first == '{':
+        text.pos += 1
+        found = False
+        if text.peek() == '}':
+            text.pos += 1
+        else:
+            while True:
+                if text.peek() != '"':
+                    raise ValueError(f"JSON 格式错误：位置 {text.pos} 处应为对象键")
+                key = text.decode_value()
+                text.expect(':')
+                if key == root_key and not found and text.peek() == '[':
+                    found = True
+                    yield from _iter_array(text)
+                else:
+                    value = text.decode_value()
+                    if header is not None:
+                        header[key] = value
+                if text.expect(',}') == '}':
+                    break
+    elif first:
+        text.decode_value()
+    else:
+        raise ValueError("JSON 格式错误：文件为空")
+
+    if text.peek():
+        raise ValueError(f"JSON 格式错误：位置 {text.pos} 之后存在多余内容")
+
+
+def iter_json_records(file_path, root_key='tools', header=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """逐条读取 JSON 文件中的记录，用法见 ``iter_json_stream_records``；兼容带 BOM 的 UTF-8 文件。"""
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        yield from iter_json_stream_records(f, root_key=root_key, header=header, chunk_size=chunk_size)
@@ -10,14 +10,20 @@ Attachments are stored under: <repo_root>/resources/notes/_attachments/tool_<id>
 import os
 import re
 import shutil
+import sqlite3
 from pathlib import Path
 
+from core.file_durability import DURABILITY_STRICT, write_bytes_atomic
 from core.logger import logger
+from core.notes_search_index import NotesSearchIndex, fts5_trigram_available, get_notes_search_index_path
+from core.pinyin_index import PinyinKeyIndex, get_pinyin_cache, normalize_pinyin_query
 from core.runtime_paths import get_runtime_state_root
 
+NOTE_FILE_DURABILITY = DURABILITY_STRICT
+
 
 class NotesManager:
-    def __init__(self, repo_root=None):
+    def __init__(self, repo_root=None, data_manager=None):
         if repo_root:
             self.repo_root = Path(repo_root)
         else:
@@ -27,30 +33,38 @@ class NotesManager:
         self.notes_dir.mkdir(parents=True, exist_ok=True)
         self.attachments_root = self.notes_dir / '_attachments'
         self.attachments_root.mkdir(parents=True, exist_ok=True)
-        self._search_index = []
-        self._search_index_token = None
-        self._data_manager = None
+        # 内存索引（全文索引不可用时使用）：笔记路径 -> 条目，条目中的 stat 为 (mtime_ns, size)
+        self._search_entries = None
+        self._search_index = None
+        # 笔记全文索引（SQLite FTS5），首次搜索时打开；None 表示尚未打开，False 表示不可用，改用内存索引
+        self._search_store = None
+        # 笔记标题的拼音前缀索引，来源（内存索引列表 / 全文索引及其 generation）不变时复用
+        self._memory_title_pinyin = (None, None)
+        self._store_title_pinyin = (None, None, None)
+        # 传入主窗口的 DataManager 时共用其工具数据，否则首次解析工具名时自行创建
+        self._data_manager = data_manager
         self._tool_name_cache = {}
+        self._tool_name_cache_version = None
 
     def _invalidate_search_index(self):
-        self._search_index = []
-        self._search_index_token = None
+        self._search_entries = None
+        self._search_index = None
         self._tool_name_cache = {}
 
     def invalidate_cache(self):
         """Public cache reset used after external note restores."""
         self._invalidate_search_index()
+        if self._search_store:
+            # 还原的笔记可能与索引中的 mtime / size 恰好相同，下次搜索时全部重新读取
+            try:
+                self._search_store.clear()
+            except sqlite3.Error as e:
+                self._disable_search_store(e)
 
-    def _get_search_index_token(self):
-        note_files = sorted(self.notes_dir.glob('*.md'))
-        return tuple(
-            (
-                str(note_path),
-                note_path.stat().st_mtime if note_path.exists() else 0,
-                note_path.stat().st_size if note_path.exists() else 0,
-            )
-            for note_path in note_files
-        )
+    def close(self):
+        """关闭笔记全文索引的数据库连接。"""
+        if self._search_store:
+            self._search_store.close()
 
     def _get_data_manager(self):
         if self._data_manager is not None:
@@ -67,12 +81,18 @@ class NotesManager:
         if tool_id in (None, ''):
             return fallback_name or ''
 
+        data_manager = self._get_data_manager()
+        # 工具库变化（改名、删除）后重新解析工具名
+        tools_version = getattr(data_manager, 'tools_version', None)
+        if tools_version != self._tool_name_cache_version:
+            self._tool_name_cache = {}
+            self._tool_name_cache_version = tools_version
+
         cache_key = int(tool_id) if isinstance(tool_id, int) or str(tool_id).isdigit() else tool_id
         if cache_key in self._tool_name_cache:
             return self._tool_name_cache[cache_key] or fallback_name or ''
 
         resolved_name = ''
-        data_manager = self._get_data_manager()
         if data_manager is not None:
             try:
                 tool = data_manager.get_tool_by_id(int(tool_id))
@@ -84,38 +104,85 @@ class NotesManager:
         self._tool_name_cache[cache_key] = resolved_name
         return resolved_name or fallback_name or ''
 
-    def _build_search_index(self):
-        token = self._get_search_index_token()
-        if token == self._search_index_token and self._search_index:
-            return self._search_index
-
-        index = []
-        for note_path in sorted(self.notes_dir.glob('*.md')):
+    def _make_search_entry(self, note_path: Path, file_stat, content: str = None):
+        if content is None:
             content = self._read_text(note_path)
-            if not content:
-                continue
+        if not content:
+            # 空笔记只记录文件状态，文件不变时不再读取
+            return {'stat': file_stat, 'content': ''}
 
-            note_key, tool_id = self._parse_note_identity(note_path.stem)
-            display_name = self._resolve_tool_name(tool_id=tool_id, fallback_name=note_key)
-            summary = self._make_summary(content)
-            record = self._build_note_record(note_path, content)
-            record['note_key'] = note_key
-            record['tool_id'] = tool_id
-            index.append({
-                'note_key': note_key,
-                'tool_id': tool_id,
-                'summary': summary,
-                'content': content,
-                'searchable_text': ' '.join(
-                    filter(None, [note_key.lower(), display_name.lower(), summary.lower(), content.lower()])
-                ),
-                'record': record,
-            })
+        note_key, tool_id = self._parse_note_identity(note_path.stem)
+        display_name = self._resolve_tool_name(tool_id=tool_id, fallback_name=note_key)
+        summary = self._make_summary(content)
+        record = self._build_note_record(note_path, content, summary=summary)
+        record['note_key'] = note_key
+        record['tool_id'] = tool_id
+        return {
+            'stat': file_stat,
+            'note_key': note_key,
+            'tool_id': tool_id,
+            'title': display_name,
+            'summary': summary,
+            'content': content,
+            'searchable_text': ' '.join(
+                filter(None, [note_key.lower(), display_name.lower(), summary.lower(), content.lower()])
+            ),
+            'title_pinyin': get_pinyin_cache(self.repo_root).keys(display_name.lower()),
+            'record': record,
+        }
 
-        self._search_index = index
-        self._search_index_token = token
+    def _build_search_index(self):
+        """返回内存索引条目（按路径排序）。
+
+        与上次的 {路径: (mtime_ns, size)} 对比，只重新读取新增或变化的笔记并删除已不存在的笔记；
+        工具改名后只为对应笔记重建条目。
+        """
+        entries = self._search_entries
+        if entries is None:
+            entries = self._search_entries = {}
+        changed = self._search_index is None
+        seen = set()
+        for path, mtime_ns, size in self._iter_note_stats():
+            seen.add(path)
+            entry = entries.get(path)
+            file_stat = (mtime_ns, size)
+            if entry is not None and entry['stat'] == file_stat:
+                if not entry['content'] or entry['title'] == self._resolve_tool_name(
+                    tool_id=entry['tool_id'], fallback_name=entry['note_key']
+                ):
+                    continue
+                entries[path] = self._make_search_entry(Path(path), file_stat, entry['content'])
+            else:
+                entries[path] = self._make_search_entry(Path(path), file_stat)
+            changed = True
+
+        for path in [path for path in entries if path not in seen]:
+            del entries[path]
+            changed = True
+
+        if changed:
+            get_pinyin_cache(self.repo_root).flush()
+            self._search_index = [entries[path] for path in sorted(entries) if entries[path]['content']]
         return self._search_index
 
+    def _update_search_entry(self, note_path: Path, content: str):
+        """保存笔记后直接更新该笔记的索引条目，其余笔记不受影响。"""
+        try:
+            stat = note_path.stat()
+        except OSError:
+            return
+        path = str(note_path)
+        if self._search_entries is not None:
+            self._search_entries[path] = self._make_search_entry(note_path, (stat.st_mtime_ns, stat.st_size), content)
+            self._search_index = None
+        if self._search_store:
+            try:
+                self._search_store.update_note(
+                    path, stat.st_mtime_ns, stat.st_size, self._indexed_note_fields(note_path, content)
+                )
+            except sqlite3.Error as e:
+                self._disable_search_store(e)
+
     def _sanitize_name(self, name: str) -> str:
         if not name:
             return 'untitled'
@@ -237,9 +304,15 @@ class NotesManager:
             return []
         return sorted(path for path in attachment_dir.iterdir() if path.is_file())
 
-    def _build_note_record(self, note_path: Path, content: str = None) -> dict:
-        if content is None:
+    def _build_note_record(self, note_path: Path, content: str = None, summary: str = None,
+                           content_length: int = None) -> dict:
+        # 全文索引已保存摘要和正文长度时不必再读取笔记文件
+        if content is None and (summary is None or content_length is None):
             content = self._read_text(note_path)
+        if summary is None:
+            summary = self._make_summary(content)
+        if content_length is None:
+            content_length = len(content or '')
 
         note_key, tool_id = self._parse_note_identity(note_path.stem)
         display_name = self._resolve_tool_name(tool_id=tool_id, fallback_name=note_key)
@@ -258,8 +331,8 @@ class NotesManager:
             'tool_id': tool_id,
             'path': str(note_path),
             'note_path': str(note_path),
-            'summary': self._make_summary(content),
-            'content_length': len(content or ''),
+            'summary': summary,
+            'content_length': content_length,
             'size': size,
             'updated_at': updated_at,
             'attachment_dir': str(self.get_attachment_dir(tool_id=tool_id, tool_name=note_key, create=False)),
@@ -322,9 +395,9 @@ class NotesManager:
     def save_note(self, content: str, tool_id=None, tool_name: str = '') -> bool:
         try:
             path = self.get_note_path(tool_id=tool_id, tool_name=tool_name)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(content or '', encoding='utf-8')
-            self._invalidate_search_index()
+            # 笔记是用户手写内容且无法重建，按最高持久性等级原子写入，保存中途崩溃也不会截断旧笔记
+            write_bytes_atomic(path, (content or '').encode('utf-8'), NOTE_FILE_DURABILITY)
+            self._update_search_entry(path, content or '')
             return True
         except Exception as e:
             logger.warning("保存笔记失败 %s/%s: %s", tool_id, tool_name, e)
@@ -396,24 +469,132 @@ class NotesManager:
             'size': target.stat().st_size if target.exists() else 0,
         }
 
+    def _get_search_store(self):
+        if self._search_store is None:
+            if fts5_trigram_available():
+                self._search_store = NotesSearchIndex(get_notes_search_index_path(self.repo_root))
+            else:
+                self._search_store = False
+        return self._search_store or None
+
+    def _disable_search_store(self, error):
+        logger.warning("笔记全文索引不可用，改用内存索引: %s", error)
+        # 删除可能已损坏的索引文件，下次启动时重新建立
+        self._search_store.discard()
+        self._search_store = False
+
+    def _iter_note_stats(self):
+        for note_path in self.notes_dir.glob('*.md'):
+            try:
+                stat = note_path.stat()
+            except OSError:
+                continue
+            yield str(note_path), stat.st_mtime_ns, stat.st_size
+
+    def _load_indexed_note(self, path):
+        note_path = Path(path)
+        return self._indexed_note_fields(note_path, self._read_text(note_path))
+
+    def _indexed_note_fields(self, note_path: Path, content: str):
+        if not content:
+            return None
+        note_key, tool_id = self._parse_note_identity(note_path.stem)
+        return {
+            'note_key': note_key,
+            'tool_id': tool_id,
+            'title': self._resolve_tool_name(tool_id=tool_id, fallback_name=note_key),
+            'summary': self._make_summary(content),
+            'content': content,
+        }
+
+    def _get_title_pinyin_index(self, search_index):
+        """内存索引条目标题的拼音前缀索引，按条目下标登记；内存索引重建后随之重建。"""
+        source, pinyin_index = self._memory_title_pinyin
+        if source is not search_index:
+            pinyin_index = PinyinKeyIndex()
+            for position, entry in enumerate(search_index):
+                pinyin_index.add(position, entry.get('title_pinyin'))
+            self._memory_title_pinyin = (search_index, pinyin_index)
+        return pinyin_index
+
+    def _get_store_title_pinyin_index(self, store):
+        """全文索引中笔记标题的拼音前缀索引，按笔记路径登记；笔记或标题变化后才重新读取标题。"""
+        source, generation, pinyin_index = self._store_title_pinyin
+        if source is not store or generation != store.generation:
+            pinyin_cache = get_pinyin_cache(self.repo_root)
+            pinyin_index = PinyinKeyIndex()
+            for path, title in store.titles():
+                pinyin_index.add(path, pinyin_cache.keys(title.lower()))
+            pinyin_cache.flush()
+            self._store_title_pinyin = (store, store.generation, pinyin_index)
+        return pinyin_index
+
+    def _search_notes_indexed(self, store, query, keyword, pinyin_query):
+        store.sync(
+            self._iter_note_stats(),
+            self._load_indexed_note,
+            lambda note_key, tool_id: self._resolve_tool_name(tool_id=tool_id, fallback_name=note_key),
+        )
+        pinyin_paths = set()
+        if pinyin_query:
+            pinyin_paths = set(self._get_store_title_pinyin_index(store).match(pinyin_query))
+
+        results = []
+        for hit in store.search(query, extra_paths=pinyin_paths):
+            summary = hit['summary']
+            record = self._build_note_record(
+                Path(hit['path']),
+                summary=summary,
+                content_length=hit['content_length'],
+            )
+            record.update({
+                'excerpt': hit['excerpt'] or self._make_summary(summary, max_length=60),
+                'matched_in_title': (
+                    hit['path'] in pinyin_paths
+                    or query in hit['note_key'].lower()
+                    or query in str(record.get('tool_name', '')).lower()
+                ),
+                'matched_in_summary': query in summary.lower(),
+                'matched_in_content': hit['matched_in_content'],
+                'query': keyword,
+            })
+            results.append(record)
+        return results
+
     def search_notes(self, keyword: str):
         query = (keyword or '').strip().lower()
         if not query:
             return []
 
+        # 笔记标题（工具名）还可以按拼音全拼或首字母搜索
+        pinyin_query = normalize_pinyin_query(query)
+        store = self._get_search_store()
+        if store is not None:
+            try:
+                return self._search_notes_indexed(store, query, keyword, pinyin_query)
+            except sqlite3.Error as e:
+                self._disable_search_store(e)
+
         results = []
-        for entry in self._build_search_index():
+        search_index = self._build_search_index()
+        pinyin_positions = self._get_title_pinyin_index(search_index).match(pinyin_query) if pinyin_query else {}
+        for position, entry in enumerate(search_index):
             content = entry.get('content') or ''
             note_key = entry.get('note_key') or ''
             summary = entry.get('summary') or ''
             searchable_text = entry.get('searchable_text') or ''
-            if query not in searchable_text:
+            matched_in_pinyin = position in pinyin_positions
+            if query not in searchable_text and not matched_in_pinyin:
                 continue
 
             record = dict(entry.get('record') or {})
             record.update({
                 'excerpt': self._make_excerpt(content, query),
-                'matched_in_title': query in note_key.lower() or query in str(record.get('tool_name', '')).lower(),
+                'matched_in_title': (
+                    matched_in_pinyin
+                    or query in note_key.lower()
+                    or query in str(record.get('tool_name', '')).lower()
+                ),
                 'matched_in_summary': query in summary.lower(),
                 'matched_in_content': query in content.lower(),
                 'query': keyword,
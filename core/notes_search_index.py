@@ -0,0 +1,318 @@
+import os
+import sqlite3
+
+from core.logger import logger
+
+NOTES_SEARCH_INDEX_FILE_NAME = "notes_search.sqlite3"
+NOTES_SEARCH_SCHEMA_VERSION = 1
+# trigram 分词只能匹配不少于三个字符的查询，更短的查询改为 LIKE 扫描
+FTS_MIN_QUERY_LENGTH = 3
+EXCERPT_RADIUS = 30
+# bm25 列权重：note_key、标题、摘要、正文
+_BM25_WEIGHTS = (8.0, 10.0, 3.0, 1.0)
+
+_SCHEMA_STATEMENTS = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL,
+        note_key TEXT NOT NULL,
+        tool_id INTEGER,
+        title TEXT NOT NULL,
+        summary TEXT NOT NULL,
+        content_length INTEGER NOT NULL
+    )
+    """,
+    # 正文只保存在全文索引里，notes 表的 id 即全文索引的 rowid
+    "CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(note_key, title, summary, content, tokenize='trigram')",
+)
+
+_fts5_trigram_supported = None
+
+
+def get_notes_search_index_path(repo_root):
+    """放在运行目录的 cache 下：可随时删除重建，不会被运行时备份打包。"""
+    return os.path.join(os.path.abspath(repo_root), "cache", NOTES_SEARCH_INDEX_FILE_NAME)
+
+
+def fts5_trigram_available():
+    """当前 SQLite 是否支持 FTS5 的 trigram 分词（SQLite 3.34+）。"""
+    global _fts5_trigram_supported
+    if _fts5_trigram_supported is None:
+        try:
+            connection = sqlite3.connect(":memory:")
+            try:
+                connection.execute("CREATE VIRTUAL TABLE probe USING fts5(text, tokenize='trigram')")
+            finally:
+                connection.close()
+            _fts5_trigram_supported = True
+        except sqlite3.Error as e:
+            logger.info("SQLite 不支持 FTS5 trigram 分词，笔记搜索使用内存索引: %s", str(e))
+            _fts5_trigram_supported = False
+    return _fts5_trigram_supported
+
+
+def _escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _fts_phrase(query):
+    # 整个查询作为一个短语：trigram 分词下等价于子串匹配，引号加倍转义
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _make_excerpt(window, position, query_length, content_length):
+    """window 是正文中从命中位置前 EXCERPT_RADIUS 个字符截出的一段，position 为命中位置（从 1 开始），
+    裁剪并补省略号，格式与逐条扫描时的摘录相同。"""
+    match_index = position - 1
+    start = max(0, match_index - EXCERPT_RADIUS)
+    end = min(content_length, match_index + query_length + EXCERPT_RADIUS)
+    excerpt = window[:end - start].replace('\n', ' ').strip()
+    if start > 0:
+        excerpt = f"...{excerpt}"
+    if end < content_length:
+        excerpt = f"{excerpt}..."
+    return excerpt
+
+
+class NotesSearchIndex:
+    """笔记全文索引：SQLite FTS5（trigram 分词），数据库文件放在运行目录的 cache 下。
+
+    notes 表记录每个笔记文件的 mtime / size 和标题、摘要，正文只写入全文索引；``sync()`` 对比文件
+    状态，只重新读取新增或变化的笔记，删除已不存在的笔记，搜索时不需要把正文读进内存。
+    ``generation`` 在笔记或标题每次变化时加一，调用方可据此缓存由 ``titles()`` 派生的数据。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = os.path.abspath(db_path)
+        self._connection = None
+        self.generation = 0
+
+    def _connect(self):
+        if self._connection is not None:
+            return self._connection
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        try:
+            try:
+                connection.execute("PRAGMA journal_mode=WAL")
+            except sqlite3.DatabaseError as e:
+                logger.debug("笔记索引无法切换到 WAL 模式: %s", str(e))
+            # 索引可随时重建，不必等待落盘
+            connection.execute("PRAGMA synchronous=OFF")
+            self._ensure_schema(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        self._connection = connection
+        return connection
+
+    @staticmethod
+    def _ensure_schema(connection):
+        row = None
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        with connection:
+            if row is not None and row[0] != str(NOTES_SEARCH_SCHEMA_VERSION):
+                for table in ("notes_fts", "notes", "meta"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in _SCHEMA_STATEMENTS:
+                connection.execute(statement)
+            connection.execute(
+                "INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(NOTES_SEARCH_SCHEMA_VERSION),),
+            )
+
+    def close(self):
+        connection, self._connection = self._connection, None
+        if connection is None:
+            return
+        try:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error:
+            pass
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
+
+    def discard(self):
+        """关闭并删除数据库文件，下次使用时从头建立（文件损坏时调用）。"""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.db_path + suffix)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug("删除笔记索引文件失败 %s: %s", self.db_path + suffix, str(e))
+
+    def clear(self):
+        """清空索引，下次 sync 时重新读取全部笔记。"""
+        connection = self._connect()
+        with connection:
+            connection.execute("DELETE FROM notes")
+            connection.execute("DELETE FROM notes_fts")
+        self.generation += 1
+
+    def sync(self, note_stats, load_note, resolve_title=None):
+        """让索引与笔记目录一致，返回 (更新数, 删除数)。
+
+        note_stats: [(路径, mtime_ns, size)]；load_note(路径) 返回
+        ``{"note_key", "tool_id", "title", "summary", "content"}``，笔记为空或读取失败时返回 None。
+        resolve_title(note_key, tool_id) 返回当前标题：工具改名后笔记文件不变，也要更新标题。
+        """
+        connection = self._connect()
+        indexed = {
+            path: (note_id, mtime_ns, size, note_key, tool_id, title)
+            for note_id, path, mtime_ns, size, note_key, tool_id, title in connection.execute(
+                "SELECT id, path, mtime_ns, size, note_key, tool_id, title FROM notes"
+            )
+        }
+        updated = 0
+        renamed = 0
+        with connection:
+            for path, mtime_ns, size in note_stats:
+                current = indexed.pop(path, None)
+                if current is not None and current[1] == mtime_ns and current[2] == size:
+                    if resolve_title is not None:
+                        title = resolve_title(current[3], current[4])
+                        if title != current[5]:
+                            connection.execute("UPDATE notes SET title = ? WHERE id = ?", (title, current[0]))
+                            connection.execute("UPDATE notes_fts SET title = ? WHERE rowid = ?", (title, current[0]))
+                            renamed += 1
+                    continue
+                note = load_note(path)
+                if current is not None:
+                    self._delete(connection, current[0])
+                self._insert(connection, path, mtime_ns, size, note)
+                updated += 1
+
+            for note_id, *_ in indexed.values():
+                self._delete(connection, note_id)
+        if updated or renamed or indexed:
+            self.generation += 1
+        return updated, len(indexed)
+
+    def update_note(self, path, mtime_ns, size, note):
+        """直接写入单个笔记（保存笔记后调用），参数同 sync() 中的一项。"""
+        connection = self._connect()
+        with connection:
+            row = connection.execute("SELECT id FROM notes WHERE path = ?", (path,)).fetchone()
+            if row is not None:
+                self._delete(connection, row[0])
+            self._insert(connection, path, mtime_ns, size, note)
+        self.generation += 1
+
+    @staticmethod
+    def _delete(connection, note_id):
+        connection.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        connection.execute("DELETE FROM notes_fts WHERE rowid = ?", (note_id,))
+
+    @staticmethod
+    def _insert(connection, path, mtime_ns, size, note):
+        # 空笔记或读取失败的笔记只记录文件状态，不进入全文索引，文件不变时也不会再次读取
+        note = note or {}
+        content = note.get("content") or ""
+        cursor = connection.execute(
+            "INSERT INTO notes(path, mtime_ns, size, note_key, tool_id, title, summary, content_length) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                mtime_ns,
+                size,
+                note.get("note_key") or "",
+                note.get("tool_id"),
+                note.get("title") or "",
+                note.get("summary") or "",
+                len(content),
+            ),
+        )
+        if not content:
+            return
+        connection.execute(
+            "INSERT INTO notes_fts(rowid, note_key, title, summary, content) VALUES (?, ?, ?, ?, ?)",
+            (cursor.lastrowid, note.get("note_key") or "", note.get("title") or "", note.get("summary") or "", content),
+        )
+
+    def titles(self):
+        """返回 [(路径, 标题)]，用于按拼音匹配标题。"""
+        return self._connect().execute("SELECT path, title FROM notes WHERE content_length > 0").fetchall()
+
+    def search(self, query, extra_paths=()):
+        """返回包含 query（小写）的笔记，按相关度排序；extra_paths 中的笔记即使正文不含 query 也会返回。
+
+        每条结果为 ``{"path", "note_key", "tool_id", "title", "summary", "content_length", "excerpt",
+        "matched_in_content"}``；excerpt 取正文中命中位置附近的片段，正文未命中时为空字符串。
+        """
+        connection = self._connect()
+        like_pattern = f"%{_escape_like(query)}%"
+        # 摘录按命中位置在 SQLite 内截取，与逐条扫描时的摘录一致
+        columns = (
+            "n.path, n.note_key, n.tool_id, n.title, n.summary, n.content_length, "
+            "f.content LIKE ? ESCAPE '\\' AS matched_in_content, "
+            f"substr(f.content, max(1, instr(lower(f.content), ?) - {EXCERPT_RADIUS}), "
+            f"length(?) + {EXCERPT_RADIUS * 2}), instr(lower(f.content), ?)"
+        )
+        if len(query) >= FTS_MIN_QUERY_LENGTH:
+            weights = ", ".join(str(weight) for weight in _BM25_WEIGHTS)
+            rows = connection.execute(
+                f"SELECT {columns} "
+                f"FROM notes_fts AS f JOIN notes AS n ON n.id = f.rowid "
+                f"WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts, {weights})",
+                (like_pattern, query, query, query, _fts_phrase(query)),
+            ).fetchall()
+        else:
+            # 短查询没有可用的 trigram：逐条 LIKE 匹配（在 SQLite 内完成），标题命中的排在前面
+            rows = connection.execute(
+                f"SELECT {columns} "
+                "FROM notes_fts AS f JOIN notes AS n ON n.id = f.rowid "
+                "WHERE f.note_key LIKE ? ESCAPE '\\' OR f.title LIKE ? ESCAPE '\\' "
+                "OR f.summary LIKE ? ESCAPE '\\' OR f.content LIKE ? ESCAPE '\\' "
+                "ORDER BY (f.title LIKE ? ESCAPE '\\') DESC, n.path",
+                (like_pattern, query, query, query, like_pattern, like_pattern, like_pattern, like_pattern,
+                 like_pattern),
+            ).fetchall()
+
+        results = []
+        seen = set()
+        for row in rows:
+            path, note_key, tool_id, title, summary, content_length, matched_in_content, window, position = row
+            excerpt = _make_excerpt(window, position, len(query), content_length) if position else ""
+            seen.add(path)
+            results.append({
+                "path": path,
+                "note_key": note_key,
+                "tool_id": tool_id,
+                "title": title,
+                "summary": summary,
+                "content_length": content_length,
+                "excerpt": excerpt if matched_in_content else "",
+                "matched_in_content": bool(matched_in_content),
+            })
+
+        extra_paths = [path for path in extra_paths if path not in seen]
+        if extra_paths:
+            placeholders = ", ".join("?" for _ in extra_paths)
+            for path, note_key, tool_id, title, summary, content_length in connection.execute(
+                "SELECT path, note_key, tool_id, title, summary, content_length FROM notes "
+                f"WHERE content_length > 0 AND path IN ({placeholders}) ORDER BY path",
+                extra_paths,
+            ):
+                results.append({
+                    "path": path,
+                    "note_key": note_key,
+                    "tool_id": tool_id,
+                    "title": title,
+                    "summary": summary,
+                    "content_length": content_length,
+                    "excerpt": "",
+                    "matched_in_content": False,
+                })
+        return results
@@ -0,0 +1,252 @@
+import marshal
+import os
+import re
+from bisect import bisect_left
+from collections import namedtuple
+
+from core.file_durability import DURABILITY_NORMAL, write_bytes_atomic
+from core.logger import logger
+
+# pypinyin 为可选依赖：未安装时拼音搜索不可用，其余搜索不受影响
+try:
+    import pypinyin
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    pypinyin = None
+    lazy_pinyin = None
+
+PINYIN_CACHE_FILE_NAME = "pinyin.cache.bin"
+PINYIN_CACHE_VERSION = 1
+_PINYIN_CACHE_HEADER = (
+    'zifeiyu-pinyin-cache',
+    PINYIN_CACHE_VERSION,
+    getattr(pypinyin, '__version__', None),
+    marshal.version,
+)
+# 缓存中超过本次运行用到条目数的这个倍数时，写入前只保留用到的条目
+PINYIN_CACHE_PRUNE_FACTOR = 2
+
+_CJK_RE = re.compile(r"[\u4e00-\u9fff]")
+_LATIN_WORD_RE = re.compile(r"[a-z0-9]+")
+_PINYIN_QUERY_RE = re.compile(r"[a-z]+")
+# 单个字母从任意音节开始都能匹配，几乎命中全部中文名称，不按拼音搜索
+PINYIN_QUERY_MIN_LENGTH = 2
+
+PINYIN_MATCH_NONE = 0
+PINYIN_MATCH_BOUNDARY = 1  # 从中间某个音节开始匹配
+PINYIN_MATCH_PREFIX = 2  # 从第一个音节开始匹配
+PINYIN_MATCH_EXACT = 3  # 完整拼音或全部首字母
+
+# full: 全拼（音节直接拼接）；initials: 各音节首字母；offsets: 每个音节在 full 中的起始位置
+PinyinKeys = namedtuple("PinyinKeys", ("full", "initials", "offsets"))
+
+_PINYIN_CACHES = {}
+
+
+def pinyin_available():
+    return lazy_pinyin is not None
+
+
+def get_pinyin_cache_path(config_dir):
+    """与工具快照一样放在运行目录的 cache 下，不会被运行时备份打包。"""
+    return os.path.join(os.path.abspath(config_dir), "cache", PINYIN_CACHE_FILE_NAME)
+
+
+def get_pinyin_cache(config_dir=None):
+    """同一运行目录共用一个缓存实例，主窗口搜索、笔记搜索和批量管理对话框不会互相覆盖缓存文件。
+
+    不传 config_dir 时返回只在内存中的共享实例。
+    """
+    cache_path = get_pinyin_cache_path(config_dir) if config_dir else None
+    cache = _PINYIN_CACHES.get(cache_path)
+    if cache is None:
+        cache = PinyinCache(cache_path)
+        _PINYIN_CACHES[cache_path] = cache
+    return cache
+
+
+def normalize_pinyin_query(query):
+    """拼音查询由至少两个字母组成（允许空格分隔音节），返回去掉空格的小写查询；否则返回空字符串。"""
+    text = str(query or "").lower().replace(" ", "")
+    if len(text) < PINYIN_QUERY_MIN_LENGTH or not _PINYIN_QUERY_RE.fullmatch(text):
+        return ""
+    return text
+
+
+def build_pinyin_keys(syllables):
+    full_parts = []
+    initials = []
+    offsets = []
+    position = 0
+    for syllable in syllables:
+        offsets.append(position)
+        full_parts.append(syllable)
+        initials.append(syllable[0])
+        position += len(syllable)
+    return PinyinKeys("".join(full_parts), "".join(initials), tuple(offsets))
+
+
+def pinyin_match_level(query, keys):
+    """query 须先经过 normalize_pinyin_query。按全拼或首字母，从音节边界开始做前缀匹配。"""
+    if not query or keys is None:
+        return PINYIN_MATCH_NONE
+    if query == keys.full or query == keys.initials:
+        return PINYIN_MATCH_EXACT
+    if keys.full.startswith(query) or keys.initials.startswith(query):
+        return PINYIN_MATCH_PREFIX
+    full = keys.full
+    initials = keys.initials
+    for index in range(1, len(keys.offsets)):
+        if full.startswith(query, keys.offsets[index]) or initials.startswith(query, index):
+            return PINYIN_MATCH_BOUNDARY
+    return PINYIN_MATCH_NONE
+
+
+class PinyinKeyIndex:
+    """拼音前缀索引：每条文本的全拼和首字母，从每个音节边界开始各取一个后缀，放进有序表。
+
+    pinyin_match_level 逐条比较，查询耗时随条目数线性增长；这里以 query 开头的后缀在有序表中相邻，
+    二分找到起点后只遍历命中的部分，结果与逐条调用 pinyin_match_level 相同。
+    条目标识 item 须能互相比较（如下标、路径）。只支持追加，条目失效时由调用方跳过或整体重建。
+    """
+
+    __slots__ = ("_suffixes", "_sorted")
+
+    def __init__(self):
+        # (后缀, 从首个音节开始时为 PINYIN_MATCH_PREFIX 否则为 PINYIN_MATCH_BOUNDARY, item)
+        self._suffixes = []
+        self._sorted = True
+
+    def __len__(self):
+        return len(self._suffixes)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(suffixes={len(self._suffixes)})"
+
+    def add(self, item, keys):
+        """加入 item 的 PinyinKeys；keys 为 None 时忽略。"""
+        if keys is None:
+            return
+        suffixes = self._suffixes
+        full = keys.full
+        initials = keys.initials
+        for index, offset in enumerate(keys.offsets):
+            level = PINYIN_MATCH_PREFIX if index == 0 else PINYIN_MATCH_BOUNDARY
+            suffixes.append((full[offset:], level, item))
+            suffixes.append((initials[index:], level, item))
+        self._sorted = False
+
+    def sort(self):
+        """把新追加的后缀并入有序表；match() 也会按需调用，建索引时提前调用可避免首次查询时排序。"""
+        if not self._sorted:
+            # 已排序部分加上新追加的尾部，timsort 只需归并两段
+            self._suffixes.sort()
+            self._sorted = True
+
+    def match(self, query):
+        """返回 {item: 匹配档位}；query 须先经过 normalize_pinyin_query。"""
+        if not query:
+            return {}
+        self.sort()
+        suffixes = self._suffixes
+        matches = {}
+        for position in range(bisect_left(suffixes, (query,)), len(suffixes)):
+            suffix, level, item = suffixes[position]
+            if not suffix.startswith(query):
+                break
+            if level == PINYIN_MATCH_PREFIX and suffix == query:
+                level = PINYIN_MATCH_EXACT
+            if level > matches.get(item, PINYIN_MATCH_NONE):
+                matches[item] = level
+        return matches
+
+
+def _convert_syllables(text):
+    syllables = []
+    for item in lazy_pinyin(text, style=Style.NORMAL, errors="default"):
+        item = item.lower()
+        if _CJK_RE.search(item):
+            continue
+        # 非汉字片段（英文、数字）按单词拆开，和音节一样参与首字母和边界匹配
+        syllables.extend(_LATIN_WORD_RE.findall(item))
+    return tuple(syllables)
+
+
+class PinyinCache:
+    """文本 -> 拼音音节的缓存，按工具库中出现的名称逐条转换，转换结果写入磁盘。
+
+    pypinyin 转换较慢，大工具库启动时逐条转换需要数秒；缓存以文本为键，工具库版本变化时只需转换
+    新增或改名的工具，未变化的名称直接复用上次运行写入的结果。缓存文件头记录了格式版本和
+    pypinyin 版本，任一变化都会整体失效。只包含汉字的文本才会转换和缓存。
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._syllables = None
+        self._used = set()
+        self._keys = {}
+        self._dirty = False
+
+    def __repr__(self):
+        size = len(self._syllables) if self._syllables is not None else 0
+        return f"{type(self).__name__}(path={self.cache_path!r}, size={size})"
+
+    def _load(self):
+        self._syllables = {}
+        if not self.cache_path or not os.path.isfile(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'rb') as f:
+                payload = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError) as e:
+            logger.debug("读取拼音缓存失败，忽略 %s: %s", self.cache_path, str(e))
+            return
+        if not isinstance(payload, dict) or payload.get('header') != _PINYIN_CACHE_HEADER:
+            return
+        entries = payload.get('entries')
+        if isinstance(entries, dict):
+            self._syllables = entries
+
+    def syllables(self, text):
+        """返回 text 的拼音音节；不含汉字或 pypinyin 不可用时返回空元组。"""
+        if not text or lazy_pinyin is None or not _CJK_RE.search(text):
+            return ()
+        if self._syllables is None:
+            self._load()
+        self._used.add(text)
+        syllables = self._syllables.get(text)
+        if syllables is None:
+            syllables = _convert_syllables(text)
+            self._syllables[text] = syllables
+            self._dirty = True
+        return syllables
+
+    def keys(self, text):
+        """返回 text 的 PinyinKeys；没有拼音时返回 None。"""
+        keys = self._keys.get(text)
+        if keys is None and text not in self._keys:
+            syllables = self.syllables(text)
+            keys = build_pinyin_keys(syllables) if syllables else None
+            self._keys[text] = keys
+        return keys
+
+    def flush(self):
+        """有新转换的文本时写回缓存文件；失败只记录日志。"""
+        if not self._dirty or not self.cache_path:
+            return False
+        entries = self._syllables
+        if len(entries) > len(self._used) * PINYIN_CACHE_PRUNE_FACTOR:
+            # 改名、删除留下的旧条目过多时，只保留本次运行用到的文本
+            entries = {text: entries[text] for text in self._used if text in entries}
+            self._syllables = entries
+        try:
+            payload = marshal.dumps({'header': _PINYIN_CACHE_HEADER, 'entries': entries})
+        except ValueError as e:
+            logger.debug("拼音缓存包含无法写入的值，跳过写入: %s", str(e))
+            return False
+        self._dirty = False
+        try:
+            return write_bytes_atomic(self.cache_path, payload, DURABILITY_NORMAL)
+        except OSError as e:
+            logger.warning("写入拼音缓存失败 %s: %s", self.cache_path, str(e))
+            return False
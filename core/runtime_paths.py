@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import shutil
 import sys
 from pathlib import Path
@@ -261,6 +262,20 @@ def resolve_accessible_path_value(value: str, base_dir: str | Path | None = None
     return resolved
 
 
+def is_accessible_path_value_missing(value: str, base_dir: str | Path | None = None) -> bool:
+    """Whether resolve_accessible_path_value() would yield a path that does not exist.
+
+    Checks the joined path directly instead of resolving it, so it stays cheap for large tool lists.
+    Command names that are not found on PATH resolve to None and are not reported as missing.
+    """
+    text = str(value or "").strip()
+    if not text or text.startswith(("http://", "https://")):
+        return False
+    if os.path.exists(os.path.join(os.fspath(base_dir) if base_dir else "", text)):
+        return False
+    return os.path.isabs(text) or not _looks_like_accessible_command_name(text)
+
+
 def resolve_icon_path_value(value: str) -> Path | None:
     return resolve_resource_file(("resources", "icons"), value, ICON_EXTENSIONS)
 
@@ -0,0 +1,111 @@
+from bisect import bisect_left, insort
+
+
+def _index_key(value):
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _remove_position(positions, position):
+    index = bisect_left(positions, position)
+    if index < len(positions) and positions[index] == position:
+        del positions[index]
+
+
+class ToolCacheIndex:
+    """工具缓存的主键索引与分类 / 子分类 / 收藏二级索引。
+
+    索引只保存工具在缓存列表中的下标，查询时按下标取回原记录，结果保持工具库原有顺序。
+    单条修改后调用 ``refresh(position)`` 增量更新；删除、重排等会移动下标的操作应重建索引。
+    """
+
+    def __init__(self, tools):
+        self.tools = tools
+        self._memberships = []
+        self._positions_by_id = {}
+        self._category_positions = {}
+        self._subcategory_positions = {}
+        self._favorite_positions = []
+        for position, tool in enumerate(tools):
+            membership = self._membership(tool)
+            self._memberships.append(membership)
+            self._add(position, membership)
+
+    @property
+    def size(self):
+        return len(self._memberships)
+
+    @staticmethod
+    def _membership(tool):
+        if not isinstance(tool, dict):
+            return None
+        category_key = _index_key(tool.get('category_id'))
+        return (
+            _index_key(tool.get('id')),
+            category_key,
+            (category_key, _index_key(tool.get('subcategory_id'))),
+            bool(tool.get('is_favorite', False)),
+        )
+
+    def _add(self, position, membership):
+        if membership is None:
+            return
+        tool_key, category_key, subcategory_key, is_favorite = membership
+        insort(self._positions_by_id.setdefault(tool_key, []), position)
+        insort(self._category_positions.setdefault(category_key, []), position)
+        insort(self._subcategory_positions.setdefault(subcategory_key, []), position)
+        if is_favorite:
+            insort(self._favorite_positions, position)
+
+    def _discard(self, position, membership):
+        if membership is None:
+            return
+        tool_key, category_key, subcategory_key, is_favorite = membership
+        for mapping, key in (
+            (self._positions_by_id, tool_key),
+            (self._category_positions, category_key),
+            (self._subcategory_positions, subcategory_key),
+        ):
+            positions = mapping.get(key)
+            if positions is None:
+                continue
+            _remove_position(positions, position)
+            if not positions:
+                del mapping[key]
+        if is_favorite:
+            _remove_position(self._favorite_positions, position)
+
+    def refresh(self, position):
+        """在 tools[position] 被替换、原地修改或新追加后同步索引。"""
+        while len(self._memberships) <= position:
+            self._memberships.append(None)
+        previous = self._memberships[position]
+        current = self._membership(self.tools[position])
+        if previous == current:
+            return
+        self._discard(position, previous)
+        self._add(position, current)
+        self._memberships[position] = current
+
+    def _tools_at(self, positions):
+        return [self.tools[position] for position in positions or ()]
+
+    def position_of(self, tool_id):
+        positions = self._positions_by_id.get(_index_key(tool_id))
+        return positions[0] if positions else None
+
+    def get(self, tool_id):
+        position = self.position_of(tool_id)
+        return self.tools[position] if position is not None else None
+
+    def by_category(self, category_id, subcategory_id=None):
+        category_key = _index_key(category_id)
+        if subcategory_id is None:
+            return self._tools_at(self._category_positions.get(category_key))
+        return self._tools_at(self._subcategory_positions.get((category_key, _index_key(subcategory_id))))
+
+    def favorites(self):
+        return self._tools_at(self._favorite_positions)
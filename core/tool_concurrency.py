@@ -0,0 +1,178 @@
+import os
+import re
+import threading
+import time
+
+from core.logger import logger
+from core.tool_record import tool_record_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TOOLS_LOCK_FILE_NAME = ".tools.lock"
+_GENERATION_PATTERN = re.compile(rb'^\s*\{\s*"generation"\s*:\s*(\d+)')
+_GENERATION_PROBE_SIZE = 256
+
+
+class StorageLockTimeout(TimeoutError):
+    """等待其他实例释放工具数据锁超时。"""
+
+
+def get_tools_lock_path(data_dir):
+    """锁文件与 tools.json 同目录，共享目录上的多个实例使用同一个锁。"""
+    return os.path.join(os.path.abspath(data_dir), TOOLS_LOCK_FILE_NAME)
+
+
+def read_tools_generation(tools_file):
+    """读取 tools.json 开头的数据代数；文件不存在、是纯列表格式或没有代数时返回 0。
+
+    代数总是写在对象的第一个键，只需读取文件头部，不必解析整个工具库。
+    """
+    try:
+        with open(tools_file, 'rb') as f:
+            head = f.read(_GENERATION_PROBE_SIZE)
+    except OSError:
+        return 0
+    match = _GENERATION_PATTERN.match(head)
+    return int(match.group(1)) if match else 0
+
+
+class ToolsStorageLock:
+    """跨进程的工具数据写锁（锁文件上的建议锁），同一进程内可重入。
+
+    只有写入方需要加锁；读取仍依赖原子替换，不会被其他实例的写入阻塞。
+    """
+
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, lock_path, timeout=10.0):
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth:
+            self._depth += 1
+            return True
+        try:
+            self._handle = self._lock_file()
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth = 1
+        return True
+
+    def release(self):
+        if not self._depth:
+            raise RuntimeError("工具数据锁未被持有")
+        self._depth -= 1
+        try:
+            if not self._depth:
+                handle, self._handle = self._handle, None
+                self._unlock_file(handle)
+        finally:
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    @property
+    def is_held(self):
+        return self._depth > 0
+
+    def _lock_file(self):
+        os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+        handle = open(self.lock_path, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                return handle
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise StorageLockTimeout(f"等待工具数据锁超时: {self.lock_path}")
+                time.sleep(self.POLL_INTERVAL)
+
+    @staticmethod
+    def _unlock_file(handle):
+        if handle is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError as e:
+            logger.debug("释放工具数据锁失败: %s", str(e))
+        finally:
+            handle.close()
+
+
+def _records_by_id(records):
+    return {record.get('id'): record for record in records if isinstance(record, dict) and record.get('id') is not None}
+
+
+def merge_tool_records(base, ours, theirs):
+    """按工具 id 三方合并，返回 (合并后的记录, 冲突的工具 id 列表)。
+
+    base 是本实例上次读取时磁盘上的记录，ours 是本实例准备写入的记录，theirs 是磁盘上的当前记录：
+    只有一方修改、新增或删除的记录采用该方的结果；双方都修改了同一条记录时以本实例为准并记为冲突；
+    双方各自新增了同一个 id 时保留磁盘上的记录，本实例的记录改用新的 id。
+    本实例调整过顺序时沿用本实例的顺序，否则沿用磁盘上的顺序，其余记录追加在末尾。
+    """
+    base_hashes = {tool_id: tool_record_hash(record) for tool_id, record in _records_by_id(base).items()}
+    ours_by_id = _records_by_id(ours)
+    theirs_by_id = _records_by_id(theirs)
+    next_id = max((tool_id for tool_id in (*ours_by_id, *theirs_by_id) if isinstance(tool_id, int)), default=0) + 1
+
+    merged_by_id = {}
+    renumbered = []
+    conflicts = []
+    for tool_id in {**theirs_by_id, **ours_by_id}:
+        our_record = ours_by_id.get(tool_id)
+        their_record = theirs_by_id.get(tool_id)
+        our_hash = tool_record_hash(our_record) if our_record is not None else None
+        their_hash = tool_record_hash(their_record) if their_record is not None else None
+        if tool_id not in base_hashes:
+            if our_record is not None and their_record is not None and our_hash != their_hash:
+                merged_by_id[tool_id] = their_record
+                renumbered.append({**our_record, 'id': next_id})
+                next_id += 1
+            else:
+                merged_by_id[tool_id] = our_record if our_record is not None else their_record
+            continue
+
+        base_hash = base_hashes[tool_id]
+        ours_changed = our_hash != base_hash
+        theirs_changed = their_hash != base_hash
+        if ours_changed and theirs_changed and our_hash != their_hash:
+            conflicts.append(tool_id)
+        record = their_record if theirs_changed and not ours_changed else our_record
+        if record is not None:
+            merged_by_id[tool_id] = record
+
+    base_order = [tool_id for tool_id in _records_by_id(base) if tool_id in ours_by_id]
+    our_order = [tool_id for tool_id in ours_by_id if tool_id in base_hashes]
+    primary = ours_by_id if our_order != base_order else theirs_by_id
+    merged = [merged_by_id.pop(tool_id) for tool_id in primary if tool_id in merged_by_id]
+    merged.extend(merged_by_id.values())
+    merged.extend(renumbered)
+    # 没有 id 的记录无法比对，保留本实例的版本
+    merged.extend(record for record in ours if not isinstance(record, dict) or record.get('id') is None)
+    return merged, conflicts
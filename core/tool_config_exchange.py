@@ -8,6 +8,7 @@ from urllib.request import Request, urlopen
 
 from core.task_control import iter_response_chunks, raise_if_cancelled
 from core.icon_validation import detect_icon_extension, is_probably_icon_data
+from core.json_stream import iter_json_records
 from core.tool_metadata import (
     DOCUMENT_EXTENSIONS as TOOL_DOCUMENT_EXTENSIONS,
     TERMINAL_SOURCE_TYPES as TOOL_TERMINAL_SOURCE_TYPES,
@@ -185,15 +186,15 @@ class ToolConfigExchangeService:
             self._to_int(tool.get("id"), 999999),
         )
 
-    def _build_export_tool(self, tool, category_map, subcategory_map):
+    def _build_export_tool(self, tool, category_index):
         exported = {
             "name": str(tool.get("name", "") or "").strip(),
             "path": str(tool.get("path", "") or "").strip(),
             "description": str(tool.get("description", "") or "").strip(),
             "category_id": tool.get("category_id"),
             "subcategory_id": tool.get("subcategory_id"),
-            "category_name": category_map.get(tool.get("category_id"), {}).get("name", ""),
-            "subcategory_name": subcategory_map.get(tool.get("subcategory_id"), {}).get("name", ""),
+            "category_name": category_index.category_name(tool.get("category_id")),
+            "subcategory_name": category_index.subcategory_name(tool.get("subcategory_id")),
             "background_image": str(tool.get("background_image", "") or "").strip(),
             "icon": str(tool.get("icon", self.DEFAULT_ICON) or self.DEFAULT_ICON).strip(),
             "is_favorite": self._to_bool(tool.get("is_favorite", False)),
@@ -221,12 +222,11 @@ class ToolConfigExchangeService:
         """Export tools configuration (config only) to JSON file.
         Paths are kept as‑is. This is the original export used by the UI.
         """
-        tools = list(self.data_manager.load_tools() or [])
-        categories = list(self.data_manager.load_categories() or [])
-        category_map, subcategory_map = self._build_category_maps(categories)
+        tools = self.data_manager.get_tools_view()
+        category_index = self.data_manager.get_category_index()
 
         exported_tools = [
-            self._build_export_tool(tool, category_map, subcategory_map)
+            self._build_export_tool(tool, category_index)
             for tool in sorted(tools, key=self._export_sort_key)
         ]
 
@@ -250,25 +250,21 @@ class ToolConfigExchangeService:
         return self.native_importer.import_file(file_path).to_legacy_result()
 
     def _import_native_tools_legacy(self, file_path):
-        payload = self._read_json(file_path)
-        if isinstance(payload, dict):
-            payload_source = str(payload.get("source", "") or "").strip().lower()
-            payload_schema = str(payload.get("schema", "") or "").strip()
-            if payload_source == "tianhu":
-                raise ValueError("检测到天狐导出文件，请使用“导入天狐2.0”功能。")
-            if payload_schema and payload_schema != self.EXPORT_SCHEMA:
-                raise ValueError(f"不支持的配置文件 schema: {payload_schema}")
-
-        tools_payload = self._extract_native_tools_payload(payload)
         categories = list(self.data_manager.load_categories() or [])
 
-        existing_tools = list(self.data_manager.load_tools() or [])
+        existing_tools = list(self.data_manager.get_tools_view())
         next_id = self._next_tool_id(existing_tools)
         seen_fingerprints = {self._tool_fingerprint(tool) for tool in existing_tools}
 
+        # 逐条读取导入文件，不再把整个文件解析进内存；schema 等字段位于工具列表之前时读到第一条工具即校验
+        header = {}
+        total = 0
         imported_tools = []
         skipped = 0
-        for item in tools_payload:
+        for item in iter_json_records(file_path, "tools", header=header):
+            if not total:
+                self._validate_native_payload_header(header)
+            total += 1
             normalized = self._normalize_native_tool(item, categories)
             fingerprint = self._tool_fingerprint(normalized)
             if fingerprint in seen_fingerprints:
@@ -280,17 +276,31 @@ class ToolConfigExchangeService:
             imported_tools.append(normalized)
             seen_fingerprints.add(fingerprint)
 
+        self._validate_native_payload_header(header)
+        if not total:
+            # 没有读到工具时按原方式解析一次，区分空列表与格式不正确的文件
+            self._extract_native_tools_payload(self._read_json(file_path))
+
         if imported_tools:
             existing_tools.extend(imported_tools)
-            if not self.data_manager.save_tools(existing_tools):
-                raise OSError("导入原生工具配置失败，保存工具配置未成功。")
+            with self.data_manager.transaction():
+                if not self.data_manager.save_tools(existing_tools):
+                    raise OSError("导入原生工具配置失败，保存工具配置未成功。")
 
         return {
             "imported": len(imported_tools),
             "skipped": skipped,
-            "total": len(tools_payload),
+            "total": total,
         }
 
+    def _validate_native_payload_header(self, header):
+        payload_source = str(header.get("source", "") or "").strip().lower()
+        payload_schema = str(header.get("schema", "") or "").strip()
+        if payload_source == "tianhu":
+            raise ValueError("检测到天狐导出文件，请使用“导入天狐2.0”功能。")
+        if payload_schema and payload_schema != self.EXPORT_SCHEMA:
+            raise ValueError(f"不支持的配置文件 schema: {payload_schema}")
+
     def _report_progress(self, progress_callback, message):
         if callable(progress_callback):
             try:
@@ -329,7 +339,7 @@ class ToolConfigExchangeService:
         self._report_progress(progress_callback, "正在整理官方工具数据...")
         tools_payload = self._extract_native_tools_payload(payload)
         categories = list(self.data_manager.load_categories() or [])
-        existing_tools = list(self.data_manager.load_tools() or [])
+        existing_tools = list(self.data_manager.get_tools_view())
         backup_path = self._backup_tools_snapshot(existing_tools, url_text)
         next_id = self._next_tool_id(existing_tools)
         should_update = self._to_bool(update_existing)
@@ -389,8 +399,9 @@ class ToolConfigExchangeService:
         if imported or updated:
             raise_if_cancelled(cancel_requested, "已取消同步官方工具库。")
             self._report_progress(progress_callback, "正在保存同步结果...")
-            if not self.data_manager.save_tools(existing_tools):
-                raise OSError("同步官方工具库失败，保存工具配置未成功。")
+            with self.data_manager.transaction():
+                if not self.data_manager.save_tools(existing_tools):
+                    raise OSError("同步官方工具库失败，保存工具配置未成功。")
 
         return {
             "source_url": url_text,
@@ -429,7 +440,7 @@ class ToolConfigExchangeService:
         tools_payload, settings, source_root, detected_version = self._load_tianhu_payload(source_path)
         categories = list(self.data_manager.load_categories() or [])
 
-        existing_tools = list(self.data_manager.load_tools() or [])
+        existing_tools = list(self.data_manager.get_tools_view())
         next_id = self._next_tool_id(existing_tools)
         seen_fingerprints = {self._tool_fingerprint(tool) for tool in existing_tools}
 
@@ -468,9 +479,6 @@ class ToolConfigExchangeService:
                 category_stats[category_name] = category_stats.get(category_name, 0) + 1
 
         if imported_tools:
-            if categories_changed and not self.data_manager.save_categories(categories):
-                raise OSError("保存天狐导入创建的临时子分类失败。")
-
             for tool in imported_tools:
                 tool.pop("_mapped_category_name", None)
                 tool.pop("_mapped_subcategory_name", None)
@@ -478,8 +486,12 @@ class ToolConfigExchangeService:
                 tool.pop("_resolved_subcategory_name", None)
             existing_tools.extend(imported_tools)
             self._report_progress(progress_callback, "正在保存天狐导入结果...")
-            if not self.data_manager.save_tools(existing_tools):
-                raise OSError("导入天狐工具失败，保存工具配置未成功。")
+            # 新建的子分类与导入的工具一起提交，任何一步失败都不会留下孤立的子分类。
+            with self.data_manager.transaction():
+                if categories_changed and not self.data_manager.save_categories(categories):
+                    raise OSError("保存天狐导入创建的临时子分类失败。")
+                if not self.data_manager.save_tools(existing_tools):
+                    raise OSError("导入天狐工具失败，保存工具配置未成功。")
 
         return {
             "imported": len(imported_tools),
@@ -492,11 +504,10 @@ class ToolConfigExchangeService:
         }
 
     def get_tianhu_tools(self):
-        tools = list(self.data_manager.load_tools() or [])
-        return [tool for tool in tools if self._is_tianhu_tool(tool)]
+        return [tool for tool in self.data_manager.get_tools_view() if self._is_tianhu_tool(tool)]
 
     def remove_tianhu_tools(self):
-        existing_tools = list(self.data_manager.load_tools() or [])
+        existing_tools = list(self.data_manager.get_tools_view())
         removed_tools = [tool for tool in existing_tools if self._is_tianhu_tool(tool)]
         if not removed_tools:
             return {
@@ -506,8 +517,9 @@ class ToolConfigExchangeService:
             }
 
         remaining_tools = [tool for tool in existing_tools if not self._is_tianhu_tool(tool)]
-        if not self.data_manager.save_tools(remaining_tools):
-            raise OSError("删除天狐导入工具失败，保存工具配置未成功。")
+        with self.data_manager.transaction():
+            if not self.data_manager.save_tools(remaining_tools):
+                raise OSError("删除天狐导入工具失败，保存工具配置未成功。")
 
         return {
             "removed": len(removed_tools),
@@ -1572,19 +1584,6 @@ class ToolConfigExchangeService:
                 return True
         return False
 
-    def _build_category_maps(self, categories):
-        category_map = {}
-        subcategory_map = {}
-        for category in categories:
-            category_id = category.get("id")
-            if category_id is not None:
-                category_map[category_id] = category
-            for subcategory in category.get("subcategories", []) or []:
-                subcategory_id = subcategory.get("id")
-                if subcategory_id is not None:
-                    subcategory_map[subcategory_id] = subcategory
-        return category_map, subcategory_map
-
     def _next_tool_id(self, tools):
         return max((tool.get("id") or 0) for tool in tools) + 1 if tools else 1
 
@@ -0,0 +1,128 @@
+import os
+import json as std_json
+
+from core.logger import logger
+
+TOOLS_JOURNAL_FILE_NAME = "tools.journal.jsonl"
+
+
+def get_tools_journal_path(tools_file):
+    """返回与聚合 tools.json 同目录的变更日志路径。"""
+    return os.path.join(os.path.dirname(os.path.abspath(tools_file)), TOOLS_JOURNAL_FILE_NAME)
+
+
+def get_tools_journal_state_token(journal_path):
+    """返回变更日志的状态令牌；日志不存在或为空时返回 None。"""
+    try:
+        size = os.path.getsize(journal_path)
+    except OSError:
+        return None
+    if size <= 0:
+        return None
+    return (journal_path, os.path.getmtime(journal_path), size)
+
+
+def read_tools_journal_entries(journal_path):
+    """读取变更日志中的全部记录，跳过无法解析的行（例如异常退出时写了一半的最后一行）。"""
+    if not os.path.isfile(journal_path):
+        return []
+
+    entries = []
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            text = line.strip()
+            if not text:
+                continue
+            try:
+                entry = std_json.loads(text)
+            except ValueError as e:
+                logger.warning("跳过无法解析的工具变更日志行 %s:%s: %s", journal_path, line_number, str(e))
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+    return entries
+
+
+def replay_tools_journal(tools, entries):
+    """把变更日志按顺序应用到工具列表上，原地修改并返回该列表。
+
+    记录均为幂等操作（整条覆盖或字段赋值），重复回放同一段日志不会改变结果。
+    """
+    if not entries:
+        return tools
+
+    positions = {}
+    for index, tool in enumerate(tools):
+        if isinstance(tool, dict) and tool.get('id') is not None:
+            positions[tool.get('id')] = index
+
+    for entry in entries:
+        op = entry.get('op')
+        if op == 'upsert':
+            tool = entry.get('tool')
+            if not isinstance(tool, dict) or tool.get('id') is None:
+                continue
+            index = positions.get(tool['id'])
+            if index is None:
+                positions[tool['id']] = len(tools)
+                tools.append(tool)
+            else:
+                tools[index] = tool
+        elif op == 'patch':
+            index = positions.get(entry.get('id'))
+            fields = entry.get('fields')
+            if index is None or not isinstance(fields, dict):
+                continue
+            tools[index].update(fields)
+    return tools
+
+
+class ToolsJournal:
+    """追加写入的工具变更日志，单条工具修改只写一行，避免整库重写。"""
+
+    def __init__(self, journal_path):
+        self.journal_path = journal_path
+        self._entry_count = None
+
+    @property
+    def entry_count(self):
+        if self._entry_count is None:
+            self._entry_count = len(read_tools_journal_entries(self.journal_path))
+        return self._entry_count
+
+    def state_token(self):
+        return get_tools_journal_state_token(self.journal_path)
+
+    def read_entries(self):
+        entries = read_tools_journal_entries(self.journal_path)
+        self._entry_count = len(entries)
+        return entries
+
+    def append(self, entries):
+        """追加若干条记录，并在返回前落盘。"""
+        entries = [entry for entry in (entries or []) if isinstance(entry, dict)]
+        if not entries:
+            return
+        payload = ''.join(
+            std_json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+            for entry in entries
+        ).encode('utf-8')
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._entry_count is not None:
+            self._entry_count += len(entries)
+
+    def clear(self):
+        """压缩完成后删除日志。"""
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._entry_count = 0
+
+    def reset(self):
+        """丢弃内存中的计数，下次访问时重新读取磁盘。"""
+        self._entry_count = None
@@ -3,6 +3,7 @@ import shlex
 import subprocess
 import sys
 import webbrowser
+from collections.abc import Mapping
 
 from core.runtime_paths import resolve_configured_path_value
 
@@ -148,7 +149,7 @@ class ToolLaunchService:
 
     @staticmethod
     def _normalize_type_label(tool_data: dict = None) -> str:
-        if not isinstance(tool_data, dict):
+        if not isinstance(tool_data, Mapping):
             return ""
         return str(tool_data.get("type_label", "") or "").strip()
 
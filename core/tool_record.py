@@ -0,0 +1,237 @@
+import hashlib
+import json
+from collections.abc import Mapping, MutableMapping, Sequence
+from itertools import chain
+
+_DELETED = object()
+
+
+_RECORD_HASH_SIZE = 16
+
+
+def canonical_tool_record_payload(tool):
+    return json.dumps(tool, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def tool_record_hash(tool):
+    """记录内容的 128 位摘要：对键排序后的规范 JSON 计算 blake2b，与字段顺序无关，跨进程稳定。
+
+    摘要足够长，多条记录的摘要可以按 2**128 取模求和，作为与顺序无关的多重集合指纹。
+    """
+    if not isinstance(tool, dict):
+        tool = dict(tool)
+    payload = canonical_tool_record_payload(tool).encode('utf-8', 'surrogatepass')
+    return int.from_bytes(hashlib.blake2b(payload, digest_size=_RECORD_HASH_SIZE).digest(), 'big')
+
+
+class ToolRecord(MutableMapping):
+    """工具记录的展示视图：只保存展示层附加或修改的字段，其余字段直接读取原始记录。
+
+    界面每次刷新都要给工具附加 ``_path_status``、``_icon_cache_key``、``_search_score`` 等展示字段，
+    过去通过 ``dict(tool)`` 复制整条记录；``ToolRecord`` 把这些字段放在覆盖层里，原始记录共享，
+    不再为每次刷新复制全部字段。写入和删除只作用于覆盖层，不会修改工具库中的原始记录。
+    用另一个 ``ToolRecord`` 构造时会直接共享其原始记录并复制覆盖层，视图不会层层嵌套。
+
+    它不是 ``dict``：orjson / ujson 等直接读取 dict 存储的序列化库遇到它会报错，而不是只写出覆盖层。
+    需要普通 dict（保存、导出、序列化）时用 ``to_dict()`` 或 ``dict(record)`` 显式生成。
+    判断记录类型时用 ``collections.abc.Mapping``。
+    """
+
+    __slots__ = ("_base", "_overlay")
+
+    def __init__(self, base=None, **overlay):
+        if isinstance(base, ToolRecord):
+            self._overlay = dict(base._overlay)
+            base = base._base
+        else:
+            self._overlay = {}
+        self._base = base if base is not None else {}
+        self._overlay.update(overlay)
+
+    @property
+    def base(self):
+        """被共享的原始工具记录。"""
+        return self._base
+
+    def __getitem__(self, key):
+        value = self._overlay.get(key, _DELETED)
+        if value is _DELETED:
+            if key in self._overlay:
+                raise KeyError(key)
+            return self._base[key]
+        return value
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._base:
+            self._overlay[key] = _DELETED
+        else:
+            del self._overlay[key]
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return self._overlay[key] is not _DELETED
+        return key in self._base
+
+    def __iter__(self):
+        overlay = self._overlay
+        for key in self._base:
+            if overlay.get(key) is not _DELETED:
+                yield key
+        for key, value in overlay.items():
+            if value is not _DELETED and key not in self._base:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # pickle / copy.deepcopy 得到普通 dict，与原先 dict(tool) 复制的结果一致
+        return (dict, (self.to_dict(),))
+
+    def get(self, key, default=None):
+        value = self._overlay.get(key, _DELETED)
+        if value is _DELETED:
+            if key in self._overlay:
+                return default
+            return self._base.get(key, default)
+        return value
+
+    def clear(self):
+        self._overlay = dict.fromkeys(self._base, _DELETED)
+
+    def copy(self):
+        return ToolRecord(self)
+
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        merged = ToolRecord(self)
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        merged = dict(other)
+        merged.update(self)
+        return merged
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def to_dict(self):
+        """返回合并后的普通 dict 副本。"""
+        return {key: self[key] for key in self}
+
+
+class ToolDisplayTable:
+    """按工具 id 保存展示视图的旁表：展示字段随视图留在表里，重复渲染同一条记录时直接复用。
+
+    缓存中的记录写时复制，原始记录对象不变就说明内容没变，视图和其中的 ``_path_status``、
+    ``_icon_cache_key`` 等展示字段可以沿用，刷新时不再为每条记录新建视图和覆盖层。
+    记录被替换（对象不同）时重建该 id 的视图。已经是 ``ToolRecord`` 的输入（例如带
+    ``_search_score`` 的搜索结果）或没有 id 的记录不进入旁表，每次包装成新的视图。
+    """
+
+    __slots__ = ("_records",)
+
+    def __init__(self):
+        self._records = {}
+
+    def record(self, tool):
+        if isinstance(tool, ToolRecord):
+            return ToolRecord(tool)
+        tool_id = tool.get("id")
+        if tool_id is None:
+            return ToolRecord(tool)
+        record = self._records.get(tool_id)
+        if record is None or record._base is not tool:
+            record = ToolRecord(tool)
+            self._records[tool_id] = record
+        return record
+
+
+class ToolLibraryView(Sequence):
+    """某一版本工具库的只读快照，由 ``DataManager.get_tools_view()`` 返回。
+
+    内部按 ``CHUNK_SIZE`` 条记录切成若干元组分段。工具库只改动少数记录时，``with_changes()``
+    只重建被改动下标所在的分段和新追加的尾部分段，其余分段直接与上一版本共享，不必整库复制。
+    DataManager 修改工具（包括使用统计）时替换记录对象而不是原地修改（写时复制），已发出的快照内容保持不变。
+    快照中的记录仍是共享的 dict，需要附加展示字段时用 ``ToolRecord`` 包装，不要直接写入。
+    """
+
+    CHUNK_SIZE = 256
+
+    __slots__ = ("_chunks", "_size", "version")
+
+    def __init__(self, tools=(), version=0):
+        tools = tuple(tools)
+        chunk_size = self.CHUNK_SIZE
+        self._chunks = tuple(tools[start:start + chunk_size] for start in range(0, len(tools), chunk_size))
+        self._size = len(tools)
+        self.version = version
+
+    @classmethod
+    def _from_chunks(cls, chunks, size, version):
+        view = cls.__new__(cls)
+        view._chunks = chunks
+        view._size = size
+        view.version = version
+        return view
+
+    def with_changes(self, tools, positions, version):
+        """基于本快照生成 tools 的新版本快照，只重建 positions 所在分段和新增的尾部分段。
+
+        tools 必须是本快照对应的同一个列表，且只发生了 positions 处的替换和末尾追加；
+        列表变短时无法判断哪些下标移动过，退回整体重建。
+        """
+        size = len(tools)
+        if size < self._size:
+            return type(self)(tools, version)
+        chunk_size = self.CHUNK_SIZE
+        dirty = {position // chunk_size for position in positions if 0 <= position < size}
+        if size > self._size:
+            # 原来的尾部分段可能未满，追加的记录会落入它及其后的新分段
+            dirty.update(range(self._size // chunk_size, (size - 1) // chunk_size + 1))
+        chunks = list(self._chunks)
+        for chunk_index in sorted(dirty):
+            chunk = tuple(tools[chunk_index * chunk_size:(chunk_index + 1) * chunk_size])
+            if chunk_index < len(chunks):
+                chunks[chunk_index] = chunk
+            else:
+                chunks.append(chunk)
+        return self._from_chunks(tuple(chunks), size, version)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("ToolLibraryView index out of range")
+        return self._chunks[index // self.CHUNK_SIZE][index % self.CHUNK_SIZE]
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return chain.from_iterable(self._chunks)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(version={self.version}, size={self._size})"
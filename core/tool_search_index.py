@@ -0,0 +1,238 @@
+import re
+from collections import Counter
+from collections.abc import Mapping, Sequence
+
+from core.pinyin_index import PinyinKeyIndex
+
+SEARCH_TOKEN_RE = re.compile(r"[\w\u4e00-\u9fff]+", re.UNICODE)
+FUZZY_DESCRIPTION_TOKEN_LIMIT = 16
+NGRAM_SIZE = 3
+
+
+def build_fuzzy_candidates(name, description):
+    """模糊匹配的候选词：完整名称、名称中的词和描述中的前若干个词，去重后保持顺序。"""
+    candidates = [name]
+    candidates.extend(SEARCH_TOKEN_RE.findall(name))
+    candidates.extend(SEARCH_TOKEN_RE.findall(description)[:FUZZY_DESCRIPTION_TOKEN_LIMIT])
+
+    seen = set()
+    result = []
+    for candidate in candidates:
+        candidate = str(candidate or "").strip()
+        if not candidate or candidate in seen:
+            continue
+        seen.add(candidate)
+        result.append(candidate)
+    return tuple(result)
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class ToolSearchIndex(Sequence):
+    """全局搜索用的倒排索引：名称和描述的字符三元组 -> 条目，模糊候选词 -> 条目。
+
+    包含查询词（不少于三个字符）的条目一定包含查询词的全部三元组，求各三元组倒排表的交集即可
+    得到子串匹配的候选集合，不必逐条扫描工具库；模糊匹配只需对去重后的候选词表打分，
+    再通过候选词倒排表找到对应条目。两者返回的都是候选，最终得分仍由调用方计算。
+
+    索引跨工具库版本保留：``sync()`` 按工具 id 比对新旧记录，DataManager 写时复制，未修改的工具是同一个对象，
+    直接沿用；只改了收藏、使用次数等字段的工具替换条目中的记录；名称或描述变化、新增的工具追加新条目，
+    旧条目标记为失效，失效条目过多时整体重建。
+
+    作为序列按工具库顺序返回有效条目：``{"tool", "name", "description", "fuzzy_candidates", "pinyin"}``，
+    name / description 已转为小写；传入 pinyin（文本 -> PinyinKeys，见 core.pinyin_index）时，
+    名称含汉字的条目在 pinyin 中保存名称的全拼和首字母，否则为 None，并加入拼音前缀索引。
+    """
+
+    COMPACT_DEAD_RATIO = 0.25
+
+    def __init__(self, tools=(), pinyin=None):
+        self.signature = None
+        self._pinyin = pinyin
+        self._clear()
+        self.sync(tools)
+
+    def _clear(self):
+        self._entries = []
+        self._ngram_postings = {}
+        self._token_postings = {}
+        # 候选词表：字符 -> 含有该字符的候选词，用于模糊匹配前按公共字符数排除
+        self._char_tokens = {}
+        self._slot_by_key = {}
+        self._order = []
+        self._dead_count = 0
+        self._pinyin_keys = PinyinKeyIndex()
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entries[slot] for slot in self._order[index]]
+        return self._entries[self._order[index]]
+
+    def __iter__(self):
+        entries = self._entries
+        return (entries[slot] for slot in self._order)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(size={len(self._order)}, ngrams={len(self._ngram_postings)})"
+
+    @staticmethod
+    def _tool_key(tool, seen_keys):
+        tool_id = tool.get("id")
+        if tool_id is None or tool_id in seen_keys:
+            # 没有 id 或 id 重复的记录按对象区分
+            return ("object", id(tool))
+        return tool_id
+
+    def sync(self, tools, signature=None):
+        """让索引与 tools 一致，只为新增或名称、描述变化的工具建立倒排。"""
+        old_slots = self._slot_by_key
+        new_slots = {}
+        order = []
+        added = 0
+        for tool in tools or ():
+            if not isinstance(tool, Mapping):
+                continue
+            key = self._tool_key(tool, new_slots)
+            slot = old_slots.get(key)
+            entry = self._entries[slot] if slot is not None else None
+            if entry is None:
+                slot = self._add(tool)
+                added += 1
+            elif entry["tool"] is not tool:
+                name = (tool.get("name") or "").lower()
+                description = (tool.get("description") or "").lower()
+                if entry["name"] == name and entry["description"] == description:
+                    entry["tool"] = tool
+                else:
+                    self._kill(slot)
+                    slot = self._add(tool, name, description)
+                    added += 1
+            new_slots[key] = slot
+            order.append(slot)
+
+        for key, slot in old_slots.items():
+            if new_slots.get(key) != slot and self._entries[slot] is not None:
+                self._kill(slot)
+        self._slot_by_key = new_slots
+        self._order = order
+        self.signature = signature
+
+        if self._dead_count > len(self._entries) * self.COMPACT_DEAD_RATIO:
+            self._rebuild()
+        else:
+            self._pinyin_keys.sort()
+        return added
+
+    def _rebuild(self):
+        live_tools = [entry["tool"] for entry in self]
+        signature = self.signature
+        self._clear()
+        self.sync(live_tools, signature)
+
+    def _add(self, tool, name=None, description=None):
+        if name is None:
+            name = (tool.get("name") or "").lower()
+        if description is None:
+            description = (tool.get("description") or "").lower()
+        slot = len(self._entries)
+        entry = {
+            "tool": tool,
+            "name": name,
+            "description": description,
+            "fuzzy_candidates": build_fuzzy_candidates(name, description),
+            "pinyin": self._pinyin(name) if self._pinyin is not None else None,
+        }
+        self._entries.append(entry)
+        self._pinyin_keys.add(slot, entry["pinyin"])
+
+        postings = self._ngram_postings
+        for gram in _ngrams(name) | _ngrams(description):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = [slot]
+            else:
+                posting.append(slot)
+        postings = self._token_postings
+        for token in entry["fuzzy_candidates"]:
+            posting = postings.get(token)
+            if posting is None:
+                postings[token] = [slot]
+                for char in set(token):
+                    char_tokens = self._char_tokens.get(char)
+                    if char_tokens is None:
+                        self._char_tokens[char] = [token]
+                    else:
+                        char_tokens.append(token)
+            else:
+                posting.append(slot)
+        return slot
+
+    def _kill(self, slot):
+        # 倒排表中的失效条目留到重建时再清理，查询时跳过
+        self._entries[slot] = None
+        self._dead_count += 1
+
+    def substring_candidates(self, query):
+        """返回可能在名称或描述中包含 query（小写）的条目；不足三个字符的查询返回全部条目。"""
+        if len(query) < NGRAM_SIZE:
+            return list(self)
+        postings = []
+        for gram in _ngrams(query):
+            posting = self._ngram_postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        slots = set(postings[0])
+        for posting in postings[1:]:
+            slots.intersection_update(posting)
+            if not slots:
+                return []
+        entries = self._entries
+        return [entries[slot] for slot in sorted(slots) if entries[slot] is not None]
+
+    def fuzzy_tokens(self, query=None, min_ratio=0.0):
+        """返回可能与 query 相似度达到 min_ratio 的候选词（去重，包括只被失效条目引用的词）。
+
+        相似度按 ratio = 2 * 最长公共子序列长度 / 总长度 计算（见 core.fuzzy_match），公共子序列长度
+        不超过两者共有字符的计数，据此只保留有可能达标的词；不传 query 时返回全部候选词。
+        """
+        if not query:
+            return list(self._token_postings)
+        shared = Counter()
+        for char, count in Counter(query).items():
+            char_tokens = self._char_tokens.get(char)
+            if char_tokens is not None:
+                for _ in range(count):
+                    shared.update(char_tokens)
+        query_len = len(query)
+        half_ratio = min_ratio / 2
+        return [
+            token for token, shared_count in shared.items()
+            if min(shared_count, len(token)) >= half_ratio * (query_len + len(token))
+        ]
+
+    def pinyin_matches(self, query):
+        """返回 [(条目, 匹配档位)]：名称拼音能匹配 query 的有效条目，query 须先经过 normalize_pinyin_query。"""
+        entries = self._entries
+        return [
+            (entries[slot], level)
+            for slot, level in sorted(self._pinyin_keys.match(query).items())
+            if entries[slot] is not None
+        ]
+
+    def entries_for_tokens(self, tokens):
+        """返回候选词中含有任一 tokens 的有效条目。"""
+        slots = set()
+        postings = self._token_postings
+        for token in tokens:
+            posting = postings.get(token)
+            if posting is not None:
+                slots.update(posting)
+        entries = self._entries
+        return [entries[slot] for slot in sorted(slots) if entries[slot] is not None]
@@ -0,0 +1,82 @@
+import marshal
+import os
+
+from core.file_durability import DURABILITY_CACHED, write_bytes_atomic
+from core.logger import logger
+from core.tool_metadata import infer_display_tool_type_label
+
+TOOLS_SNAPSHOT_FILE_NAME = "tools.snapshot.bin"
+TOOLS_SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = ('zifeiyu-tools-snapshot', TOOLS_SNAPSHOT_VERSION, marshal.version)
+
+
+def get_tools_snapshot_path(config_dir):
+    """快照放在运行目录的 cache 下，不进入 data/，也就不会被运行时备份打包。"""
+    return os.path.join(os.path.abspath(config_dir), "cache", TOOLS_SNAPSHOT_FILE_NAME)
+
+
+def build_tools_normalization(tools):
+    """预先计算搜索用的小写名称、描述和卡片类型标签，按工具下标对齐。
+
+    类型标签与工具卡片视图一致，不依赖运行目录（见 infer_display_tool_type_label 的 base_dir）。
+    """
+    normalization = []
+    for tool in tools:
+        if isinstance(tool, dict):
+            normalization.append((
+                str(tool.get('name') or '').lower(),
+                str(tool.get('description') or '').lower(),
+                infer_display_tool_type_label(tool),
+            ))
+        else:
+            normalization.append(('', '', ''))
+    return normalization
+
+
+def load_tools_snapshot(snapshot_path, state_token):
+    """读取与 state_token 匹配的快照，返回 (tools, normalization)；不存在、过期或损坏时返回 None。
+
+    快照使用 marshal 格式：只包含 JSON 能表示的基本类型，读取时不会执行任意代码。
+    """
+    if not state_token or not snapshot_path or not os.path.isfile(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'rb') as f:
+            payload = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.debug("读取工具快照失败，忽略 %s: %s", snapshot_path, str(e))
+        return None
+    if not isinstance(payload, dict) or payload.get('header') != _SNAPSHOT_HEADER:
+        return None
+    if payload.get('token') != tuple(state_token):
+        return None
+    tools = payload.get('tools')
+    normalization = payload.get('normalization')
+    if not isinstance(tools, list) or not isinstance(normalization, list) or len(normalization) != len(tools):
+        return None
+    return tools, [tuple(item) for item in normalization]
+
+
+def write_tools_snapshot(snapshot_path, state_token, tools, normalization=None):
+    """登记快照的延迟写入，由 flush_deferred_writes() 原子替换写出；失败只记录日志，不影响正常加载。"""
+    if not state_token or not snapshot_path:
+        return False
+    if normalization is None:
+        normalization = build_tools_normalization(tools)
+    try:
+        payload = marshal.dumps({
+            'header': _SNAPSHOT_HEADER,
+            'token': tuple(state_token),
+            'tools': list(tools),
+            'normalization': list(normalization),
+        })
+    except ValueError as e:
+        logger.debug("工具数据包含无法写入快照的值，跳过快照: %s", str(e))
+        return False
+
+    # 快照只是启动加速缓存，丢失或损坏时回退到读取 tools.json；令牌不符的旧快照加载时会被丢弃
+    try:
+        return write_bytes_atomic(snapshot_path, payload, DURABILITY_CACHED)
+    except OSError as e:
+        logger.warning("写入工具快照失败 %s: %s", snapshot_path, str(e))
+        return False
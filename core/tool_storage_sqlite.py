@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+import json as std_json
+from datetime import datetime
+
+from core.logger import logger
+
+SQLITE_STORE_FILE_NAME = "tools.sqlite3"
+SQLITE_SCHEMA_VERSION = 1
+
+_SCHEMA_STATEMENTS = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS tools (
+        position INTEGER PRIMARY KEY,
+        tool_id INTEGER,
+        payload TEXT NOT NULL
+    )
+    """,
+    # 单条修改按 id 定位记录
+    "CREATE INDEX IF NOT EXISTS idx_tools_tool_id ON tools(tool_id)",
+    """
+    CREATE TABLE IF NOT EXISTS categories (
+        position INTEGER PRIMARY KEY,
+        category_id INTEGER,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_categories_category_id ON categories(category_id)",
+)
+
+
+def _dump_record(record):
+    return std_json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _integer_or_none(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    return None
+
+
+def _tool_row(position, tool):
+    return position, _integer_or_none(tool.get('id')), _dump_record(tool)
+
+
+class SqliteToolStore:
+    """以单个 SQLite 文件保存工具与分类。
+
+    每条记录以 JSON 原样保存在 payload 列，``position`` 与内存中工具列表的下标一一对应，
+    ``tool_id`` 列带索引，单条修改只覆盖对应的行。DataManager 启动时整库读入内存，
+    按 id、分类、收藏的查询和关键字搜索都在内存中完成，不再访问数据库。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = os.path.abspath(db_path)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            return connection
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError as e:
+            logger.debug("SQLite 无法切换到 WAL 模式: %s", str(e))
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            for statement in _SCHEMA_STATEMENTS:
+                connection.execute(statement)
+            connection.execute(
+                "INSERT OR IGNORE INTO meta(key, value) VALUES ('schema_version', ?)",
+                (str(SQLITE_SCHEMA_VERSION),),
+            )
+        self._local.connection = connection
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
+
+    def close(self):
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def _get_meta(self, key, default=None):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @staticmethod
+    def _bump_generation(connection, key):
+        connection.execute(
+            "INSERT INTO meta(key, value) VALUES (?, '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (key,),
+        )
+
+    def is_migrated(self):
+        return self._get_meta('migrated_at') is not None
+
+    def migrate_from_records(self, tools, categories, source=''):
+        """一次性导入现有 JSON 数据。已经迁移过的数据库不会被覆盖。"""
+        connection = self._connect()
+        with connection:
+            if connection.execute("SELECT 1 FROM meta WHERE key = 'migrated_at'").fetchone():
+                return False
+            self._replace_tools(connection, tools)
+            self._replace_categories(connection, categories)
+            connection.execute(
+                "INSERT INTO meta(key, value) VALUES ('migrated_at', ?), ('migrated_from', ?)",
+                (datetime.now().isoformat(), str(source or '')),
+            )
+        return True
+
+    def tools_state_token(self):
+        return ('sqlite', self.db_path, self._get_meta('tools_generation', '0'))
+
+    def categories_state_token(self):
+        return ('sqlite', self.db_path, self._get_meta('categories_generation', '0'))
+
+    def load_tools(self):
+        rows = self._connect().execute("SELECT payload FROM tools ORDER BY position").fetchall()
+        return [std_json.loads(row[0]) for row in rows]
+
+    def load_categories(self):
+        rows = self._connect().execute("SELECT payload FROM categories ORDER BY position").fetchall()
+        return [std_json.loads(row[0]) for row in rows]
+
+    def _replace_tools(self, connection, tools):
+        connection.execute("DELETE FROM tools")
+        connection.executemany(
+            "INSERT INTO tools(position, tool_id, payload) VALUES (?, ?, ?)",
+            (
+                _tool_row(position, tool)
+                for position, tool in enumerate(tool for tool in (tools or []) if isinstance(tool, dict))
+            ),
+        )
+        self._bump_generation(connection, 'tools_generation')
+
+    def _replace_categories(self, connection, categories):
+        connection.execute("DELETE FROM categories")
+        connection.executemany(
+            "INSERT INTO categories(position, category_id, payload) VALUES (?, ?, ?)",
+            (
+                (position, _integer_or_none(category.get('id')), _dump_record(category))
+                for position, category in enumerate(
+                    category for category in (categories or []) if isinstance(category, dict)
+                )
+            ),
+        )
+        self._bump_generation(connection, 'categories_generation')
+
+    def save_tools(self, tools):
+        connection = self._connect()
+        with connection:
+            self._replace_tools(connection, tools)
+
+    def save_categories(self, categories):
+        connection = self._connect()
+        with connection:
+            self._replace_categories(connection, categories)
+
+    def save_records(self, tools=None, categories=None):
+        """在同一个事务中替换工具和 / 或分类，参数为 None 的表保持不变。"""
+        connection = self._connect()
+        with connection:
+            if categories is not None:
+                self._replace_categories(connection, categories)
+            if tools is not None:
+                self._replace_tools(connection, tools)
+
+    def upsert_tools(self, tools):
+        """按 id 覆盖已有记录，不存在的记录追加到末尾。"""
+        connection = self._connect()
+        with connection:
+            for tool in tools or []:
+                tool_id = _integer_or_none(tool.get('id'))
+                row = None
+                if tool_id is not None:
+                    row = connection.execute(
+                        "SELECT position FROM tools WHERE tool_id = ? ORDER BY position LIMIT 1",
+                        (tool_id,),
+                    ).fetchone()
+                if row is None:
+                    next_row = connection.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM tools").fetchone()
+                    position = next_row[0]
+                else:
+                    position = row[0]
+                connection.execute(
+                    "INSERT OR REPLACE INTO tools(position, tool_id, payload) VALUES (?, ?, ?)",
+                    _tool_row(position, tool),
+                )
+            self._bump_generation(connection, 'tools_generation')
@@ -0,0 +1,121 @@
+import os
+import json as std_json
+
+from core.file_durability import DURABILITY_NORMAL, write_bytes_atomic
+from core.logger import logger
+
+TOOL_USAGE_FILE_NAME = "usage.json"
+USAGE_FIELDS = ('usage_count', 'last_used')
+
+
+def get_tool_usage_path(tools_file):
+    """返回与聚合 tools.json 同目录的使用统计文件路径。"""
+    return os.path.join(os.path.dirname(os.path.abspath(tools_file)), TOOL_USAGE_FILE_NAME)
+
+
+def get_tool_usage_state_token(usage_path):
+    """返回使用统计文件的状态令牌；文件不存在或为空时返回 None。"""
+    try:
+        size = os.path.getsize(usage_path)
+    except OSError:
+        return None
+    if size <= 0:
+        return None
+    return (usage_path, os.path.getmtime(usage_path), size)
+
+
+def read_tool_usage(usage_path):
+    """读取使用统计，返回 {工具 id: {'usage_count': ..., 'last_used': ...}}；文件损坏时返回空字典。"""
+    if not os.path.isfile(usage_path):
+        return {}
+    try:
+        with open(usage_path, 'r', encoding='utf-8') as f:
+            payload = std_json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("读取工具使用统计失败，忽略 %s: %s", usage_path, str(e))
+        return {}
+
+    records = payload.get('usage') if isinstance(payload, dict) else None
+    if not isinstance(records, dict):
+        return {}
+
+    usage = {}
+    for key, record in records.items():
+        if not isinstance(record, dict):
+            continue
+        try:
+            tool_id = int(key)
+        except (TypeError, ValueError):
+            continue
+        usage[tool_id] = {
+            'usage_count': int(record.get('usage_count') or 0),
+            'last_used': record.get('last_used'),
+        }
+    return usage
+
+
+def apply_tool_usage(tools, usage):
+    """把使用统计合并进工具记录（原地修改），返回该列表。"""
+    if not usage:
+        return tools
+    for tool in tools:
+        if not isinstance(tool, dict):
+            continue
+        record = usage.get(tool.get('id'))
+        if record is None:
+            continue
+        tool['usage_count'] = record.get('usage_count', 0)
+        if record.get('last_used'):
+            tool['last_used'] = record['last_used']
+    return tools
+
+
+class ToolUsageStore:
+    """独立保存工具使用次数和最近使用时间，启动工具时不再重写整个工具库。"""
+
+    def __init__(self, usage_path, durability=DURABILITY_NORMAL):
+        self.usage_path = usage_path
+        # 使用统计丢失最近几次也无妨，默认只保证原子替换，不 fsync
+        self.durability = durability
+        self._usage = None
+
+    def state_token(self):
+        return get_tool_usage_state_token(self.usage_path)
+
+    def load(self):
+        if self._usage is None:
+            self._usage = read_tool_usage(self.usage_path)
+        return self._usage
+
+    def reset(self):
+        """丢弃内存中的副本，下次访问时重新读取磁盘。"""
+        self._usage = None
+
+    def update(self, updates):
+        """合并 {工具 id: {'usage_count', 'last_used'}} 并写盘。"""
+        if not updates:
+            return
+        usage = dict(self.load())
+        for tool_id, record in updates.items():
+            merged = dict(usage.get(tool_id) or {})
+            merged.update({field: record.get(field) for field in USAGE_FIELDS if field in record})
+            usage[tool_id] = merged
+        self._write(usage)
+
+    def prune(self, valid_tool_ids):
+        """删除已不存在的工具的统计，避免复用的 id 继承旧数据；没有变化时不写盘。"""
+        usage = self.load()
+        stale_ids = [tool_id for tool_id in usage if tool_id not in valid_tool_ids]
+        if not stale_ids:
+            return False
+        self._write({tool_id: record for tool_id, record in usage.items() if tool_id not in stale_ids})
+        return True
+
+    def _write(self, usage):
+        payload = std_json.dumps(
+            {'usage': {str(tool_id): record for tool_id, record in sorted(usage.items())}},
+            ensure_ascii=False,
+            separators=(',', ':'),
+        ).encode('utf-8')
+        write_bytes_atomic(self.usage_path, payload, self.durability)
+        self._usage = usage
@@ -0,0 +1,123 @@
+import threading
+import time
+
+from core.logger import logger
+
+
+class ToolsWriteBehind:
+    """后台写入线程：GUI 线程只提交工具库快照，序列化、fsync 和替换文件在后台完成。
+
+    在 ``coalesce_window`` 秒内连续提交的多个快照只写最后一个（组提交）。
+    ``write_callback(snapshot, context)`` 返回 False 或抛出异常视为写入失败。
+    """
+
+    def __init__(self, write_callback, coalesce_window=0.25, name="ToolsWriteBehind"):
+        self._write_callback = write_callback
+        self.coalesce_window = max(0.0, float(coalesce_window or 0))
+        self._name = name
+        self._condition = threading.Condition()
+        self._pending = None
+        self._in_flight = False
+        self._flush_requested = False
+        self._stopping = False
+        self._thread = None
+        self.last_error = None
+        self.write_count = 0
+
+    def submit(self, snapshot, context=None):
+        """提交最新快照，覆盖尚未写入的旧快照。"""
+        with self._condition:
+            self._pending = (snapshot, context)
+            self._ensure_thread()
+            self._condition.notify_all()
+
+    def has_pending(self):
+        with self._condition:
+            return self._pending is not None
+
+    def is_busy(self):
+        """是否还有未写入或正在写入的快照。"""
+        with self._condition:
+            return self._pending is not None or self._in_flight
+
+    def wait_idle(self, timeout=None):
+        """等待当前快照按正常节奏写完，不跳过合并窗口；超时返回 False。"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending is not None or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def flush(self, timeout=None):
+        """立即写入尚未落盘的快照并等待完成；最后一次写入失败或超时返回 False。"""
+        with self._condition:
+            if self._pending is not None:
+                self._flush_requested = True
+                self._condition.notify_all()
+        if not self.wait_idle(timeout):
+            return False
+        with self._condition:
+            return self.last_error is None
+
+    def stop(self, timeout=None):
+        """写完剩余快照后结束线程；之后再提交会重新启动线程。"""
+        result = self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._condition:
+            self._stopping = False
+            if self._thread is thread:
+                self._thread = None
+            if self._pending is not None:
+                self._ensure_thread()
+        return result
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def _take_next_snapshot(self):
+        with self._condition:
+            while self._pending is None and not self._stopping:
+                self._condition.wait()
+            if self._pending is None:
+                return None
+            deadline = time.monotonic() + self.coalesce_window
+            while not self._flush_requested and not self._stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            pending, self._pending = self._pending, None
+            self._flush_requested = False
+            self._in_flight = True
+            return pending
+
+    def _run(self):
+        while True:
+            pending = self._take_next_snapshot()
+            if pending is None:
+                return
+            snapshot, context = pending
+            error = None
+            try:
+                if self._write_callback(snapshot, context) is False:
+                    error = "写入回调返回失败"
+            except Exception as e:
+                error = str(e)
+                logger.error("后台写入工具数据失败: %s", error)
+            with self._condition:
+                self._in_flight = False
+                self.last_error = error
+                if error is None:
+                    self.write_count += 1
+                self._condition.notify_all()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""DataManager 大规模工具库基准测试。
+
+按预置模板的分类生成 1k / 10k / 100k 规模的合成工具库（含拆分镜像、笔记和图标），
+对 DataManager 的常用操作计时，结果以 JSON 输出，便于在不同提交之间比较：
+
+    python scripts/benchmark_data_manager.py --sizes 1000 10000 --output bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.data_manager import STORAGE_BACKEND_JSON, STORAGE_BACKENDS, DataManager
+from core.logger import logger
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 3
+NOTE_RATIO = 0.1
+FAVORITE_RATIO = 0.05
+DELETE_RATIO = 0.01
+GENERATED_ICON_COUNT = 16
+# 最小的合法 PNG（1x1 透明像素），用于生成图标文件
+PNG_ICON_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+NAME_WORDS = (
+    "Scan", "Recon", "Proxy", "Fuzz", "Dump", "Crack", "Hunter", "Map", "Shell", "Sniff",
+    "Audit", "Brute", "Trace", "Probe", "Spider", "Relay", "Hook", "Vault", "Forge", "Pivot",
+)
+DESCRIPTION_PHRASES = (
+    "子域名与资产发现", "目录爆破与探测", "漏洞验证与利用", "内网横向移动", "流量抓包分析",
+    "密码哈希破解", "免杀与载荷生成", "逆向调试", "社工情报收集", "指纹识别",
+    "web fingerprinting", "credential dumping", "port scanning", "payload encoding",
+)
+
+
+def load_template_categories():
+    """读取仓库预置的分类模板，生成的工具按真实分类和子分类分布。"""
+    with (PROJECT_ROOT / "data" / "categories.json").open("r", encoding="utf-8") as file:
+        payload = json.load(file)
+    categories = payload.get("categories") if isinstance(payload, dict) else payload
+    return [category for category in categories or [] if isinstance(category, dict) and category.get("id") is not None]
+
+
+def load_template_icon_names():
+    """预置工具库里实际使用的图标名，能在仓库 resources/icons 中解析到。"""
+    with (PROJECT_ROOT / "data" / "tools.json").open("r", encoding="utf-8") as file:
+        payload = json.load(file)
+    tools = payload.get("tools") if isinstance(payload, dict) else payload
+    return sorted({str(tool.get("icon")) for tool in tools or [] if isinstance(tool, dict) and tool.get("icon")})
+
+
+def generate_tools(categories, count, icon_values=(), seed=0):
+    """生成 count 条确定性的工具记录；同一 seed 每次得到相同的工具库。"""
+    rng = random.Random(seed)
+    icon_values = list(icon_values) or [""]
+    tools = []
+    for tool_id in range(1, count + 1):
+        category = rng.choice(categories)
+        subcategories = category.get("subcategories") or [{}]
+        subcategory = rng.choice(subcategories)
+        name = f"{rng.choice(NAME_WORDS)}{rng.choice(NAME_WORDS)} {tool_id}"
+        is_web_tool = rng.random() < 0.2
+        tools.append({
+            "arguments": "",
+            "background_image": "",
+            "category_id": category["id"],
+            "description": f"{category.get('name', '')} / {rng.choice(DESCRIPTION_PHRASES)} - {name}",
+            "icon": rng.choice(icon_values),
+            "id": tool_id,
+            "is_favorite": rng.random() < FAVORITE_RATIO,
+            "is_web_tool": is_web_tool,
+            "last_used": None,
+            "name": name,
+            "path": f"https://tools.example.com/{tool_id}" if is_web_tool else f"tools/bench/{tool_id}/tool.exe",
+            "run_in_terminal": rng.random() < 0.3,
+            "subcategory_id": subcategory.get("id"),
+            "type_label": "",
+            "usage_count": 0,
+            "working_directory": "" if is_web_tool else f"tools/bench/{tool_id}",
+        })
+    return tools
+
+
+def _write_generated_icons(config_dir):
+    icon_dir = Path(config_dir) / "resources" / "icons" / "bench"
+    icon_dir.mkdir(parents=True, exist_ok=True)
+    icon_paths = []
+    for index in range(GENERATED_ICON_COUNT):
+        icon_path = icon_dir / f"bench_{index:02d}.png"
+        icon_path.write_bytes(PNG_ICON_BYTES)
+        icon_paths.append(str(icon_path))
+    return icon_paths
+
+
+def _write_notes(config_dir, tools, seed=0):
+    notes_dir = Path(config_dir) / "resources" / "notes"
+    notes_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    written = 0
+    for tool in tools:
+        if rng.random() >= NOTE_RATIO:
+            continue
+        (notes_dir / f"tool_{tool['id']}.md").write_text(
+            f"# {tool['name']}\n\n{tool['description']}\n\n- 常用参数: `-h`\n- 备注: {rng.choice(DESCRIPTION_PHRASES)}\n",
+            encoding="utf-8",
+        )
+        written += 1
+    return written
+
+
+def generate_library(config_dir, count, seed=0, storage_backend=STORAGE_BACKEND_JSON):
+    """在 config_dir 下生成完整的运行目录：分类、聚合 tools.json、拆分镜像、笔记和图标。"""
+    categories = load_template_categories()
+    # 图标混合仓库自带图标、生成的本地图标文件和少量无法解析的图标名，让数据体检有事可做
+    icon_values = load_template_icon_names() + _write_generated_icons(config_dir) + ["missing_bench_icon.png"]
+    tools = generate_tools(categories, count, icon_values, seed=seed)
+
+    data_manager = DataManager(config_dir=str(config_dir), storage_backend=storage_backend, write_behind=False)
+    if not data_manager.save_categories(categories) or not data_manager.save_tools(tools):
+        raise OSError(f"生成基准工具库失败: {config_dir}")
+    data_manager.shutdown()
+    return {
+        "tools": len(tools),
+        "categories": len(categories),
+        "split_files": len(list(Path(data_manager.tools_split_dir).glob("*.json"))),
+        "notes": _write_notes(config_dir, tools, seed=seed),
+    }
+
+
+def _summarize(durations):
+    runs = [round(value * 1000, 3) for value in durations]
+    return {
+        "runs_ms": runs,
+        "min_ms": min(runs),
+        "median_ms": round(statistics.median(runs), 3),
+        "max_ms": max(runs),
+    }
+
+
+def _time_runs(repeat, operation, setup=None):
+    """执行 repeat 次，setup(run) 的返回值传给 operation，只统计 operation 的耗时。"""
+    durations = []
+    for run in range(repeat):
+        argument = setup(run) if setup is not None else None
+        started = time.perf_counter()
+        operation(argument)
+        durations.append(time.perf_counter() - started)
+    return _summarize(durations)
+
+
+def benchmark_library(config_dir, repeat=DEFAULT_REPEAT, seed=0, storage_backend=STORAGE_BACKEND_JSON):
+    """对已生成的工具库逐项计时，返回 {操作名: 耗时统计}。
+
+    每次计时都作用于不同的工具；delete_tools 会删除工具，因此放在最后。
+    """
+    rng = random.Random(seed)
+
+    def open_manager():
+        return DataManager(config_dir=str(config_dir), storage_backend=storage_backend, write_behind=False)
+
+    timings = {}
+    managers = []
+
+    def cold_manager(_run):
+        manager = open_manager()
+        managers.append(manager)
+        return manager
+
+    timings["load_tools"] = _time_runs(repeat, lambda manager: manager.load_tools(), cold_manager)
+    data_manager = open_manager()
+    tools = list(data_manager.load_tools())
+    timings["load_tools_cached"] = _time_runs(repeat, lambda _: data_manager.load_tools())
+
+    category_ids = [category["id"] for category in data_manager.load_categories()]
+    tool_ids = [tool["id"] for tool in tools]
+    sample_ids = rng.sample(tool_ids, min(len(tool_ids), repeat * 3))
+    sample_names = [tool["name"].split()[0].lower() for tool in rng.sample(tools, min(len(tools), repeat))]
+
+    def updated_tool(run):
+        tool = dict(data_manager.get_tool_by_id(sample_ids[run % len(sample_ids)]))
+        tool["description"] = f"{tool.get('description', '')} (bench {run})"
+        return tool
+
+    timings["update_tool"] = _time_runs(repeat, lambda tool: data_manager.update_tool(tool["id"], tool), updated_tool)
+    timings["toggle_favorite"] = _time_runs(
+        repeat,
+        data_manager.toggle_favorite,
+        lambda run: sample_ids[(run + repeat) % len(sample_ids)],
+    )
+    timings["get_tools_by_category"] = _time_runs(
+        repeat,
+        lambda _: [data_manager.get_tools_by_category(category_id) for category_id in category_ids],
+    )
+    timings["search_tools"] = _time_runs(
+        repeat,
+        data_manager.search_tools,
+        lambda run: sample_names[run % len(sample_names)] if run % 2 == 0 else "no-such-tool-keyword",
+    )
+    timings["save_tools"] = _time_runs(repeat, lambda _: data_manager.save_tools(list(data_manager.load_tools())))
+    timings["audit_tools_data"] = _time_runs(repeat, lambda manager: manager.audit_tools_data(), cold_manager)
+    timings["audit_tools_data_cached"] = _time_runs(repeat, lambda _: data_manager.audit_tools_data())
+
+    delete_count = max(1, int(len(tool_ids) * DELETE_RATIO))
+    delete_pool = [tool_id for tool_id in tool_ids if tool_id not in sample_ids]
+    rng.shuffle(delete_pool)
+    timings["delete_tools"] = _time_runs(
+        repeat,
+        data_manager.delete_tools,
+        lambda run: delete_pool[run * delete_count:(run + 1) * delete_count],
+    )
+    timings["delete_tools"]["tools_per_run"] = delete_count
+
+    for manager in (*managers, data_manager):
+        manager.close_storage()
+    return timings
+
+
+def _current_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=DEFAULT_REPEAT, seed=0, storage_backend=STORAGE_BACKEND_JSON,
+                   work_dir=None, keep=False):
+    """生成各规模的工具库并计时，返回可直接写成 JSON 的结果。"""
+    root = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix="zifeiyu_bench_"))
+    root.mkdir(parents=True, exist_ok=True)
+    results = []
+    try:
+        for size in sizes:
+            config_dir = root / f"library_{size}"
+            shutil.rmtree(config_dir, ignore_errors=True)
+            config_dir.mkdir(parents=True)
+            started = time.perf_counter()
+            library = generate_library(config_dir, size, seed=seed, storage_backend=storage_backend)
+            library["generate_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            library["timings"] = benchmark_library(config_dir, repeat=repeat, seed=seed, storage_backend=storage_backend)
+            results.append(library)
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "benchmark": "data_manager",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_backend": storage_backend,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+
+@contextmanager
+def _console_logging_on_stderr():
+    """结果 JSON 可能输出到标准输出：计时期间控制台日志改写到标准错误，且只保留警告以上级别。"""
+    level = logger.level
+    handlers = [handler for handler in logger.handlers if type(handler) is logging.StreamHandler]
+    streams = [handler.setStream(sys.stderr) for handler in handlers]
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+        for handler, stream in zip(handlers, streams):
+            if stream is not None:
+                handler.setStream(stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DataManager 大规模工具库基准测试，结果输出为 JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="工具库规模（工具数）")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="每项操作的计时次数")
+    parser.add_argument("--seed", type=int, default=0, help="生成工具库使用的随机种子")
+    parser.add_argument("--storage-backend", choices=STORAGE_BACKENDS, default=STORAGE_BACKEND_JSON)
+    parser.add_argument("--work-dir", default="", help="生成工具库的目录（默认使用临时目录）")
+    parser.add_argument("--keep", action="store_true", help="保留生成的工具库")
+    parser.add_argument("--output", "-o", default="", help="结果 JSON 文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1 or any(size < 1 for size in args.sizes):
+        parser.error("--repeat 和 --sizes 必须为正整数")
+
+    with _console_logging_on_stderr():
+        report = run_benchmarks(
+            sizes=args.sizes,
+            repeat=args.repeat,
+            seed=args.seed,
+            storage_backend=args.storage_backend,
+            work_dir=args.work_dir or None,
+            keep=args.keep,
+        )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
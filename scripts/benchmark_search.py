@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""全局搜索模糊匹配基准测试。
+
+用 benchmark_data_manager 的合成工具库建立搜索索引，对一组拼错的查询词分别用 difflib
+（原实现：real_quick_ratio / quick_ratio 预筛后计算 ratio）和 core.fuzzy_match 的位并行 LCS
+计算候选词表的相似度，输出两者耗时，以及命中分档不同的候选词数：
+
+    python scripts/benchmark_search.py --sizes 10000 100000 --output search_bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_data_manager import (
+    DEFAULT_REPEAT,
+    _current_commit,
+    _time_runs,
+    generate_tools,
+    load_template_categories,
+)
+from core.fuzzy_match import FuzzyMatcher
+from core.tool_search_index import ToolSearchIndex
+from ui.main_window_search_mixin import MainWindowSearchMixin
+
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+# 合成工具名由 NAME_WORDS 拼接而成，查询词是其中单词或组合的常见拼写错误
+DEFAULT_QUERIES = (
+    "recno", "shlel", "fzuz", "sinff", "piovt", "bruet", "sipder",
+    "reconshel", "huntermap", "fuzzbrtue", "credntial", "fingerprnt", "目录爆探测",
+)
+FUZZY_MIN_RATIO = 0.60
+
+
+def _candidate_tokens(index, query):
+    """与搜索时相同的候选词：共有字符数可能达标、长度在范围内且不含查询词。"""
+    query_len = len(query)
+    return [
+        token for token in index.fuzzy_tokens(query, FUZZY_MIN_RATIO)
+        if query not in token and MainWindowSearchMixin._fuzzy_candidate_in_range(len(token), query_len)
+    ]
+
+
+def score_with_difflib(tokens, query):
+    matcher = difflib.SequenceMatcher(None, query)
+    ratios = {}
+    for token in tokens:
+        matcher.set_seq2(token)
+        if matcher.real_quick_ratio() < FUZZY_MIN_RATIO or matcher.quick_ratio() < FUZZY_MIN_RATIO:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= FUZZY_MIN_RATIO:
+            ratios[token] = ratio
+    return ratios
+
+
+def score_with_fuzzy_matcher(tokens, query):
+    matcher = FuzzyMatcher(query)
+    ratios = {}
+    for token in tokens:
+        ratio = matcher.ratio(token, FUZZY_MIN_RATIO)
+        if ratio:
+            ratios[token] = ratio
+    return ratios
+
+
+def _tier_changes(baseline, ratios):
+    tier = MainWindowSearchMixin._fuzzy_score_tier
+    return sum(
+        1 for token in set(baseline) | set(ratios)
+        if tier(baseline.get(token, 0.0)) != tier(ratios.get(token, 0.0))
+    )
+
+
+def benchmark_size(size, queries=DEFAULT_QUERIES, repeat=DEFAULT_REPEAT, seed=0):
+    """在 size 个工具的索引上计时，返回 {查询词: 结果}，以及全部查询的合计耗时。"""
+    tools = generate_tools(load_template_categories(), size, seed=seed)
+    index = ToolSearchIndex(tools)
+    per_query = {}
+    totals = {"difflib_ms": 0.0, "fuzzy_match_ms": 0.0}
+    for query in queries:
+        tokens = _candidate_tokens(index, query)
+        baseline = score_with_difflib(tokens, query)
+        ratios = score_with_fuzzy_matcher(tokens, query)
+        difflib_timing = _time_runs(repeat, lambda _: score_with_difflib(tokens, query))
+        fuzzy_timing = _time_runs(repeat, lambda _: score_with_fuzzy_matcher(tokens, query))
+        totals["difflib_ms"] += difflib_timing["median_ms"]
+        totals["fuzzy_match_ms"] += fuzzy_timing["median_ms"]
+        per_query[query] = {
+            "candidate_tokens": len(tokens),
+            "matched_difflib": len(baseline),
+            "matched_fuzzy_match": len(ratios),
+            "tier_changes": _tier_changes(baseline, ratios),
+            "difflib": difflib_timing,
+            "fuzzy_match": fuzzy_timing,
+        }
+
+    totals = {name: round(value, 3) for name, value in totals.items()}
+    if totals["fuzzy_match_ms"]:
+        totals["speedup"] = round(totals["difflib_ms"] / totals["fuzzy_match_ms"], 2)
+    return {
+        "tools": size,
+        "vocabulary": len(index.fuzzy_tokens()),
+        "total_median_ms": totals,
+        "queries": per_query,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, queries=DEFAULT_QUERIES, repeat=DEFAULT_REPEAT, seed=0):
+    return {
+        "benchmark": "search_fuzzy_match",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "results": [benchmark_size(size, queries, repeat=repeat, seed=seed) for size in sizes],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="全局搜索模糊匹配基准测试，结果输出为 JSON")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="工具库规模（工具数）")
+    parser.add_argument("--queries", nargs="+", default=list(DEFAULT_QUERIES), help="查询词（小写）")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="每个查询词的计时次数")
+    parser.add_argument("--seed", type=int, default=0, help="生成工具库使用的随机种子")
+    parser.add_argument("--output", "-o", default="", help="结果 JSON 文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1 or any(size < 1 for size in args.sizes):
+        parser.error("--repeat 和 --sizes 必须为正整数")
+
+    report = run_benchmarks(
+        sizes=args.sizes,
+        queries=[query.lower() for query in args.queries],
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+
+from _support import cleanup_test_dir, make_test_dir
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "scripts" / "benchmark_data_manager.py"
+SPEC = importlib.util.spec_from_file_location("benchmark_data_manager", SCRIPT_PATH)
+benchmark_data_manager = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(benchmark_data_manager)
+
+
+class BenchmarkDataManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_root = make_test_dir(f"benchmark_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.temp_root))
+
+    def test_generated_tools_are_deterministic_and_use_template_categories(self):
+        categories = benchmark_data_manager.load_template_categories()
+        first = benchmark_data_manager.generate_tools(categories, 50, ["a.png"], seed=7)
+        second = benchmark_data_manager.generate_tools(categories, 50, ["a.png"], seed=7)
+
+        self.assertEqual(first, second)
+        self.assertEqual(list(range(1, 51)), [tool["id"] for tool in first])
+        category_ids = {category["id"] for category in categories}
+        self.assertTrue(all(tool["category_id"] in category_ids for tool in first))
+
+    def test_main_writes_json_report_with_timings_for_each_size(self):
+        output = self.temp_root / "bench.json"
+
+        exit_code = benchmark_data_manager.main([
+            "--sizes", "40", "--repeat", "2",
+            "--work-dir", str(self.temp_root / "work"),
+            "--output", str(output),
+        ])
+
+        self.assertEqual(0, exit_code)
+        report = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual([40], [result["tools"] for result in report["results"]])
+        result = report["results"][0]
+        self.assertGreater(result["split_files"], 0)
+        self.assertGreater(result["notes"], 0)
+        for operation in (
+            "load_tools", "save_tools", "update_tool", "toggle_favorite", "get_tools_by_category",
+            "search_tools", "audit_tools_data", "delete_tools",
+        ):
+            self.assertEqual(2, len(result["timings"][operation]["runs_ms"]), operation)
+        self.assertFalse((self.temp_root / "work").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import importlib.util
+import json
+import unittest
+from pathlib import Path
+
+from _support import cleanup_test_dir, make_test_dir
+
+
+SCRIPT_PATH = Path(__file__).resolve().parents[1] / "scripts" / "benchmark_search.py"
+SPEC = importlib.util.spec_from_file_location("benchmark_search", SCRIPT_PATH)
+benchmark_search = importlib.util.module_from_spec(SPEC)
+SPEC.loader.exec_module(benchmark_search)
+
+
+class BenchmarkSearchTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_root = make_test_dir(f"benchmark_search_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.temp_root))
+
+    def test_main_writes_json_report_comparing_both_engines(self):
+        output = self.temp_root / "search_bench.json"
+
+        exit_code = benchmark_search.main([
+            "--sizes", "60", "--repeat", "2", "--queries", "recno", "Fzuz",
+            "--output", str(output),
+        ])
+
+        self.assertEqual(0, exit_code)
+        report = json.loads(output.read_text(encoding="utf-8"))
+        result = report["results"][0]
+        self.assertEqual(60, result["tools"])
+        self.assertEqual(["recno", "fzuz"], list(result["queries"]))
+        for timing in result["queries"].values():
+            self.assertGreater(timing["candidate_tokens"], 0)
+            self.assertEqual(2, len(timing["difflib"]["runs_ms"]))
+            self.assertEqual(2, len(timing["fuzzy_match"]["runs_ms"]))
+        self.assertIn("speedup", result["total_median_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
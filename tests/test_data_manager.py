@@ -1,12 +1,15 @@
 import json
 import os
 import shutil
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import patch
 
 from _support import cleanup_test_dir, make_test_dir
+from core import data_manager as data_manager_module
 from core.data_manager import DataManager
+from core.tool_record import ToolLibraryView
 
 
 class DataManagerTests(unittest.TestCase):
@@ -93,10 +96,15 @@ class DataManagerTests(unittest.TestCase):
         self.assertEqual(0, on_disk_tools[0]["usage_count"])
         self.assertIsNone(on_disk_tools[0]["last_used"])
 
+        tools_payload = Path(self.data_manager.tools_file).read_bytes()
         self.assertTrue(self.data_manager.flush_pending_usage_updates())
-        flushed_tools = json.loads(Path(self.data_manager.tools_file).read_text(encoding="utf-8"))["tools"]
-        self.assertEqual(1, flushed_tools[0]["usage_count"])
-        self.assertTrue(flushed_tools[0]["last_used"])
+        self.assertEqual(tools_payload, Path(self.data_manager.tools_file).read_bytes())
+        usage_payload = json.loads(Path(self.data_manager.usage_store.usage_path).read_text(encoding="utf-8"))
+        self.assertEqual(1, usage_payload["usage"]["1"]["usage_count"])
+
+        reloaded_tool = DataManager(config_dir=str(self.config_dir)).get_tool_by_id(1)
+        self.assertEqual(1, reloaded_tool["usage_count"])
+        self.assertEqual(cached_tool["last_used"], reloaded_tool["last_used"])
 
     def test_delete_tools_removes_selected_records_and_pending_usage_updates(self):
         tools = [
@@ -147,6 +155,60 @@ class DataManagerTests(unittest.TestCase):
         self.assertTrue(self.data_manager.flush_pending_usage_updates())
         self.assertEqual([1, 3], [tool["id"] for tool in self.data_manager.load_tools()])
 
+    def test_bulk_updates_apply_patches_in_one_journal_append(self):
+        self.assertTrue(self.data_manager.save_categories([
+            {"id": 1, "name": "Ops", "priority": 1, "subcategories": []},
+            {"id": 2, "name": "Web", "priority": 2, "subcategories": [{"id": 201, "name": "Scan"}]},
+        ]))
+        self.assertTrue(self.data_manager.save_tools([
+            {"id": tool_id, "name": f"Tool {tool_id}", "path": f"tool{tool_id}.exe", "category_id": 1,
+             "subcategory_id": None, "is_favorite": False, "usage_count": 0, "last_used": None}
+            for tool_id in (1, 2, 3)
+        ]))
+        view = self.data_manager.get_tools_view()
+
+        with patch.object(self.data_manager.tools_journal, "append", wraps=self.data_manager.tools_journal.append) as append:
+            favorites = self.data_manager.set_favorites([1, 3, 99])
+            moved = self.data_manager.move_tools_to_category([2, 3], 2, 201)
+        rejected = self.data_manager.move_tools_to_category([1], 1, 201)
+        unchanged = self.data_manager.update_tools({1: {"is_favorite": True, "id": 7}})
+
+        self.assertEqual({"success": True, "requested": 3, "updated": 2, "missing": 1}, favorites)
+        self.assertEqual({"success": True, "requested": 2, "updated": 2, "missing": 0}, moved)
+        self.assertFalse(rejected["success"])
+        self.assertEqual(0, unchanged["updated"])
+        self.assertEqual(2, append.call_count)
+        self.assertEqual([False] * 3, [tool["is_favorite"] for tool in view])
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        self.assertEqual(
+            [(1, True, 1, None), (2, False, 2, 201), (3, True, 2, 201)],
+            [
+                (tool["id"], tool["is_favorite"], tool["category_id"], tool["subcategory_id"])
+                for tool in reloaded.load_tools()
+            ],
+        )
+        self.assertEqual([2, 3], [tool["id"] for tool in reloaded.get_tools_by_category(2, 201)])
+
+    def test_saving_library_drops_usage_stats_of_deleted_tools(self):
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": None, "subcategory_id": None, "usage_count": 0, "last_used": None},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": None, "subcategory_id": None, "usage_count": 0, "last_used": None},
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        self.assertTrue(self.data_manager.update_tool_usage(1))
+        self.assertTrue(self.data_manager.update_tool_usage(2))
+        self.assertTrue(self.data_manager.flush_pending_usage_updates())
+
+        self.assertTrue(self.data_manager.delete_tool(2))
+        self.assertTrue(self.data_manager.add_tool({"name": "Reused", "path": "reused.exe"}))
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        self.assertEqual(1, reloaded.get_tool_by_id(1)["usage_count"])
+        self.assertEqual(("Reused", 0), (reloaded.get_tool_by_id(2)["name"], reloaded.get_tool_by_id(2)["usage_count"]))
+        usage_payload = json.loads(Path(reloaded.usage_store.usage_path).read_text(encoding="utf-8"))
+        self.assertEqual(["1"], list(usage_payload["usage"]))
+
     def test_delete_all_tools_clears_tool_records_and_split_files(self):
         categories = [
             {
@@ -387,6 +449,23 @@ class DataManagerTests(unittest.TestCase):
 
         self.assertEqual(["Aggregate Tool"], [tool["name"] for tool in loaded_tools])
 
+    def test_large_tool_files_are_parsed_as_a_stream(self):
+        tools = [
+            {"id": tool_id, "name": f"Tool {tool_id}", "path": f"tool{tool_id}.exe", "category_id": None,
+             "subcategory_id": None, "is_favorite": False, "usage_count": 0, "last_used": None}
+            for tool_id in (1, 2)
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+
+        with patch.object(data_manager_module, "STREAMING_JSON_MIN_BYTES", 0), patch.object(
+            data_manager_module, "iter_json_records", wraps=data_manager_module.iter_json_records
+        ) as stream_reader:
+            reloaded = DataManager(config_dir=str(self.config_dir))
+            loaded = reloaded.load_tools()
+
+        stream_reader.assert_called()
+        self.assertEqual(tools, loaded)
+
     def test_audit_tools_data_reports_duplicate_names_and_split_mismatch(self):
         categories = [
             {
@@ -481,6 +560,9 @@ class DataManagerTests(unittest.TestCase):
 
         before = self.data_manager.audit_tools_split_consistency()
         self.assertFalse(before["consistent"])
+        self.assertEqual(0, before["missing_in_split"])
+        self.assertEqual([{"id": 99, "name": "Stale Tool"}], before["extra_records"])
+        self.assertIn("Stale Tool", before["message"])
 
         result = self.data_manager.rebuild_tools_split_mirror(backup=True)
 
@@ -541,6 +623,500 @@ class DataManagerTests(unittest.TestCase):
 
         self.assertEqual([3, 1, 2], [tool["id"] for tool in reordered])
 
+    def test_single_tool_mutations_append_journal_instead_of_rewriting_library(self):
+        categories = [{"id": 1, "name": "分类一", "priority": 1, "subcategories": []}]
+        tools = [
+            {
+                "id": 1,
+                "name": "Journal Tool",
+                "path": "tools/journal.exe",
+                "description": "demo",
+                "category_id": 1,
+                "subcategory_id": None,
+                "is_favorite": False,
+                "usage_count": 0,
+                "last_used": None,
+            }
+        ]
+        self.assertTrue(self.data_manager.save_categories(categories))
+        self.assertTrue(self.data_manager.save_tools(tools))
+        tools_file = Path(self.data_manager.tools_file)
+        journal_file = Path(self.data_manager.tools_journal.journal_path)
+        original_payload = tools_file.read_bytes()
+
+        self.assertTrue(self.data_manager.toggle_favorite(1))
+        self.assertTrue(self.data_manager.update_tool_background(1, "bg.png"))
+        self.assertTrue(self.data_manager.add_tool({"name": "Added", "path": "tools/added.exe", "category_id": 1}))
+
+        self.assertEqual(original_payload, tools_file.read_bytes())
+        self.assertEqual(3, len(journal_file.read_text(encoding="utf-8").splitlines()))
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        reloaded_tools = reloaded.load_tools()
+        self.assertEqual([1, 2], [tool["id"] for tool in reloaded_tools])
+        self.assertTrue(reloaded_tools[0]["is_favorite"])
+        self.assertEqual("bg.png", reloaded_tools[0]["background_image"])
+        self.assertTrue(reloaded.audit_tools_split_consistency()["consistent"])
+
+        self.assertTrue(reloaded.compact_tools_journal())
+
+        self.assertFalse(journal_file.exists())
+        on_disk_tools = json.loads(tools_file.read_text(encoding="utf-8"))["tools"]
+        self.assertEqual(["Journal Tool", "Added"], [tool["name"] for tool in on_disk_tools])
+        self.assertTrue(on_disk_tools[0]["is_favorite"])
+        self.assertTrue(reloaded.audit_tools_split_consistency()["consistent"])
+
+    def test_load_tools_skips_torn_trailing_journal_line(self):
+        tool = {
+            "id": 1,
+            "name": "Torn Tool",
+            "path": "tools/torn.exe",
+            "category_id": None,
+            "subcategory_id": None,
+            "is_favorite": False,
+        }
+        self.assertTrue(self.data_manager.save_tools([tool]))
+        self.assertTrue(self.data_manager.toggle_favorite(1))
+        journal_file = Path(self.data_manager.tools_journal.journal_path)
+        with journal_file.open("a", encoding="utf-8") as f:
+            f.write('{"op": "patch", "id": 1, "fie')
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+
+        self.assertTrue(reloaded.get_tool_by_id(1)["is_favorite"])
+
+    def test_shutdown_compacts_pending_journal(self):
+        tool = {
+            "id": 1,
+            "name": "Shutdown Tool",
+            "path": "tools/shutdown.exe",
+            "category_id": None,
+            "subcategory_id": None,
+            "is_favorite": False,
+        }
+        self.assertTrue(self.data_manager.save_tools([tool]))
+        self.assertTrue(self.data_manager.toggle_favorite(1))
+
+        self.data_manager.shutdown()
+
+        self.assertFalse(Path(self.data_manager.tools_journal.journal_path).exists())
+        on_disk_tools = json.loads(Path(self.data_manager.tools_file).read_text(encoding="utf-8"))["tools"]
+        self.assertTrue(on_disk_tools[0]["is_favorite"])
+
+    def test_compaction_rewrites_only_split_files_of_touched_categories(self):
+        categories = [
+            {"id": 1, "name": "分类一", "priority": 1, "subcategories": []},
+            {"id": 2, "name": "分类二", "priority": 2, "subcategories": []},
+        ]
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": None, "is_favorite": False},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 2, "subcategory_id": None, "is_favorite": False},
+            {"id": 3, "name": "Loose", "path": "loose.exe", "category_id": None, "subcategory_id": None, "is_favorite": False},
+        ]
+        self.assertTrue(self.data_manager.save_categories(categories))
+        self.assertTrue(self.data_manager.save_tools(tools))
+        split_dir = Path(self.data_manager.tools_split_dir)
+        self.assertEqual(3, len(list(split_dir.glob("*.json"))))
+
+        self.assertTrue(self.data_manager.toggle_favorite(2))
+        with patch("core.data_manager._write_json_payload", wraps=data_manager_module._write_json_payload) as write_payload:
+            self.assertTrue(self.data_manager.compact_tools_journal())
+
+        written = sorted(Path(call.args[0]).name for call in write_payload.call_args_list)
+        self.assertEqual(2, len(written))
+        self.assertEqual("tools.json", written[-1])
+        self.assertTrue(written[0].startswith("02_"))
+        self.assertTrue(self.data_manager.audit_tools_split_consistency()["consistent"])
+
+        with patch("core.data_manager._write_json_payload", wraps=data_manager_module._write_json_payload) as write_payload:
+            self.assertTrue(self.data_manager.save_tools(self.data_manager.load_tools()))
+        self.assertEqual(["tools.json"], [Path(call.args[0]).name for call in write_payload.call_args_list])
+
+    def test_aggregate_and_categories_are_written_strictly_and_split_mirror_without_fsync(self):
+        self.assertTrue(self.data_manager.save_categories([{"id": 1, "name": "分类一", "priority": 1, "subcategories": []}]))
+        tools = [{"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": None}]
+
+        with patch("core.data_manager._write_json_payload", wraps=data_manager_module._write_json_payload) as write_payload:
+            self.assertTrue(self.data_manager.save_tools(tools))
+            self.assertTrue(self.data_manager.save_categories(self.data_manager.load_categories()))
+
+        levels = {Path(call.args[0]).name: call.args[2] for call in write_payload.call_args_list}
+        self.assertEqual("strict", levels.pop("tools.json"))
+        self.assertEqual("strict", levels.pop("categories.json"))
+        self.assertEqual({"normal"}, set(levels.values()))
+
+    def test_transaction_coalesces_mutations_into_single_save(self):
+        categories = [{"id": 1, "name": "分类一", "priority": 1, "subcategories": []}]
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": None, "is_favorite": False},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 1, "subcategory_id": None, "is_favorite": False},
+        ]
+        self.assertTrue(self.data_manager.save_categories(categories))
+        self.assertTrue(self.data_manager.save_tools(tools))
+        tools_file = Path(self.data_manager.tools_file)
+        journal_file = Path(self.data_manager.tools_journal.journal_path)
+
+        with patch.object(self.data_manager, "_persist_tools", wraps=self.data_manager._persist_tools) as persist_tools:
+            with self.data_manager.transaction():
+                self.assertTrue(self.data_manager.toggle_favorite(1))
+                self.assertTrue(self.data_manager.add_tool({"name": "Three", "path": "three.exe", "category_id": 1}))
+                self.assertTrue(self.data_manager.reorder_tools([3, 1, 2]))
+                self.assertTrue(self.data_manager.add_category({"name": "分类二"}))
+                self.assertEqual([3, 1, 2], [tool["id"] for tool in self.data_manager.load_tools()])
+                self.assertEqual(2, len(json.loads(tools_file.read_text(encoding="utf-8"))["tools"]))
+
+        self.assertEqual(1, persist_tools.call_count)
+        self.assertFalse(journal_file.exists())
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        self.assertEqual([3, 1, 2], [tool["id"] for tool in reloaded.load_tools()])
+        self.assertTrue(reloaded.get_tool_by_id(1)["is_favorite"])
+        self.assertEqual(["分类一", "分类二"], [category["name"] for category in reloaded.load_categories()])
+        self.assertTrue(reloaded.audit_tools_split_consistency()["consistent"])
+
+    def test_transaction_rolls_back_staged_changes_on_exception(self):
+        tools = [{"id": 1, "name": "One", "path": "one.exe", "category_id": None, "subcategory_id": None, "is_favorite": False}]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        original_payload = Path(self.data_manager.tools_file).read_bytes()
+
+        with self.assertRaises(RuntimeError):
+            with self.data_manager.transaction():
+                self.assertTrue(self.data_manager.toggle_favorite(1))
+                self.assertEqual({"success": True, "requested": 1, "deleted": 1, "remaining": 0}, self.data_manager.delete_tools([1]))
+                raise RuntimeError("boom")
+
+        self.assertEqual(original_payload, Path(self.data_manager.tools_file).read_bytes())
+        self.assertFalse(Path(self.data_manager.tools_journal.journal_path).exists())
+        self.assertFalse(self.data_manager.get_tool_by_id(1)["is_favorite"])
+
+    def test_write_behind_coalesces_saves_and_shutdown_drains_queue(self):
+        data_manager = DataManager(config_dir=str(self.config_dir), write_behind=True)
+        data_manager.write_behind.coalesce_window = 30
+        tools_file = Path(data_manager.tools_file)
+        original_payload = tools_file.read_bytes()
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": None, "subcategory_id": None, "is_favorite": False},
+        ]
+
+        self.assertTrue(data_manager.save_tools(tools))
+        self.assertTrue(data_manager.add_tool({"name": "Two", "path": "two.exe"}))
+        self.assertTrue(data_manager.toggle_favorite(1))
+
+        self.assertEqual(original_payload, tools_file.read_bytes())
+        self.assertFalse(Path(data_manager.tools_journal.journal_path).exists())
+        self.assertEqual([1, 2], [tool["id"] for tool in data_manager.load_tools()])
+        self.assertTrue(data_manager.get_tool_by_id(1)["is_favorite"])
+
+        data_manager.shutdown()
+
+        self.assertEqual(1, data_manager.write_behind.write_count)
+        self.assertFalse(data_manager.write_behind.is_busy())
+        on_disk_tools = json.loads(tools_file.read_text(encoding="utf-8"))["tools"]
+        self.assertEqual(["One", "Two"], [tool["name"] for tool in on_disk_tools])
+        self.assertTrue(on_disk_tools[0]["is_favorite"])
+
+    def test_write_behind_keeps_categories_marked_dirty_while_a_write_is_in_flight(self):
+        data_manager = DataManager(config_dir=str(self.config_dir), write_behind=True)
+        self.assertTrue(data_manager.save_categories([
+            {"id": 1, "name": "分类一", "priority": 1, "subcategories": []},
+            {"id": 2, "name": "分类二", "priority": 2, "subcategories": []},
+        ]))
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": None},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 2, "subcategory_id": None},
+        ]
+        data_manager._mark_split_categories_dirty(1)
+        real_write_aggregate = data_manager._write_tools_aggregate_file
+        real_category_index = data_manager.get_category_index
+        index_threads = []
+
+        def write_aggregate_while_gui_edits(*args):
+            # 模拟后台写盘期间 GUI 线程修改了分类 2 的工具
+            data_manager._mark_split_categories_dirty(2)
+            return real_write_aggregate(*args)
+
+        def category_index():
+            index_threads.append(threading.current_thread())
+            return real_category_index()
+
+        with patch.object(data_manager, "_write_tools_aggregate_file", side_effect=write_aggregate_while_gui_edits), \
+                patch.object(data_manager, "get_category_index", side_effect=category_index):
+            self.assertTrue(data_manager.save_tools(tools))
+            self.assertTrue(data_manager.flush_write_behind(5))
+
+        self.assertEqual({2}, data_manager._dirty_split_categories)
+        self.assertEqual({threading.current_thread()}, set(index_threads))
+        data_manager.shutdown()
+
+    def test_write_behind_falls_back_to_synchronous_save_when_background_write_fails(self):
+        data_manager = DataManager(config_dir=str(self.config_dir), write_behind=True)
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": None, "subcategory_id": None, "is_favorite": False},
+        ]
+
+        with patch.object(data_manager, "_write_tools_aggregate_file", side_effect=[OSError("disk full"), None]) as write_aggregate:
+            self.assertTrue(data_manager.save_tools(tools))
+            self.assertTrue(data_manager.write_behind.wait_idle(5))
+            self.assertIsNotNone(data_manager.write_behind.last_error)
+            self.assertTrue(data_manager.flush_write_behind())
+
+        self.assertEqual(2, write_aggregate.call_count)
+        self.assertIsNone(data_manager.write_behind.last_error)
+
+    def test_shutdown_writes_startup_snapshot_used_until_library_changes(self):
+        tools = [
+            {"id": 1, "name": "Snapshot Tool", "path": "snap.exe", "description": "Binary CACHE", "category_id": None, "subcategory_id": None},
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        self.data_manager.shutdown()
+        self.assertTrue(Path(self.data_manager.tools_snapshot_path).is_file())
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        with patch.object(reloaded, "_load_tools_from_disk", side_effect=AssertionError("snapshot not used")), patch(
+            "core.tool_snapshot.infer_display_tool_type_label", side_effect=AssertionError("type label not precomputed")
+        ):
+            self.assertEqual(["Snapshot Tool"], [tool["name"] for tool in reloaded.load_tools()])
+            self.assertEqual([1], [tool["id"] for tool in reloaded.search_tools("cache")])
+            snapshot_tool = reloaded.load_tools()[0]
+            self.assertEqual("应用", reloaded.get_tool_type_label(snapshot_tool))
+            self.assertIsNone(reloaded.get_tool_type_label(dict(snapshot_tool)))
+
+        self.assertTrue(reloaded.update_tool(1, {"name": "Renamed", "path": "snap.exe", "description": "fresh"}))
+        self.assertEqual([], reloaded.search_tools("cache"))
+        self.assertEqual([1], [tool["id"] for tool in reloaded.search_tools("renamed")])
+        self.assertIsNone(reloaded.get_tool_type_label(snapshot_tool))
+
+        fresh = DataManager(config_dir=str(self.config_dir))
+        with patch.object(fresh, "_load_tools_from_disk", wraps=fresh._load_tools_from_disk) as load_from_disk:
+            self.assertEqual(["Renamed"], [tool["name"] for tool in fresh.load_tools()])
+        load_from_disk.assert_called_once()
+
+    def test_get_tools_by_category_reads_only_that_split_file_when_aggregate_is_missing(self):
+        categories = [
+            {"id": 1, "name": "分类一", "priority": 1, "subcategories": []},
+            {"id": 2, "name": "分类二", "priority": 2, "subcategories": []},
+        ]
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": 101},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 2, "subcategory_id": None},
+            {"id": 3, "name": "Three", "path": "three.exe", "category_id": 1, "subcategory_id": None},
+        ]
+        self.assertTrue(self.data_manager.save_categories(categories))
+        self.assertTrue(self.data_manager.save_tools(tools))
+
+        reloaded = DataManager(config_dir=str(self.config_dir))
+        Path(reloaded.tools_file).unlink()
+        with patch("core.data_manager._load_json_records", wraps=data_manager_module._load_json_records) as load_records:
+            self.assertEqual([1, 3], [tool["id"] for tool in reloaded.get_tools_by_category(1)])
+            self.assertEqual([1], [tool["id"] for tool in reloaded.get_tools_by_category(1, 101)])
+
+        self.assertEqual(1, load_records.call_count)
+        self.assertTrue(Path(load_records.call_args.args[0]).name.startswith("01_"))
+        self.assertIsNone(reloaded._tools_cache)
+
+        self.assertEqual([1, 2, 3], sorted(tool["id"] for tool in reloaded.load_tools()))
+        self.assertEqual([2], [tool["id"] for tool in reloaded.get_tools_by_category(2)])
+
+    def test_lookup_indexes_are_updated_incrementally_by_mutations(self):
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "subcategory_id": 101, "is_favorite": False},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 2, "subcategory_id": None, "is_favorite": True},
+            {"id": 3, "name": "Three", "path": "three.exe", "category_id": 1, "subcategory_id": None, "is_favorite": False},
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        self.assertEqual([1, 3], [tool["id"] for tool in self.data_manager.get_tools_by_category(1)])
+        index = self.data_manager._tools_index
+
+        self.assertTrue(self.data_manager.toggle_favorite(3))
+        self.assertTrue(self.data_manager.update_tool(2, {"name": "Two", "path": "two.exe", "category_id": 1, "subcategory_id": 101}))
+        self.assertTrue(self.data_manager.add_tool({"name": "Four", "path": "four.exe", "category_id": 1, "subcategory_id": 101, "is_favorite": True}))
+
+        self.assertIs(index, self.data_manager._tools_index)
+        self.assertEqual([1, 2, 3, 4], [tool["id"] for tool in self.data_manager.get_tools_by_category(1)])
+        self.assertEqual([1, 2, 4], [tool["id"] for tool in self.data_manager.get_tools_by_category(1, 101)])
+        self.assertEqual([], self.data_manager.get_tools_by_category(2))
+        self.assertEqual([3, 4], [tool["id"] for tool in self.data_manager.get_favorite_tools()])
+        self.assertEqual("Four", self.data_manager.get_tool_by_id(4)["name"])
+        self.assertIs(self.data_manager.load_tools()[1], self.data_manager.get_tool_by_id(2))
+
+        self.assertTrue(self.data_manager.delete_tool(1))
+        self.assertEqual([2, 3, 4], [tool["id"] for tool in self.data_manager.get_tools_by_category(1)])
+        self.assertIsNone(self.data_manager.get_tool_by_id(1))
+
+    def test_tools_view_is_shared_until_a_mutation_and_keeps_its_contents(self):
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1, "is_favorite": False},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 1, "is_favorite": False},
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        view = self.data_manager.get_tools_view()
+        self.assertIs(view, self.data_manager.get_tools_view())
+
+        self.assertTrue(self.data_manager.toggle_favorite(1))
+        self.assertTrue(self.data_manager.update_tool_usage(2))
+        self.assertTrue(self.data_manager.add_tool({"name": "Three", "path": "three.exe", "category_id": 1}))
+
+        self.assertEqual([1, 2], [tool["id"] for tool in view])
+        self.assertFalse(view[0]["is_favorite"])
+        self.assertEqual(0, view[1].get("usage_count", 0))
+        fresh_view = self.data_manager.get_tools_view()
+        self.assertIsNot(view, fresh_view)
+        self.assertGreater(fresh_view.version, view.version)
+        self.assertEqual([1, 2, 3], [tool["id"] for tool in fresh_view])
+        self.assertTrue(fresh_view[0]["is_favorite"])
+        self.assertEqual(1, fresh_view[1]["usage_count"])
+
+    def test_usage_updates_replace_the_record_and_rebuild_only_its_view_chunk(self):
+        chunk_size = ToolLibraryView.CHUNK_SIZE
+        self.assertTrue(self.data_manager.save_tools([
+            {"id": tool_id, "name": f"Tool {tool_id}", "path": f"tool{tool_id}.exe", "category_id": 1,
+             "usage_count": 0, "last_used": None}
+            for tool_id in range(1, chunk_size + 2)
+        ]))
+        view = self.data_manager.get_tools_view()
+        version = self.data_manager.tools_version
+
+        self.assertTrue(self.data_manager.update_tool_usage(chunk_size + 1))
+        fresh_view = self.data_manager.get_tools_view()
+
+        self.assertGreater(self.data_manager.tools_version, version)
+        self.assertEqual(0, view[chunk_size]["usage_count"])
+        self.assertIsNone(view[chunk_size]["last_used"])
+        self.assertEqual(1, fresh_view[chunk_size]["usage_count"])
+        self.assertIsNotNone(fresh_view[chunk_size]["last_used"])
+        self.assertIs(view._chunks[0], fresh_view._chunks[0])
+
+        self.assertTrue(self.data_manager.flush_pending_usage_updates())
+        self.assertIs(view._chunks[0], self.data_manager.get_tools_view()._chunks[0])
+        self.assertEqual(1, self.data_manager.get_tools_view()[chunk_size]["usage_count"])
+
+    def test_single_tool_changes_rebuild_only_the_touched_view_chunk(self):
+        chunk_size = ToolLibraryView.CHUNK_SIZE
+        self.assertTrue(self.data_manager.save_tools([
+            {"id": tool_id, "name": f"Tool {tool_id}", "path": f"tool{tool_id}.exe", "category_id": 1}
+            for tool_id in range(1, chunk_size * 2 + 2)
+        ]))
+        view = self.data_manager.get_tools_view()
+
+        self.assertTrue(self.data_manager.toggle_favorite(chunk_size + 1))
+        self.assertTrue(self.data_manager.add_tool({"name": "Tail", "path": "tail.exe", "category_id": 1}))
+        fresh_view = self.data_manager.get_tools_view()
+
+        self.assertIs(view._chunks[0], fresh_view._chunks[0])
+        self.assertIsNot(view._chunks[1], fresh_view._chunks[1])
+        self.assertEqual(len(view) + 1, len(fresh_view))
+        self.assertEqual(list(self.data_manager.load_tools()), list(fresh_view))
+        self.assertFalse(view[chunk_size].get("is_favorite", False))
+        self.assertTrue(fresh_view[chunk_size]["is_favorite"])
+
+        self.assertTrue(self.data_manager.delete_tool(1))
+        self.assertEqual(list(self.data_manager.load_tools()), list(self.data_manager.get_tools_view()))
+
+    def test_audit_reuses_cached_findings_for_unchanged_tools_but_rechecks_local_paths(self):
+        self.assertTrue(self.data_manager.save_categories([
+            {"id": 1, "name": "Category", "priority": 1, "subcategories": []}
+        ]))
+        self.assertTrue(self.data_manager.save_tools([
+            {"id": 1, "name": "Local", "path": "tools/local.exe", "icon": "missing-one", "category_id": 1},
+            {"id": 2, "name": "Web", "path": "https://example.com", "icon": "missing-two", "category_id": 1, "is_web_tool": True},
+        ]))
+        self.data_manager.audit_tools_data()
+
+        resolve_icon = data_manager_module.resolve_icon_path_value
+        with patch.object(data_manager_module, "resolve_icon_path_value", wraps=resolve_icon) as icon_check, \
+                patch.object(self.data_manager, "_audit_tool_record", wraps=self.data_manager._audit_tool_record) as record_check:
+            result = self.data_manager.audit_tools_data()
+            self.assertEqual(0, icon_check.call_count)
+            self.assertEqual(0, record_check.call_count)
+            self.assertEqual(1, result["counts"].get("invalid_path"))
+
+            local_tool = self.config_dir / "tools" / "local.exe"
+            local_tool.parent.mkdir(parents=True, exist_ok=True)
+            local_tool.write_text("", encoding="utf-8")
+            self.assertTrue(self.data_manager.update_tool(2, {
+                "name": "Web", "path": "https://example.com", "icon": "missing-three", "category_id": 1, "is_web_tool": True,
+            }))
+            result = self.data_manager.audit_tools_data()
+
+        self.assertEqual(["missing-three"], [call.args[0] for call in icon_check.call_args_list])
+        self.assertEqual([2], [call.args[0]["id"] for call in record_check.call_args_list])
+        self.assertIsNone(result["counts"].get("invalid_path"))
+        self.assertEqual(2, result["counts"].get("invalid_icon"))
+
+    def test_audit_cache_follows_icon_files_outside_the_icon_directories(self):
+        icon_path = self.config_dir / "external" / "logo.png"
+        icon_path.parent.mkdir(parents=True, exist_ok=True)
+        self.assertTrue(self.data_manager.save_categories([
+            {"id": 1, "name": "Category", "priority": 1, "subcategories": []}
+        ]))
+        self.assertTrue(self.data_manager.save_tools([
+            {"id": 1, "name": "Web", "path": "https://example.com", "icon": os.fspath(icon_path),
+             "category_id": 1, "is_web_tool": True},
+        ]))
+
+        def invalid_icons():
+            return self.data_manager.audit_tools_data()["counts"].get("invalid_icon", 0)
+
+        self.assertEqual(1, invalid_icons())
+        icon_path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16)
+        self.assertEqual(0, invalid_icons())
+        icon_path.write_text("<html><body>moved</body></html>", encoding="utf-8")
+        self.assertEqual(1, invalid_icons())
+        icon_path.unlink()
+        self.assertEqual(1, invalid_icons())
+
+    def test_concurrent_instances_merge_record_changes_instead_of_overwriting(self):
+        tools = [
+            {"id": 1, "name": "One", "path": "one.exe", "category_id": 1},
+            {"id": 2, "name": "Two", "path": "two.exe", "category_id": 1},
+        ]
+        self.assertTrue(self.data_manager.save_tools(tools))
+        generation = self.data_manager.tools_generation
+        stale_tools = list(self.data_manager.load_tools())
+
+        other = DataManager(config_dir=str(self.config_dir))
+        self.assertTrue(other.update_tool(2, {"name": "Two (other)", "path": "two.exe", "category_id": 1}))
+        self.assertTrue(other.add_tool({"name": "Three (other)", "path": "three.exe", "category_id": 1}))
+
+        stale_tools[0] = {**stale_tools[0], "name": "One (first)"}
+        stale_tools.append({"id": 3, "name": "Three (first)", "path": "three.exe", "category_id": 1})
+        self.assertTrue(self.data_manager.save_tools(stale_tools))
+
+        expected = {1: "One (first)", 2: "Two (other)", 3: "Three (other)", 4: "Three (first)"}
+        reader = DataManager(config_dir=str(self.config_dir))
+        self.assertEqual(expected, {tool["id"]: tool["name"] for tool in reader.load_tools()})
+        self.assertEqual(expected, {tool["id"]: tool["name"] for tool in self.data_manager.load_tools()})
+        self.assertEqual(expected, {tool["id"]: tool["name"] for tool in other.load_tools()})
+        on_disk = json.loads(Path(self.data_manager.tools_file).read_text(encoding="utf-8"))
+        self.assertEqual(generation + 1, on_disk["generation"])
+        self.assertEqual(generation + 1, self.data_manager.tools_generation)
+
+    def test_category_index_is_cached_until_categories_are_saved(self):
+        categories = [
+            {"id": 1, "name": "Recon", "priority": 2, "subcategories": [{"id": 101, "name": "DNS"}]},
+            {"id": 2, "name": "Web 渗透", "priority": 1, "subcategories": []},
+        ]
+        self.assertTrue(self.data_manager.save_tools([]))
+        self.assertTrue(self.data_manager.save_categories(categories))
+        index = self.data_manager.get_category_index()
+
+        self.assertIs(index, self.data_manager.get_category_index())
+        self.assertEqual(2, index.category_id_for_name("  web 渗透 "))
+        self.assertEqual(1, index.category_id_for_name("RECON"))
+        self.assertEqual(101, index.subcategory_id_for_name(1, "dns"))
+        self.assertEqual((1, "DNS"), (index.subcategory(101)[0]["id"], index.subcategory(101)[1]["name"]))
+        self.assertEqual([2, 1], list(index.split_files))
+        self.assertEqual(1, index.category_id_for_split_file(index.split_file_for(1)))
+        self.assertTrue(index.split_file_for(1).endswith("02_recon_1.json"))
+
+        self.assertTrue(self.data_manager.add_subcategory(2, {"name": "XSS"}))
+        rebuilt = self.data_manager.get_category_index()
+        self.assertIsNot(index, rebuilt)
+        self.assertGreater(rebuilt.version, index.version)
+        self.assertEqual((2, "XSS"), (rebuilt.subcategory(102)[0]["id"], rebuilt.subcategory(102)[1]["name"]))
+        self.assertEqual("Web 渗透 / XSS", rebuilt.labels[(2, 102)])
+        self.assertEqual((True, ""), self.data_manager.delete_subcategory(102))
+        self.assertIsNone(self.data_manager.get_category_index().subcategory(102))
+
 
 if __name__ == "__main__":
     unittest.main()
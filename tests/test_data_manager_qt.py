@@ -1,9 +1,16 @@
 import json
+import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
+
+from PyQt5.QtWidgets import QApplication
 
 from _support import cleanup_test_dir, make_test_dir
+from core import data_manager as data_manager_module
+from core.data_manager import DataManager
 from core.data_manager_qt import ToolsLoadWorker
+from core.file_durability import flush_deferred_writes
 
 
 class ToolsLoadWorkerTests(unittest.TestCase):
@@ -61,6 +68,101 @@ class ToolsLoadWorkerTests(unittest.TestCase):
         self.assertEqual(1, len(results))
         self.assertEqual(["Aggregate Tool"], [tool["name"] for tool in results[0]])
 
+    def test_run_defers_snapshot_and_reuses_it_while_state_token_matches(self):
+        tools_file = self.workspace / "tools.json"
+        split_dir = self.workspace / "tools"
+        snapshot_path = self.workspace / "cache" / "tools.snapshot.bin"
+        tools_file.write_text(
+            json.dumps({"tools": [{"id": 1, "name": "Cached Tool", "path": "tools/cached.exe"}]}),
+            encoding="utf-8",
+        )
+
+        first_results = []
+        first = ToolsLoadWorker(str(tools_file), str(split_dir), None, None, snapshot_path=str(snapshot_path))
+        first.finished.connect(first_results.append)
+        first.run()
+        # 快照按 cached 等级登记，关闭时才写出
+        self.assertFalse(snapshot_path.is_file())
+        self.assertEqual(1, flush_deferred_writes((snapshot_path,)))
+        self.assertTrue(snapshot_path.is_file())
+
+        second_results = []
+        second = ToolsLoadWorker(str(tools_file), str(split_dir), None, None, snapshot_path=str(snapshot_path))
+        second.finished.connect(second_results.append)
+        with patch("core.data_manager_qt._load_tools_from_storage", side_effect=AssertionError("snapshot not used")):
+            second.run()
+
+        self.assertEqual(first_results, second_results)
+        self.assertEqual("Cached Tool", second_results[0][0]["name"])
+
+    def test_run_reports_each_split_file_when_aggregate_file_is_missing(self):
+        tools_file = self.workspace / "tools.json"
+        split_dir = self.workspace / "tools"
+        split_dir.mkdir(parents=True, exist_ok=True)
+        (split_dir / "01_recon_1.json").write_text(
+            json.dumps({"tools": [{"id": 1, "name": "Recon", "category_id": 1}]}),
+            encoding="utf-8",
+        )
+        (split_dir / "99_uncategorized.json").write_text(
+            json.dumps({"tools": [{"id": 2, "name": "Loose", "category_id": None}]}),
+            encoding="utf-8",
+        )
+
+        batches = []
+        results = []
+        worker = ToolsLoadWorker(str(tools_file), str(split_dir), None, None)
+        worker.split_file_loaded.connect(lambda path, records: batches.append((Path(path).name, records)))
+        worker.finished.connect(results.append)
+
+        worker.run()
+
+        self.assertEqual(["01_recon_1.json", "99_uncategorized.json"], [name for name, _ in batches])
+        self.assertEqual(["Recon"], [tool["name"] for tool in batches[0][1]])
+        self.assertEqual(["Recon", "Loose"], [tool["name"] for tool in results[0]])
+
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class ToolsStorageWatcherTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.workspace = make_test_dir(f"tools_storage_watcher_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.workspace))
+        self.data_manager = DataManager(config_dir=str(self.workspace))
+        self.addCleanup(self.data_manager.shutdown)
+
+    def _wait_until(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return predicate()
+
+    def test_watched_library_skips_stat_until_files_change(self):
+        self.data_manager.add_tool({"name": "Watched Tool", "path": "tools/watched.exe", "category_id": 1})
+        self.data_manager.compact_tools_journal()
+        self.assertTrue(self.data_manager.enable_file_watch())
+        self.assertIn("Watched Tool", [tool["name"] for tool in self.data_manager.load_tools()])
+        self.app.processEvents()
+        self.data_manager._tools_storage_changed = False
+
+        with patch.object(data_manager_module, "_get_tools_state_token", side_effect=AssertionError("stat")):
+            self.assertIn("Watched Tool", [tool["name"] for tool in self.data_manager.load_tools()])
+
+        Path(self.data_manager.tools_file).write_text(
+            json.dumps({"tools": [{"id": 7, "name": "External Tool", "path": "tools/external.exe"}]}),
+            encoding="utf-8",
+        )
+
+        self.assertTrue(
+            self._wait_until(
+                lambda: [tool["name"] for tool in self.data_manager.load_tools()] == ["External Tool"]
+            )
+        )
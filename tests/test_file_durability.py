@@ -0,0 +1,123 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from _support import cleanup_test_dir, make_test_dir
+from core import file_durability
+from core.file_durability import (
+    DURABILITY_CACHED,
+    DURABILITY_NORMAL,
+    DURABILITY_STRICT,
+    flush_deferred_writes,
+    write_bytes_atomic,
+)
+
+
+class WriteBytesAtomicTests(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = make_test_dir(f"file_durability_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.test_dir))
+        self.target = self.test_dir / "data" / "tools.json"
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.target.write_bytes(b'{"tools": ["old"]}')
+
+    def _leftover_temp_files(self):
+        return [name for name in os.listdir(self.target.parent) if name.endswith(".tmp")]
+
+    def test_only_strict_writes_fsync_the_file_and_its_directory(self):
+        fsync_counts = {}
+        for durability in (DURABILITY_STRICT, DURABILITY_NORMAL):
+            with patch.object(file_durability.os, "fsync", wraps=os.fsync) as fsync, patch.object(
+                file_durability, "fsync_directory", wraps=file_durability.fsync_directory
+            ) as fsync_directory:
+                self.assertTrue(write_bytes_atomic(self.target, durability.encode("utf-8"), durability))
+            fsync_counts[durability] = (fsync.call_count > 0, fsync_directory.call_count)
+            self.assertEqual(durability.encode("utf-8"), self.target.read_bytes())
+
+        self.assertEqual(
+            {DURABILITY_STRICT: (True, 1), DURABILITY_NORMAL: (False, 0)},
+            fsync_counts,
+        )
+
+    def test_interrupted_writes_leave_the_previous_file_intact_at_every_level(self):
+        for durability in (DURABILITY_STRICT, DURABILITY_NORMAL):
+            with patch.object(file_durability.os, "replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    write_bytes_atomic(self.target, b'{"tools": []}', durability)
+
+            self.assertEqual(b'{"tools": ["old"]}', self.target.read_bytes())
+            self.assertEqual([], self._leftover_temp_files())
+
+    def test_new_content_is_never_visible_half_written(self):
+        observed = []
+        real_replace = os.replace
+
+        def replace_after_checking_target(source, target):
+            # 临时文件写完之前目标文件不会被碰到
+            observed.append((self.target.read_bytes(), Path(source).read_bytes()))
+            real_replace(source, target)
+
+        payload = b'{"tools": [' + b'"x",' * 50000 + b'"y"]}'
+        with patch.object(file_durability.os, "replace", side_effect=replace_after_checking_target):
+            write_bytes_atomic(self.target, payload, DURABILITY_NORMAL)
+
+        self.assertEqual([(b'{"tools": ["old"]}', payload)], observed)
+        self.assertEqual(payload, self.target.read_bytes())
+        with self.assertRaises(ValueError):
+            write_bytes_atomic(self.target, payload, "eventually")
+
+
+class DeferredWriteTests(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = make_test_dir(f"file_durability_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.test_dir))
+        self.target = self.test_dir / "cache" / "index.json"
+        self.target.parent.mkdir(parents=True, exist_ok=True)
+        self.addCleanup(flush_deferred_writes, (self.target,))
+
+    def test_cached_writes_wait_for_flush_and_only_write_the_latest_payload(self):
+        encoded = []
+
+        def encode():
+            encoded.append(True)
+            return b"second"
+
+        self.assertTrue(write_bytes_atomic(self.target, b"first", DURABILITY_CACHED))
+        self.assertTrue(write_bytes_atomic(self.target, encode, DURABILITY_CACHED))
+        self.assertFalse(self.target.exists())
+        self.assertEqual([], encoded)
+
+        with patch.object(file_durability.os, "fsync", wraps=os.fsync) as fsync:
+            self.assertEqual(1, flush_deferred_writes((self.target,)))
+        self.assertEqual(b"second", self.target.read_bytes())
+        self.assertEqual([True], encoded)
+        self.assertEqual(0, fsync.call_count)
+        self.assertEqual(0, flush_deferred_writes((self.target,)))
+
+    def test_immediate_write_discards_the_pending_cached_payload(self):
+        write_bytes_atomic(self.target, b"stale", DURABILITY_CACHED)
+        write_bytes_atomic(self.target, b"fresh", DURABILITY_NORMAL)
+
+        self.assertEqual(0, flush_deferred_writes((self.target,)))
+        self.assertEqual(b"fresh", self.target.read_bytes())
+
+    def test_flush_skips_removed_directories_and_logs_failed_writes(self):
+        failing = self.test_dir / "cache" / "failing.json"
+        orphan = self.test_dir / "removed" / "index.json"
+        write_bytes_atomic(failing, b"payload", DURABILITY_CACHED)
+        write_bytes_atomic(orphan, b"payload", DURABILITY_CACHED)
+        cleanup_test_dir(orphan.parent)
+
+        with patch.object(file_durability.os, "replace", side_effect=OSError("disk full")), patch.object(
+            file_durability.logger, "warning"
+        ) as warning:
+            self.assertEqual(0, flush_deferred_writes((failing, orphan)))
+
+        self.assertEqual(1, warning.call_count)
+        self.assertFalse(failing.exists())
+        self.assertFalse(orphan.parent.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import difflib
+import random
+import unittest
+
+from core.fuzzy_match import FuzzyMatcher, similarity_ratio
+
+
+def _lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for char_a in a:
+        current = [0]
+        for position, char_b in enumerate(b):
+            if char_a == char_b:
+                current.append(previous[position] + 1)
+            else:
+                current.append(max(previous[position + 1], current[position]))
+        previous = current
+    return previous[-1]
+
+
+class FuzzyMatcherTests(unittest.TestCase):
+    def test_bit_parallel_lcs_matches_dynamic_programming(self):
+        rng = random.Random(3)
+        alphabet = "abcdef扫描"
+        for _ in range(2000):
+            query = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 70)))
+            candidate = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 14)))
+
+            self.assertEqual(_lcs_length(query, candidate), FuzzyMatcher(query).lcs_length(candidate), (query, candidate))
+
+    def test_score_cutoff_returns_zero_only_below_the_cutoff(self):
+        rng = random.Random(5)
+        for _ in range(2000):
+            query = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 10)))
+            candidate = "".join(rng.choice("abcde") for _ in range(rng.randint(1, 10)))
+            full = similarity_ratio(query, candidate)
+            for cutoff in (0.60, 0.72, 0.85):
+                expected = full if full >= cutoff else 0.0
+                self.assertEqual(expected, similarity_ratio(query, candidate, cutoff), (query, candidate, cutoff))
+
+        self.assertEqual(1.0, similarity_ratio("", ""))
+        self.assertEqual(0.0, similarity_ratio("nmap", ""))
+
+    def test_ratio_never_scores_below_difflib(self):
+        pairs = [("nmpa", "nmap"), ("dirsaerch", "dirsearch"), ("sqlmp", "sqlmap"), ("扫苗", "扫描"), ("abcd", "dcba")]
+        for query, candidate in pairs:
+            ratio = similarity_ratio(query, candidate)
+            self.assertGreaterEqual(ratio, difflib.SequenceMatcher(None, query, candidate).ratio(), (query, candidate))
+
+        self.assertAlmostEqual(0.75, similarity_ratio("nmpa", "nmap"))
+        self.assertAlmostEqual(16 / 18, similarity_ratio("dirsaerch", "dirsearch"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ from unittest.mock import patch
 
 from _support import cleanup_test_dir, make_test_dir
 from core.auto_icon_resolver import clear_auto_icon_index_cache, record_auto_icon_path
+from core.tool_record import ToolRecord
 from ui.icon_loader import get_icon_cache_key, icon_loader
 
 
@@ -48,6 +49,20 @@ class IconLoaderTests(unittest.TestCase):
 
         self.assertEqual(str(custom_icon), icon_key)
 
+    def test_get_icon_cache_key_resolves_tool_record_views_like_dicts(self):
+        custom_icon = self.workspace / "custom.png"
+        custom_icon.write_bytes(b"fake-png")
+        tool = ToolRecord({
+            "path": str(self.exe_path),
+            "icon": str(custom_icon),
+            "is_web_tool": False,
+        }, _display_type_label="GUI")
+
+        with patch("ui.icon_loader.ensure_runtime_dir", return_value=self.icon_cache_dir):
+            icon_key = get_icon_cache_key(tool)
+
+        self.assertEqual(str(custom_icon), icon_key)
+
     def test_get_icon_cache_key_falls_back_to_executable_cache_for_invalid_custom_icon(self):
         tool = {
             "path": str(self.exe_path),
@@ -262,6 +277,20 @@ class IconLoaderTests(unittest.TestCase):
         self.assertEqual("cached-icon", icon)
         get_icon_mock.assert_called_once_with(str(self.workspace / "cached-icon.png"), theme_name="dark_green")
 
+    def test_get_icon_uses_precomputed_cache_key_of_tool_record_views(self):
+        tool = ToolRecord(
+            {"path": str(self.exe_path), "icon": "favicon.ico", "is_web_tool": False},
+            _icon_cache_key=str(self.workspace / "cached-icon.png"),
+            _icon_cache_theme="dark_green",
+        )
+
+        with patch("ui.icon_loader.get_icon_cache_key", side_effect=AssertionError("should not recompute")):
+            with patch.object(icon_loader, "_get_icon_from_path", return_value="cached-icon") as get_icon_mock:
+                icon = icon_loader.get_icon(tool, theme_name="dark_green")
+
+        self.assertEqual("cached-icon", icon)
+        get_icon_mock.assert_called_once_with(str(self.workspace / "cached-icon.png"), theme_name="dark_green")
+
     def test_get_icon_from_missing_path_uses_theme_default_icon(self):
         missing_icon = str(self.workspace / "missing-github.png")
 
@@ -0,0 +1,40 @@
+import io
+import json
+import unittest
+
+from core.json_stream import iter_json_stream_records
+
+
+class IterJsonStreamRecordsTests(unittest.TestCase):
+    def _records(self, payload, chunk_size, header=None):
+        return list(iter_json_stream_records(io.StringIO(payload), header=header, chunk_size=chunk_size))
+
+    def test_reads_both_layouts_across_any_chunk_boundary(self):
+        tools = [{"id": 1, "name": "A, [b]"}, {"id": 2, "score": 12.5e-3, "tags": ["x"]}, 1234.5, None]
+        wrapped = json.dumps({"generation": 7, "tools": tools, "tool_count": 4}, indent=2)
+        bare = json.dumps(tools)
+
+        for chunk_size in (1, 2, 5, 64):
+            header = {}
+            self.assertEqual(tools, self._records(wrapped, chunk_size, header))
+            self.assertEqual({"generation": 7, "tool_count": 4}, header)
+            self.assertEqual(tools, self._records(bare, chunk_size))
+
+    def test_missing_or_non_list_root_key_yields_nothing(self):
+        self.assertEqual([], self._records('{"categories": [1, 2]}', 4))
+        self.assertEqual([], self._records('{"tools": {"id": 1}}', 4))
+        self.assertEqual([], self._records('"tools"', 4))
+
+    def test_malformed_json_raises_value_error_after_valid_records(self):
+        records = iter_json_stream_records(io.StringIO('{"tools": [{"id": 1}, {"id": 2} {"id": 3}]}'), chunk_size=3)
+
+        self.assertEqual({"id": 1}, next(records))
+        with self.assertRaises(ValueError):
+            list(records)
+        for payload in ("", "[1,", "[1] []", "{tools: []}"):
+            with self.assertRaises(ValueError):
+                self._records(payload, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
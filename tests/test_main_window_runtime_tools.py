@@ -217,6 +217,9 @@ class MainWindowRuntimeToolTests(unittest.TestCase):
             def get_selected_tool_ids(self):
                 return [1]
 
+            def get_selected_action(self):
+                return "delete", None
+
         with patch("ui.main_window.ToolBulkDeleteDialog", FakeBulkDeleteDialog), patch.object(
             window,
             "_themed_question",
@@ -226,6 +229,30 @@ class MainWindowRuntimeToolTests(unittest.TestCase):
 
         self.assertEqual(["Second Tool"], [tool.get("name") for tool in window.data_manager._load_tools_sync()])
 
+    def test_batch_tools_action_favorites_selected_tools_without_confirmation(self):
+        window = self._create_window()
+
+        class FakeBulkEditDialog:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def exec_(self):
+                return QDialog.Accepted
+
+            def get_selected_tool_ids(self):
+                return [1, 2]
+
+            def get_selected_action(self):
+                return "favorite", None
+
+        with patch("ui.main_window.ToolBulkDeleteDialog", FakeBulkEditDialog), patch.object(
+            window, "_themed_question"
+        ) as question:
+            window.on_batch_delete_tools()
+
+        question.assert_not_called()
+        self.assertEqual([True, True], [tool.get("is_favorite") for tool in window.data_manager._load_tools_sync()])
+
     def test_delete_all_tools_action_clears_tools_after_double_confirmation(self):
         window = self._create_window()
 
@@ -1,6 +1,9 @@
 import unittest
+from unittest.mock import patch
 
+from core import notes_manager
 from core.notes_manager import NotesManager
+from core.pinyin_index import pinyin_available
 from _support import cleanup_test_dir, make_test_dir
 
 
@@ -9,6 +12,7 @@ class TestNotesManager(unittest.TestCase):
         self.temp_dir = make_test_dir(f"notes_manager_{self._testMethodName}")
         self.addCleanup(lambda: cleanup_test_dir(self.temp_dir))
         self.manager = NotesManager(repo_root=self.temp_dir)
+        self.addCleanup(self.manager.close)
 
     def test_save_note_uses_tool_id_based_path(self):
         saved = self.manager.save_note("hello", tool_id=123, tool_name="Nuclei")
@@ -25,6 +29,68 @@ class TestNotesManager(unittest.TestCase):
         self.assertTrue((self.temp_dir / "resources" / "notes" / "tool_123.md").exists())
         self.assertEqual("legacy", (self.temp_dir / "resources" / "notes" / "tool_123.md").read_text(encoding="utf-8"))
 
+    def test_search_indexes_match_each_other_and_only_reread_changed_notes(self):
+        self.manager.save_note("# Nmap\n\n" + "背景说明。" * 20 + "常用参数 -sV 端口扫描", tool_id=1, tool_name="Nmap")
+        self.manager.save_note("代理抓包，配合 nmap 使用", tool_id=2, tool_name="Burp")
+        (self.temp_dir / "resources" / "notes" / "empty.md").write_text("", encoding="utf-8")
+
+        def hits(manager, query):
+            return sorted(
+                (hit["note_key"], hit["excerpt"], hit["matched_in_title"], hit["matched_in_content"])
+                for hit in manager.search_notes(query)
+            )
+
+        with patch.object(notes_manager, "fts5_trigram_available", return_value=False):
+            in_memory = NotesManager(repo_root=self.temp_dir)
+            self.assertIsNone(in_memory._get_search_store())
+        for query in ("端口", "-sv", "nmap", "抓包", "zz"):
+            self.assertEqual(hits(in_memory, query), hits(self.manager, query), query)
+
+        note_path = self.temp_dir / "resources" / "notes" / "tool_1.md"
+        for manager in (self.manager, in_memory):
+            # 保存笔记直接更新索引条目，之后的搜索不必重新读取任何笔记
+            with patch.object(manager, "_read_text", wraps=manager._read_text) as read_text:
+                manager.save_note("只剩代理", tool_id=2, tool_name="Burp")
+                self.assertEqual([], manager.search_notes("抓包"))
+            self.assertEqual([], read_text.call_args_list)
+        for manager in (self.manager, in_memory):
+            self.assertEqual(["tool_2"], [hit["note_key"] for hit in manager.search_notes("只剩")])
+
+        note_path.write_text("端口扫描之外的改动", encoding="utf-8")
+        for manager in (self.manager, in_memory):
+            with patch.object(manager, "_read_text", wraps=manager._read_text) as read_text:
+                self.assertEqual(["tool_1"], [hit["note_key"] for hit in manager.search_notes("改动")])
+            self.assertEqual([note_path], [call.args[0] for call in read_text.call_args_list])
+
+        note_path.unlink()
+        for manager in (self.manager, in_memory):
+            self.assertEqual([], manager.search_notes("端口"))
+
+    @unittest.skipUnless(pinyin_available(), "pypinyin 未安装")
+    def test_search_notes_matches_titles_by_pinyin(self):
+        (self.temp_dir / "resources" / "notes" / "一键扫描.md").write_text("端口探测备忘", encoding="utf-8")
+        (self.temp_dir / "resources" / "notes" / "抓包.md").write_text("代理设置", encoding="utf-8")
+
+        hits = self.manager.search_notes("yjsm")
+
+        self.assertEqual(["一键扫描"], [hit["note_key"] for hit in hits])
+        self.assertTrue(hits[0]["matched_in_title"])
+        self.assertEqual(["抓包"], [hit["note_key"] for hit in self.manager.search_notes("zhuabao")])
+        self.assertEqual([], self.manager.search_notes("dl"))
+
+    @unittest.skipUnless(pinyin_available(), "pypinyin 未安装")
+    def test_pinyin_title_index_is_reused_until_notes_change(self):
+        (self.temp_dir / "resources" / "notes" / "一键扫描.md").write_text("端口探测备忘", encoding="utf-8")
+        store = self.manager._get_search_store()
+        self.assertEqual(["一键扫描"], [hit["note_key"] for hit in self.manager.search_notes("yjsm")])
+
+        with patch.object(store, "titles", wraps=store.titles) as titles:
+            self.assertEqual(["一键扫描"], [hit["note_key"] for hit in self.manager.search_notes("saomiao")])
+            self.assertEqual(0, titles.call_count)
+            (self.temp_dir / "resources" / "notes" / "抓包.md").write_text("代理设置", encoding="utf-8")
+            self.assertEqual(["抓包"], [hit["note_key"] for hit in self.manager.search_notes("zb")])
+            self.assertEqual(1, titles.call_count)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from _support import cleanup_test_dir, make_test_dir
+from core.notes_search_index import NotesSearchIndex, fts5_trigram_available, get_notes_search_index_path
+
+
+@unittest.skipUnless(fts5_trigram_available(), "SQLite 不支持 FTS5 trigram 分词")
+class NotesSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = make_test_dir(f"notes_search_index_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.test_dir))
+        self.index = NotesSearchIndex(get_notes_search_index_path(self.test_dir))
+        self.addCleanup(self.index.close)
+        self.notes = {
+            "a.md": {"note_key": "tool_1", "tool_id": 1, "title": "Nmap", "summary": "端口扫描", "content": "端口扫描，NSE 脚本"},
+            "b.md": {"note_key": "tool_2", "tool_id": 2, "title": "Burp", "summary": "代理", "content": "代理抓包，nmap 联动"},
+        }
+        self.loaded = []
+
+    def _load(self, path):
+        self.loaded.append(path)
+        return self.notes.get(path)
+
+    def test_sync_reads_only_new_or_changed_files_and_drops_removed_ones(self):
+        self.assertEqual((2, 0), self.index.sync([("a.md", 1, 10), ("b.md", 1, 10)], self._load))
+        self.assertEqual((0, 0), self.index.sync([("a.md", 1, 10), ("b.md", 1, 10)], self._load))
+
+        self.notes["b.md"] = dict(self.notes["b.md"], content="代理抓包")
+        self.assertEqual((1, 1), self.index.sync([("b.md", 2, 8)], self._load))
+        self.assertEqual(["a.md", "b.md", "b.md"], self.loaded)
+        self.assertEqual([], self.index.search("nse"))
+        self.assertEqual([], self.index.search("nmap"))
+
+        titles = {"tool_2": "Burp Suite"}
+        self.index.sync([("b.md", 2, 8)], self._load, lambda note_key, tool_id: titles[note_key])
+        self.assertEqual([("b.md", "Burp Suite")], self.index.titles())
+        self.assertEqual(["b.md"], [hit["path"] for hit in self.index.search("suite")])
+
+    def test_search_ranks_title_hits_first_and_returns_content_excerpts(self):
+        self.index.sync([("a.md", 1, 10), ("b.md", 1, 10)], self._load)
+
+        hits = self.index.search("nmap")
+        self.assertEqual(["a.md", "b.md"], [hit["path"] for hit in hits])
+        self.assertEqual([False, True], [hit["matched_in_content"] for hit in hits])
+        self.assertEqual(["", "代理抓包，nmap 联动"], [hit["excerpt"] for hit in hits])
+
+        # 不足三个字符的查询没有可用的 trigram，仍需按子串匹配
+        self.assertEqual(["a.md"], [hit["path"] for hit in self.index.search("脚本")])
+        self.assertEqual(["a.md", "b.md"], [hit["path"] for hit in self.index.search("zz", extra_paths=["b.md", "a.md"])])
+        self.assertEqual([], self.index.search('"%_'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import patch
+
+from _support import cleanup_test_dir, make_test_dir
+from core import pinyin_index
+from core.pinyin_index import (
+    PINYIN_MATCH_BOUNDARY,
+    PINYIN_MATCH_EXACT,
+    PINYIN_MATCH_NONE,
+    PINYIN_MATCH_PREFIX,
+    PinyinCache,
+    PinyinKeyIndex,
+    build_pinyin_keys,
+    get_pinyin_cache_path,
+    normalize_pinyin_query,
+    pinyin_available,
+    pinyin_match_level,
+)
+
+
+class PinyinMatchTests(unittest.TestCase):
+    def test_queries_match_full_spelling_or_initials_from_syllable_boundaries(self):
+        keys = build_pinyin_keys(("yi", "jian", "sao", "miao"))
+
+        self.assertEqual(("yijiansaomiao", "yjsm", (0, 2, 6, 9)), tuple(keys))
+        cases = {
+            "yjsm": PINYIN_MATCH_EXACT,
+            "yijiansaomiao": PINYIN_MATCH_EXACT,
+            "yjs": PINYIN_MATCH_PREFIX,
+            "yijians": PINYIN_MATCH_PREFIX,
+            "saomiao": PINYIN_MATCH_BOUNDARY,
+            "sm": PINYIN_MATCH_BOUNDARY,
+            "iansao": PINYIN_MATCH_NONE,
+            "yjm": PINYIN_MATCH_NONE,
+        }
+        for query, level in cases.items():
+            self.assertEqual(level, pinyin_match_level(normalize_pinyin_query(query), keys), query)
+
+    def test_key_index_matches_like_scanning_every_entry(self):
+        all_keys = [
+            build_pinyin_keys(("yi", "jian", "sao", "miao")),
+            build_pinyin_keys(("sao", "miao", "qi")),
+            build_pinyin_keys(("zhua", "bao")),
+            build_pinyin_keys(("sm",)),
+        ]
+        index = PinyinKeyIndex()
+        for item, keys in enumerate(all_keys[:2]):
+            index.add(item, keys)
+        index.add(99, None)
+        self.assertEqual({0: PINYIN_MATCH_BOUNDARY, 1: PINYIN_MATCH_PREFIX}, index.match("sm"))
+        # 查询后继续追加的条目同样能被找到
+        for item, keys in enumerate(all_keys[2:], start=2):
+            index.add(item, keys)
+
+        for query in ("sm", "saomiao", "yjsm", "yijian", "miaoqi", "zb", "bao", "ao", "smq", "qi", "zz"):
+            expected = {
+                item: pinyin_match_level(query, keys)
+                for item, keys in enumerate(all_keys)
+                if pinyin_match_level(query, keys)
+            }
+            self.assertEqual(expected, index.match(query), query)
+        self.assertEqual({}, index.match(""))
+
+    def test_only_letter_queries_of_two_or_more_characters_are_pinyin_queries(self):
+        self.assertEqual("yijian", normalize_pinyin_query("Yi Jian"))
+        for query in ("y", "扫描", "nmap2", "a-b", ""):
+            self.assertEqual("", normalize_pinyin_query(query), query)
+
+
+@unittest.skipUnless(pinyin_available(), "pypinyin 未安装")
+class PinyinCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = make_test_dir(f"pinyin_index_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.test_dir))
+        self.cache_path = get_pinyin_cache_path(self.test_dir)
+
+    def test_conversions_are_written_once_and_reused_after_restart(self):
+        cache = PinyinCache(self.cache_path)
+
+        self.assertEqual(("burp", "yi", "jian", "sao", "miao", "2"), cache.syllables("burp一键扫描 2"))
+        self.assertEqual((), cache.syllables("nmap"))
+        self.assertTrue(cache.flush())
+        self.assertFalse(cache.flush())
+
+        with patch.object(pinyin_index, "_convert_syllables", wraps=pinyin_index._convert_syllables) as convert:
+            reloaded = PinyinCache(self.cache_path)
+            self.assertEqual("yjsm", reloaded.keys("一键扫描").initials)
+            self.assertEqual("byjsm2", reloaded.keys("burp一键扫描 2").initials)
+            self.assertIsNone(reloaded.keys("nmap"))
+
+        self.assertEqual(["一键扫描"], [call.args[0] for call in convert.call_args_list])
+        self.assertTrue(reloaded.flush())
+
+    def test_stale_entries_are_pruned_and_foreign_headers_are_ignored(self):
+        cache = PinyinCache(self.cache_path)
+        for index in range(10):
+            cache.syllables(f"工具{index}")
+        cache.flush()
+
+        restarted = PinyinCache(self.cache_path)
+        restarted.syllables("抓包")
+        restarted.flush()
+        reloaded = PinyinCache(self.cache_path)
+        reloaded._load()
+        self.assertEqual({"抓包"}, set(reloaded._syllables))
+
+        with patch.object(pinyin_index, "_PINYIN_CACHE_HEADER", ("zifeiyu-pinyin-cache", 0)):
+            stale = PinyinCache(self.cache_path)
+            stale._load()
+        self.assertEqual({}, stale._syllables)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -60,6 +60,21 @@ class RuntimePathsTests(unittest.TestCase):
                 runtime_paths.resolve_accessible_path_value("python.exe", base_dir=self.temp_root),
             )
 
+    def test_missing_path_check_matches_the_resolved_path(self):
+        (self.temp_root / "tools").mkdir(parents=True, exist_ok=True)
+        (self.temp_root / "tools" / "scan.exe").write_text("stub", encoding="utf-8")
+        values = ("tools/scan.exe", "tools/missing.exe", str(self.temp_root / "tools" / "scan.exe"),
+                  str(self.temp_root / "missing.exe"), "no-such-command-xyz", "https://example.com", "")
+
+        for value in values:
+            resolved = runtime_paths.resolve_accessible_path_value(value, base_dir=self.temp_root)
+            expected = resolved is not None and not resolved.exists()
+            self.assertEqual(
+                expected,
+                runtime_paths.is_accessible_path_value_missing(value, base_dir=self.temp_root),
+                value,
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
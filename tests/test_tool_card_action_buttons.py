@@ -2,6 +2,7 @@ import os
 import sys
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -184,6 +185,24 @@ class ToolCardActionButtonTests(unittest.TestCase):
         type_mock.assert_called_once()
         icon_mock.assert_called_once()
 
+    def test_tool_grid_uses_type_labels_precomputed_by_the_data_manager(self):
+        container = ToolCardContainer()
+        self.addCleanup(container.deleteLater)
+        cached_tool = {"id": 1, "name": "Cached", "path": "tools/cached.exe"}
+        new_tool = {"id": 2, "name": "New", "path": "tools/new.exe"}
+        labels = {id(cached_tool): "快照标签"}
+        data_manager = SimpleNamespace(get_tool_type_label=lambda tool: labels.get(id(tool)))
+
+        with patch.object(container, "window", return_value=SimpleNamespace(data_manager=data_manager)):
+            with patch("ui.tool_model_view.infer_display_tool_type_label", return_value="应用") as type_mock:
+                container.display_tools([cached_tool, new_tool])
+
+        type_mock.assert_called_once()
+        self.assertEqual(
+            ["快照标签", "应用"],
+            [container.model.get_tool(container.model.index(row, 0))["_display_type_label"] for row in range(2)],
+        )
+
     def test_tool_grid_updates_matching_row_when_auto_icon_is_ready(self):
         container = ToolCardContainer()
         self.addCleanup(container.deleteLater)
@@ -0,0 +1,95 @@
+import threading
+import unittest
+
+from _support import cleanup_test_dir, make_test_dir
+from core.tool_concurrency import (
+    StorageLockTimeout,
+    ToolsStorageLock,
+    get_tools_lock_path,
+    merge_tool_records,
+    read_tools_generation,
+)
+
+
+class MergeToolRecordsTests(unittest.TestCase):
+    def test_each_side_keeps_its_own_changes_and_conflicts_prefer_ours(self):
+        base = [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}, {"id": 3, "name": "C"}, {"id": 4, "name": "D"}]
+        ours = [{"id": 1, "name": "A (ours)"}, {"id": 2, "name": "B"}, {"id": 4, "name": "D (ours)"}]
+        theirs = [
+            {"id": 1, "name": "A"},
+            {"id": 2, "name": "B (theirs)"},
+            {"id": 3, "name": "C"},
+            {"id": 4, "name": "D (theirs)"},
+        ]
+
+        merged, conflicts = merge_tool_records(base, ours, theirs)
+
+        self.assertEqual(
+            [{"id": 1, "name": "A (ours)"}, {"id": 2, "name": "B (theirs)"}, {"id": 4, "name": "D (ours)"}],
+            merged,
+        )
+        self.assertEqual([4], conflicts)
+
+    def test_new_records_with_the_same_id_are_both_kept(self):
+        base = [{"id": 1, "name": "A"}]
+        ours = base + [{"id": 2, "name": "Ours"}]
+        theirs = base + [{"id": 2, "name": "Theirs"}, {"id": 3, "name": "Theirs too"}]
+
+        merged, conflicts = merge_tool_records(base, ours, theirs)
+
+        self.assertEqual(
+            [(1, "A"), (2, "Theirs"), (3, "Theirs too"), (4, "Ours")],
+            [(tool["id"], tool["name"]) for tool in merged],
+        )
+        self.assertEqual([], conflicts)
+
+    def test_reordering_on_our_side_is_preserved(self):
+        base = [{"id": 1}, {"id": 2}, {"id": 3}]
+        ours = [{"id": 3}, {"id": 1}, {"id": 2}]
+        theirs = base + [{"id": 4}]
+
+        merged, _ = merge_tool_records(base, ours, theirs)
+
+        self.assertEqual([3, 1, 2, 4], [tool["id"] for tool in merged])
+
+
+class ToolsStorageLockTests(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = make_test_dir(f"tool_concurrency_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.data_dir))
+
+    def test_lock_is_reentrant_but_excludes_other_holders(self):
+        lock_path = get_tools_lock_path(self.data_dir)
+        first = ToolsStorageLock(lock_path)
+        second = ToolsStorageLock(lock_path, timeout=0.2)
+        errors = []
+
+        def try_second():
+            try:
+                with second:
+                    pass
+            except StorageLockTimeout as e:
+                errors.append(e)
+
+        with first:
+            with first:
+                self.assertTrue(first.is_held)
+            worker = threading.Thread(target=try_second)
+            worker.start()
+            worker.join()
+        self.assertFalse(first.is_held)
+        self.assertEqual(1, len(errors))
+        with second:
+            self.assertTrue(second.is_held)
+
+    def test_generation_is_read_from_the_file_header(self):
+        tools_file = self.data_dir / "tools.json"
+        tools_file.write_text('{\n  "generation": 12,\n  "tools": []\n}', encoding="utf-8")
+        self.assertEqual(12, read_tools_generation(str(tools_file)))
+        tools_file.write_text('{"tools": [], "generation": 3}', encoding="utf-8")
+        self.assertEqual(0, read_tools_generation(str(tools_file)))
+        self.assertEqual(0, read_tools_generation(str(self.data_dir / "missing.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
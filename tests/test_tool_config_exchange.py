@@ -272,6 +272,20 @@ class ToolConfigExchangeTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.exchange.import_native_tools(str(import_path))
 
+    def test_import_native_tools_streams_bare_lists_and_checks_schema_after_the_list(self):
+        tool = {"name": "Listed Tool", "path": "tools/listed.exe", "description": "listed", "type_label": "应用"}
+        list_path = self._write_json("import-list.json", [tool, dict(tool)])
+        foreign_path = self._write_json("import-foreign.json", {"tools": [tool], "schema": "other-schema"})
+
+        result = self.exchange.import_native_tools(str(list_path))
+        with self.assertRaisesRegex(ValueError, "schema"):
+            self.exchange.import_native_tools(str(foreign_path))
+        with self.assertRaises(ValueError):
+            self.exchange.import_native_tools(str(self._write_json("import-empty.json", {"items": []})))
+
+        self.assertEqual((1, 1, 2), (result["imported"], result["skipped"], result["total"]))
+        self.assertEqual(1, sum(item.get("name") == "Listed Tool" for item in self.data_manager.load_tools()))
+
     def test_import_native_tools_raises_when_save_fails(self):
         payload = {
             "schema": "zifeiyu-toolkit-tools",
@@ -0,0 +1,134 @@
+import copy
+import json
+import unittest
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from core.tool_record import ToolDisplayTable, ToolLibraryView, ToolRecord, tool_record_hash
+
+
+class ToolRecordTests(unittest.TestCase):
+    def setUp(self):
+        self.tool = {"id": 3, "name": "Nmap", "description": "scanner", "is_favorite": False}
+
+    def test_display_fields_stay_in_overlay_and_leave_library_record_untouched(self):
+        record = ToolRecord(self.tool)
+        record["_path_status"] = "ok"
+        record["name"] = "Renamed"
+        del record["description"]
+
+        self.assertEqual({"id": 3, "name": "Renamed", "is_favorite": False, "_path_status": "ok"}, dict(record))
+        self.assertEqual({"id": 3, "name": "Nmap", "description": "scanner", "is_favorite": False}, self.tool)
+        self.assertNotIn("description", record)
+        self.assertIsNone(record.get("description"))
+        self.assertEqual(4, len(record))
+        self.assertIsInstance(record, Mapping)
+
+    def test_record_reads_library_changes_and_must_be_materialized_to_serialize(self):
+        record = ToolRecord(self.tool, _search_score=80)
+        self.tool["is_favorite"] = True
+
+        self.assertTrue(record["is_favorite"])
+        # 不是 dict 子类：直接读取 dict 存储的序列化库不会悄悄只写出展示字段
+        self.assertNotIsInstance(record, dict)
+        with self.assertRaises(TypeError):
+            json.dumps(record)
+        self.assertEqual(
+            {"id": 3, "name": "Nmap", "description": "scanner", "is_favorite": True, "_search_score": 80},
+            json.loads(json.dumps(record.to_dict())),
+        )
+        self.assertEqual(record.to_dict(), {**record})
+        self.assertIs(type(copy.deepcopy(record)), dict)
+
+    @unittest.skipIf(orjson is None, "orjson 未安装")
+    def test_orjson_rejects_records_instead_of_dropping_base_fields(self):
+        record = ToolRecord({"id": 1, "name": "x"}, _s=1)
+
+        with self.assertRaises(TypeError):
+            orjson.dumps(record)
+        self.assertEqual({"id": 1, "name": "x", "_s": 1}, orjson.loads(orjson.dumps(record.to_dict())))
+
+    def test_wrapping_a_record_shares_the_original_instead_of_nesting(self):
+        first = ToolRecord(self.tool, _display_description="recent")
+        second = ToolRecord(first)
+        second["_icon_cache_key"] = "icon"
+
+        self.assertIs(self.tool, second.base)
+        self.assertEqual("recent", second["_display_description"])
+        self.assertNotIn("_icon_cache_key", first)
+        self.assertEqual(first, {**self.tool, "_display_description": "recent"})
+
+    def test_record_hash_ignores_field_order_but_not_value_types_or_placement(self):
+        reordered = dict(reversed(list(self.tool.items())))
+
+        self.assertEqual(tool_record_hash(self.tool), tool_record_hash(reordered))
+        self.assertLess(tool_record_hash(self.tool), 1 << 128)
+        # hash(-1) == hash(-2)：摘要不能建立在内置 hash() 上
+        self.assertNotEqual(tool_record_hash({**self.tool, "id": -1}), tool_record_hash({**self.tool, "id": -2}))
+        self.assertNotEqual(tool_record_hash({**self.tool, "id": 1}), tool_record_hash({**self.tool, "id": True}))
+        self.assertNotEqual(tool_record_hash({"a": "1", "b": "2"}), tool_record_hash({"a": "2", "b": "1"}))
+        self.assertNotEqual(tool_record_hash({"tags": ["a", "b"]}), tool_record_hash({"tags": ["b", "a"]}))
+        self.assertEqual(tool_record_hash(self.tool), tool_record_hash(ToolRecord(self.tool)))
+
+
+class ToolDisplayTableTests(unittest.TestCase):
+    def test_unchanged_records_reuse_their_view_and_display_fields(self):
+        table = ToolDisplayTable()
+        tool = {"id": 1, "name": "nmap"}
+        record = table.record(tool)
+        record["_path_status"] = "available"
+
+        self.assertIs(record, table.record(tool))
+        self.assertEqual("available", table.record(tool)["_path_status"])
+        self.assertNotIn("_path_status", tool)
+
+        replaced = {**tool, "name": "nmap (edited)"}
+        fresh = table.record(replaced)
+        self.assertIsNot(record, fresh)
+        self.assertNotIn("_path_status", fresh)
+        self.assertEqual("nmap (edited)", fresh["name"])
+
+    def test_prepared_views_and_records_without_id_are_not_shared(self):
+        table = ToolDisplayTable()
+        search_hit = ToolRecord({"id": 1, "name": "nmap"}, _search_score=90)
+        anonymous = {"name": "draft"}
+
+        self.assertIsNot(table.record(search_hit), table.record(search_hit))
+        self.assertEqual(90, table.record(search_hit)["_search_score"])
+        self.assertIsNot(table.record(anonymous), table.record(anonymous))
+
+
+class ToolLibraryViewTests(unittest.TestCase):
+    def test_with_changes_shares_untouched_chunks_and_matches_a_full_rebuild(self):
+        chunk_size = ToolLibraryView.CHUNK_SIZE
+        tools = [{"id": tool_id} for tool_id in range(chunk_size * 2 + 3)]
+        view = ToolLibraryView(tools, 1)
+
+        tools[chunk_size + 5] = {"id": "changed"}
+        tools.extend({"id": f"new-{n}"} for n in range(chunk_size))
+        updated = view.with_changes(tools, {chunk_size + 5}, 2)
+
+        self.assertEqual(list(ToolLibraryView(tools, 2)), list(updated))
+        self.assertIs(view._chunks[0], updated._chunks[0])
+        self.assertEqual(chunk_size * 2 + 3, len(view))
+        self.assertEqual({"id": chunk_size + 5}, view[chunk_size + 5])
+        self.assertEqual({"id": "changed"}, updated[chunk_size + 5])
+        self.assertEqual(tools[-1], updated[-1])
+        self.assertEqual(tuple(tools[1:4]), updated[1:4])
+        with self.assertRaises(IndexError):
+            updated[len(tools)]
+
+    def test_with_changes_rebuilds_when_the_list_shrinks(self):
+        tools = [{"id": tool_id} for tool_id in range(5)]
+        view = ToolLibraryView(tools, 1)
+        del tools[0]
+
+        self.assertEqual(tools, list(view.with_changes(tools, (), 2)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from core.pinyin_index import PINYIN_MATCH_BOUNDARY, PINYIN_MATCH_EXACT, build_pinyin_keys
+from core.tool_search_index import ToolSearchIndex
+
+
+class ToolSearchIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tools = [
+            {"id": 1, "name": "Nmap", "description": "Network scanner"},
+            {"id": 2, "name": "SQLMap", "description": "SQL injection helper"},
+            {"id": 3, "name": "Dirsearch", "description": "Web path scanner"},
+            {"id": 4, "name": "一键扫描", "description": "端口扫描工具"},
+        ]
+        self.index = ToolSearchIndex(self.tools)
+
+    def _candidate_ids(self, query):
+        return [entry["tool"]["id"] for entry in self.index.substring_candidates(query)]
+
+    def test_substring_candidates_cover_every_name_or_description_match(self):
+        for query in ("scanner", "map", "扫描", "sql inj", "path scan", "zzz", "a", "ne"):
+            expected = [
+                tool["id"] for tool in self.tools
+                if query in tool["name"].lower() or query in tool["description"].lower()
+            ]
+            candidates = self._candidate_ids(query)
+            self.assertTrue(set(expected) <= set(candidates), query)
+            if len(query) >= 3 and query.isascii():
+                self.assertEqual(expected, candidates, query)
+
+    def test_fuzzy_tokens_keep_every_token_that_can_reach_the_ratio(self):
+        tokens = set(self.index.fuzzy_tokens("nmpa", 0.6))
+
+        self.assertIn("nmap", tokens)
+        self.assertNotIn("helper", tokens)
+        self.assertEqual([2], [entry["tool"]["id"] for entry in self.index.entries_for_tokens(["sqlmap"])])
+
+    def test_sync_reindexes_only_changed_records_and_drops_removed_ones(self):
+        favorite = dict(self.tools[0], is_favorite=True)
+        renamed = dict(self.tools[1], name="Ghauri")
+        added = self.index.sync([favorite, renamed, self.tools[3], {"id": 5, "name": "Gobuster", "description": ""}])
+
+        self.assertEqual(2, added)
+        self.assertEqual([1, 2, 4, 5], [entry["tool"]["id"] for entry in self.index])
+        self.assertIs(favorite, self.index[0]["tool"])
+        self.assertEqual([], self._candidate_ids("sqlmap"))
+        self.assertEqual([], self._candidate_ids("dirsearch"))
+        self.assertEqual([2], self._candidate_ids("ghauri"))
+        self.assertEqual([5], [entry["tool"]["id"] for entry in self.index.entries_for_tokens(["gobuster"])])
+
+    def test_pinyin_matches_return_only_live_entries_with_their_match_level(self):
+        syllables = {"一键扫描": ("yi", "jian", "sao", "miao"), "扫描器": ("sao", "miao", "qi")}
+
+        def pinyin(name):
+            return build_pinyin_keys(syllables[name]) if name in syllables else None
+
+        index = ToolSearchIndex(self.tools, pinyin=pinyin)
+        self.assertEqual(
+            [(4, PINYIN_MATCH_BOUNDARY)],
+            [(entry["tool"]["id"], level) for entry, level in index.pinyin_matches("sm")],
+        )
+
+        index.sync(self.tools[:3] + [dict(self.tools[3], name="扫描器")])
+
+        self.assertEqual([], index.pinyin_matches("yjsm"))
+        self.assertEqual(
+            [(4, PINYIN_MATCH_EXACT)],
+            [(entry["tool"]["id"], level) for entry, level in index.pinyin_matches("smq")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from _support import cleanup_test_dir, make_test_dir
+from core.data_manager import DataManager
+from core.tool_storage_sqlite import SqliteToolStore
+
+
+class SqliteStorageBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.config_dir = make_test_dir(f"sqlite_storage_{self._testMethodName}")
+        self.addCleanup(lambda: cleanup_test_dir(self.config_dir))
+
+    def _seed_json_library(self):
+        data_manager = DataManager(config_dir=str(self.config_dir), storage_backend="json")
+        categories = [
+            {
+                "id": 1,
+                "name": "分类一",
+                "priority": 1,
+                "subcategories": [{"id": 101, "name": "子分类一", "priority": 1}],
+            },
+            {"id": 2, "name": "分类二", "priority": 2, "subcategories": []},
+        ]
+        tools = [
+            {
+                "id": 1,
+                "name": "Nmap",
+                "path": "tools/nmap.exe",
+                "description": "Port scanner",
+                "category_id": 1,
+                "subcategory_id": 101,
+                "tags": ["legacy"],
+                "is_favorite": True,
+            },
+            {
+                "id": 2,
+                "name": "Burp",
+                "path": "tools/burp.exe",
+                "description": "Web proxy 100%",
+                "category_id": 2,
+                "subcategory_id": None,
+                "is_favorite": False,
+            },
+            {
+                "id": 3,
+                "name": "Masscan",
+                "path": "tools/masscan.exe",
+                "description": "fast port scan",
+                "category_id": 1,
+                "subcategory_id": None,
+                "is_favorite": False,
+            },
+        ]
+        self.assertTrue(data_manager.save_categories(categories))
+        self.assertTrue(data_manager.save_tools(tools))
+        self.assertTrue(data_manager.toggle_favorite(3))
+        return data_manager
+
+    def _open_sqlite_manager(self):
+        data_manager = DataManager(config_dir=str(self.config_dir), storage_backend="sqlite")
+        self.addCleanup(data_manager.close_storage)
+        return data_manager
+
+    def test_settings_ini_selects_sqlite_backend_and_migrates_json_once(self):
+        self._seed_json_library()
+        (self.config_dir / "settings.ini").write_text("[data]\nstorage_backend=sqlite\n", encoding="utf-8")
+
+        data_manager = DataManager(config_dir=str(self.config_dir))
+        self.addCleanup(data_manager.close_storage)
+
+        self.assertEqual("sqlite", data_manager.storage_backend)
+        self.assertTrue((Path(data_manager.data_dir) / "tools.sqlite3").exists())
+        tools = data_manager.load_tools()
+        self.assertEqual([1, 2, 3], [tool["id"] for tool in tools])
+        self.assertNotIn("tags", tools[0])
+        self.assertTrue(tools[2]["is_favorite"])
+        self.assertEqual(["分类一", "分类二"], [category["name"] for category in data_manager.load_categories()])
+
+        Path(data_manager.tools_file).write_text(json.dumps({"tools": []}), encoding="utf-8")
+        data_manager.close_storage()
+        reopened = self._open_sqlite_manager()
+
+        self.assertEqual([1, 2, 3], [tool["id"] for tool in reopened.load_tools()])
+
+    def test_queries_return_cached_records_in_library_order(self):
+        self._seed_json_library()
+        data_manager = self._open_sqlite_manager()
+        tools = data_manager.load_tools()
+
+        self.assertIs(tools[1], data_manager.get_tool_by_id(2))
+        self.assertIsNone(data_manager.get_tool_by_id(99))
+        self.assertEqual([1, 3], [tool["id"] for tool in data_manager.get_tools_by_category(1)])
+        self.assertEqual([1], [tool["id"] for tool in data_manager.get_tools_by_category(1, 101)])
+        self.assertEqual([1, 3], [tool["id"] for tool in data_manager.get_favorite_tools()])
+        self.assertEqual([1, 3], [tool["id"] for tool in data_manager.search_tools("PORT")])
+        self.assertEqual([2], [tool["id"] for tool in data_manager.search_tools("100%")])
+        self.assertEqual([], data_manager.search_tools("_"))
+
+    def test_mutations_persist_to_sqlite_without_touching_json_files(self):
+        self._seed_json_library()
+        data_manager = self._open_sqlite_manager()
+        tools_file = Path(data_manager.tools_file)
+        original_payload = tools_file.read_bytes()
+
+        self.assertTrue(data_manager.toggle_favorite(2))
+        self.assertTrue(data_manager.update_tool_background(1, "bg.png"))
+        self.assertTrue(data_manager.add_tool({"name": "Added", "path": "tools/added.exe", "category_id": 2}))
+        self.assertEqual({"success": True, "requested": 1, "deleted": 1, "remaining": 3}, data_manager.delete_tools([3]))
+
+        self.assertEqual(original_payload, tools_file.read_bytes())
+        reopened = self._open_sqlite_manager()
+        reopened_tools = reopened.load_tools()
+        self.assertEqual([1, 2, 4], [tool["id"] for tool in reopened_tools])
+        self.assertEqual("bg.png", reopened_tools[0]["background_image"])
+        self.assertEqual([1, 2], [tool["id"] for tool in reopened.get_favorite_tools()])
+        self.assertEqual([2, 4], [tool["id"] for tool in reopened.get_tools_by_category(2)])
+
+    def test_transaction_commits_tools_and_categories_together(self):
+        self._seed_json_library()
+        data_manager = self._open_sqlite_manager()
+        store = data_manager.sqlite_store
+
+        with patch.object(store, "save_tools", wraps=store.save_tools) as save_tools:
+            with data_manager.transaction():
+                self.assertTrue(data_manager.add_category({"name": "分类三"}))
+                self.assertTrue(data_manager.toggle_favorite(2))
+                self.assertTrue(data_manager.reorder_tools([2, 1, 3]))
+
+        save_tools.assert_not_called()
+        reopened = self._open_sqlite_manager()
+        self.assertEqual([2, 1, 3], [tool["id"] for tool in reopened.load_tools()])
+        self.assertTrue(reopened.get_tool_by_id(2)["is_favorite"])
+        self.assertEqual("分类三", reopened.load_categories()[-1]["name"])
+
+    def test_store_generation_changes_on_every_write(self):
+        store = SqliteToolStore(self.config_dir / "data" / "store.sqlite3")
+        self.addCleanup(store.close)
+        first = store.tools_state_token()
+
+        store.save_tools([{"id": 1, "name": "One"}])
+        second = store.tools_state_token()
+        store.upsert_tools([{"id": 1, "name": "Uno"}, {"id": 2, "name": "Two"}])
+        third = store.tools_state_token()
+
+        self.assertEqual(3, len({first, second, third}))
+        self.assertEqual(["Uno", "Two"], [tool["name"] for tool in store.load_tools()])
+
+
+if __name__ == "__main__":
+    unittest.main()
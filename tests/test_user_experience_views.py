@@ -11,7 +11,9 @@ from PyQt5.QtWidgets import QApplication, QListView, QScrollArea
 
 from _support import cleanup_test_dir, make_test_dir
 from core.data_manager import DataManager
+from core.pinyin_index import pinyin_available
 from core.style_manager import ThemeManager
+from core.tool_record import ToolLibraryView
 from ui.data_health_dialog import DataHealthDialog
 from ui.record_list_model import RecordListModel
 from ui.main_window_search_mixin import MainWindowSearchMixin
@@ -60,6 +62,10 @@ class UserExperienceViewTests(unittest.TestCase):
         self.assertEqual([2], dialog.visible_tool_ids)
         self.assertEqual({1, 2}, dialog.checked_tool_ids)
 
+        dialog.accept_selected_tools(dialog.ACTION_FAVORITE)
+        self.assertEqual([1, 2], dialog.get_selected_tool_ids())
+        self.assertEqual((dialog.ACTION_FAVORITE, None), dialog.get_selected_action())
+
     def test_data_health_dialog_shows_runtime_data_dir_and_split_rebuild_state(self):
         config_dir = make_test_dir(f"data_health_dialog_{self._testMethodName}")
         self.addCleanup(lambda: cleanup_test_dir(config_dir))
@@ -182,11 +188,11 @@ class UserExperienceViewTests(unittest.TestCase):
     def test_search_direct_hits_skip_expensive_fuzzy_scoring(self):
         search = MainWindowSearchMixin()
 
-        with patch("ui.main_window_search_mixin.difflib.SequenceMatcher") as sequence_matcher:
+        with patch("ui.main_window_search_mixin.FuzzyMatcher") as fuzzy_matcher:
             self.assertEqual(104, search._score_tool_match_text("bravo suite", "global result", "bravo"))
             self.assertEqual(68, search._score_tool_match_text("alpha scanner", "bravo global result", "bravo"))
 
-        sequence_matcher.assert_not_called()
+        fuzzy_matcher.assert_not_called()
 
     def test_search_index_prebuilds_fuzzy_candidates(self):
         class SearchHarness(MainWindowSearchMixin):
@@ -207,6 +213,76 @@ class UserExperienceViewTests(unittest.TestCase):
         self.assertIn("directory scanner", index[0]["fuzzy_candidates"])
         self.assertIn("dirsearch", index[0]["fuzzy_candidates"])
 
+    def test_search_index_candidates_score_like_a_full_scan(self):
+        tools = [
+            {"id": 1, "name": "Nmap", "description": "network scanner"},
+            {"id": 2, "name": "Masscan", "description": "fast port scanner"},
+            {"id": 3, "name": "Dirsearch", "description": "web path brute force"},
+            {"id": 4, "name": "SQLMap", "description": "sql injection"},
+        ]
+
+        class SearchHarness(MainWindowSearchMixin):
+            def _get_search_scope_tools(self):
+                return ToolLibraryView(tools, 1)
+
+        search = SearchHarness()
+        index = search._get_tool_search_index()
+        for query in ("scanner", "nmpa", "dirsaerch", "sqlmp", "map", "zz"):
+            expected = {
+                entry["tool"]["id"]: score
+                for entry in index
+                for score in [search._score_tool_match_text(
+                    entry["name"], entry["description"], query, entry["fuzzy_candidates"]
+                )]
+                if score > 0
+            }
+            matched = {entry["tool"]["id"]: score for entry, score in search._match_search_index(index, query)}
+            self.assertEqual(expected, matched, query)
+        self.assertIs(index, search._get_tool_search_index())
+
+    @unittest.skipUnless(pinyin_available(), "pypinyin 未安装")
+    def test_search_matches_chinese_names_by_pinyin_with_name_score_tiers(self):
+        tools = [
+            {"id": 1, "name": "一键扫描", "description": "端口探测"},
+            {"id": 2, "name": "Burp 抓包", "description": ""},
+            {"id": 3, "name": "yjs helper", "description": ""},
+        ]
+
+        class SearchHarness(MainWindowSearchMixin):
+            def _get_search_scope_tools(self):
+                return ToolLibraryView(tools, 1)
+
+        search = SearchHarness()
+        index = search._get_tool_search_index()
+
+        def scores(query):
+            return {entry["tool"]["id"]: score for entry, score in search._match_search_index(index, query)}
+
+        self.assertEqual({1: 120, 3: 64}, scores("yjsm"))
+        self.assertEqual({1: 104, 3: 104}, scores("yjs"))
+        self.assertEqual({1: 104}, scores("yi jian"))
+        self.assertEqual({1: 92}, scores("saomiao"))
+        self.assertEqual({2: 92}, scores("zb"))
+        self.assertEqual({}, scores("z"))
+
+    @unittest.skipUnless(pinyin_available(), "pypinyin 未安装")
+    def test_bulk_tool_dialog_filters_names_and_categories_by_pinyin(self):
+        dialog = ToolBulkDeleteDialog(
+            [
+                {"id": 1, "name": "一键扫描", "category_id": 1},
+                {"id": 2, "name": "Nmap", "category_id": 2},
+            ],
+            [{"id": 1, "name": "信息收集"}, {"id": 2, "name": "漏洞扫描"}],
+        )
+        self.addCleanup(dialog.deleteLater)
+
+        dialog.search_input.setText("yjsm")
+        self.assertEqual([1], dialog.visible_tool_ids)
+        dialog.search_input.setText("loudong")
+        self.assertEqual([2], dialog.visible_tool_ids)
+        dialog.search_input.setText("saomiao")
+        self.assertEqual([1, 2], dialog.visible_tool_ids)
+
     def test_theme_manager_exposes_shared_experience_styles(self):
         manager = ThemeManager()
 
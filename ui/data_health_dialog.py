@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """Data health result dialog."""
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
     QAbstractItemView,
     QComboBox,
@@ -19,6 +19,7 @@ from ui.record_list_model import RECORD_ROLE, RecordListDelegate, RecordListMode
 
 
 class DataHealthDialog(QDialog):
+    LIVE_REFRESH_INTERVAL_MS = 1500
     ISSUE_LABELS = {
         'all': '全部问题',
         'split_mismatch': '数据镜像',
@@ -37,12 +38,18 @@ class DataHealthDialog(QDialog):
         self.theme_name = getattr(parent, 'current_theme', 'dark_green') if parent is not None else 'dark_green'
         self.audit_result = {'issues': [], 'counts': {}, 'total_tools': 0, 'total_issues': 0}
         self.selected_tool_id = None
+        self._audited_data_state = None
         self.setWindowTitle('工具数据体检')
         self.setMinimumSize(780, 560)
         self._init_ui()
         self._apply_theme_styles()
         self.refresh_results()
 
+        # 对话框打开期间工具数据在外部发生变化时自动重新体检；未变化的工具使用缓存结果
+        self._live_refresh_timer = QTimer(self)
+        self._live_refresh_timer.setInterval(self.LIVE_REFRESH_INTERVAL_MS)
+        self._live_refresh_timer.timeout.connect(self._refresh_if_data_changed)
+
     def _init_ui(self):
         layout = QVBoxLayout(self)
 
@@ -113,7 +120,31 @@ class DataHealthDialog(QDialog):
         tool_id = issue.get('tool_id')
         return f"{tool_name}  [ID {tool_id}]\n{title} | {category_name}\n{message}"
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._live_refresh_timer.start()
+
+    def hideEvent(self, event):
+        self._live_refresh_timer.stop()
+        super().hideEvent(event)
+
+    def _current_data_state(self):
+        get_tools_view = getattr(self.data_manager, 'get_tools_view', None)
+        if get_tools_view is None:
+            return None
+        return (get_tools_view().version, self.data_manager.get_category_index().version)
+
+    def _refresh_if_data_changed(self):
+        data_state = self._current_data_state()
+        if data_state is None or data_state == self._audited_data_state:
+            return
+        current_row = self.list_view.currentIndex().row()
+        self.refresh_results()
+        if 0 <= current_row < self.list_model.rowCount():
+            self.list_view.setCurrentIndex(self.list_model.index(current_row, 0))
+
     def refresh_results(self):
+        self._audited_data_state = self._current_data_state()
         self.audit_result = self.data_manager.audit_tools_data() or {'issues': [], 'counts': {}, 'total_tools': 0, 'total_issues': 0}
         total_tools = self.audit_result.get('total_tools', 0)
         total_issues = self.audit_result.get('total_issues', 0)
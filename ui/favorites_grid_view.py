@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """独立的收藏页网格视图。"""
 import os
+from collections.abc import Mapping
 from time import monotonic
 
 from PyQt5.QtCore import Qt, QSize, QPoint, pyqtSignal, QEvent, QTimer, QMimeData
@@ -25,6 +26,7 @@ from PyQt5.QtWidgets import (
 from core.runtime_paths import get_runtime_state_root
 from core.style_manager import ThemeManager
 from core.tool_metadata import infer_display_tool_type_label
+from core.tool_record import ToolRecord
 
 try:
     from ui.markdown_note_dialog import MarkdownNoteDialog
@@ -49,9 +51,9 @@ FAVORITE_TOOL_MIME_TYPE = "application/vnd.zifeiyu.favorite-tool-id"
 
 
 class FavoriteToolCard(QFrame):
-    clicked = pyqtSignal(dict)
-    button_clicked = pyqtSignal(dict, int)
-    context_menu_requested = pyqtSignal(dict, QPoint)
+    clicked = pyqtSignal(object)
+    button_clicked = pyqtSignal(object, int)
+    context_menu_requested = pyqtSignal(object, QPoint)
     CARD_HEIGHT = 116
     ICON_SIZE = 46
 
@@ -603,8 +605,8 @@ class FavoriteToolCard(QFrame):
 
 
 class LegacyFavoritesGridContainer(ToolCardActionsMixin, QWidget):
-    run_tool = pyqtSignal(dict)
-    edit_requested = pyqtSignal(dict)
+    run_tool = pyqtSignal(object)
+    edit_requested = pyqtSignal(object)
     deleted = pyqtSignal(int)
     toggle_favorite = pyqtSignal(int)
     tool_order_changed = pyqtSignal(list)
@@ -910,10 +912,10 @@ class LegacyFavoritesGridContainer(ToolCardActionsMixin, QWidget):
         )
 
     def _prepare_tool_for_display(self, tool, base_dir):
-        if not isinstance(tool, dict):
+        if not isinstance(tool, Mapping):
             return tool
 
-        prepared_tool = dict(tool)
+        prepared_tool = ToolRecord(tool)
         prepared_tool["_display_type_label"] = self._get_cached_metadata_value(
             self._type_label_cache,
             self._type_label_cache_key(prepared_tool, base_dir),
@@ -1261,6 +1263,7 @@ class LegacyFavoritesGridContainer(ToolCardActionsMixin, QWidget):
             repo_root=repo_root,
             parent=self,
             theme_name=getattr(self, 'current_theme', None),
+            notes_manager=getattr(self.window(), 'notes_manager', None),
         )
         dialog.exec_()
         window = self.window()
@@ -1,5 +1,6 @@
 import hashlib
 import os
+from collections.abc import Mapping
 from pathlib import Path
 
 from PyQt5.QtCore import QFileInfo, QObject, QRunnable, QSize, QThreadPool, QTimer, QCoreApplication, pyqtSignal
@@ -85,13 +86,13 @@ def resolve_icon_path(path):
 
 
 def _normalize_tool_icon_value(tool):
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return ""
     return str(tool.get('icon') or tool.get('icon_path') or '').strip()
 
 
 def _resolve_tool_executable_path(tool):
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return None
     if bool(tool.get('is_web_tool', False)):
         return None
@@ -110,7 +111,7 @@ def _resolve_tool_executable_path(tool):
 
 
 def _looks_like_executable_tool_path(tool):
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return False
     if bool(tool.get('is_web_tool', False)):
         return False
@@ -164,7 +165,7 @@ def _build_executable_icon_cache_path_from_text(path_text):
 
 
 def _get_precomputed_icon_cache_key(tool, theme_name=None):
-    if not isinstance(tool, dict):
+    if not isinstance(tool, Mapping):
         return ""
 
     cached_theme = str(tool.get("_icon_cache_theme", "") or "").strip()
@@ -210,7 +211,7 @@ def _resolve_tool_icon_cache_key(tool, theme_name=None):
 
 def get_icon_cache_key(path, theme_name=None):
     """Return a normalized cache key for icon lookups."""
-    if isinstance(path, dict):
+    if isinstance(path, Mapping):
         return _resolve_tool_icon_cache_key(path, theme_name=theme_name)
 
     if _is_adaptive_default_icon_value(path):
@@ -366,7 +367,7 @@ class AsyncIconLoader(QObject):
         return icon
 
     def get_icon(self, path, theme_name=None):
-        if isinstance(path, dict):
+        if isinstance(path, Mapping):
             dynamic_icon_key = _get_precomputed_icon_cache_key(path, theme_name=theme_name)
             if not dynamic_icon_key:
                 dynamic_icon_key = get_icon_cache_key(path, theme_name=theme_name)
@@ -382,7 +383,7 @@ class AsyncIconLoader(QObject):
         return self._get_icon_from_path(get_icon_cache_key(path, theme_name=theme_name), theme_name=theme_name)
 
     def warm_tool_icon(self, tool, theme_name=None):
-        if not isinstance(tool, dict):
+        if not isinstance(tool, Mapping):
             return
 
         icon_key = _get_precomputed_icon_cache_key(tool, theme_name=theme_name)
@@ -391,7 +392,7 @@ class AsyncIconLoader(QObject):
         self._queue_auto_icon_resolution(tool, icon_key)
 
     def _queue_auto_icon_resolution(self, tool, icon_key):
-        if not isinstance(tool, dict):
+        if not isinstance(tool, Mapping):
             return
 
         if _looks_like_executable_icon_cache_path(icon_key) and not os.path.exists(icon_key):
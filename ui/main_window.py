@@ -34,6 +34,7 @@ from core.task_control import OperationCancelledError
 from core.notes_manager import NotesManager
 from core.tool_config_exchange import ToolConfigExchangeService
 from core.tool_launch_service import ToolLaunchService
+from core.tool_record import ToolLibraryView
 from core.update_service import UpdateService
 from core.ui_scale import metrics_for_geometry, preferred_main_window_geometry, scaled
 from core.version import get_version
@@ -42,7 +43,12 @@ from ui.subcategory_view import SubcategoryView
 from ui.tool_model_view import ToolCardContainer
 from ui.image_selector import ImageSelectorDialog
 from ui.icon_loader import icon_loader
-from ui.tool_bulk_delete_dialog import ToolBulkDeleteDialog
+from ui.tool_bulk_delete_dialog import (
+    BULK_ACTION_DELETE,
+    BULK_ACTION_FAVORITE,
+    BULK_ACTION_MOVE,
+    ToolBulkDeleteDialog,
+)
 from ui.tool_config_dialog import ToolConfigDialog
 from ui.notes_list_dialog import NotesListDialog
 from ui.data_health_dialog import DataHealthDialog
@@ -82,8 +88,9 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
 
         # 初始化管理器
         self.data_manager = DataManager(config_dir=self.config_dir)
+        self.data_manager.enable_file_watch()
         self._image_manager = None
-        self.notes_manager = NotesManager(repo_root=self.config_dir)
+        self.notes_manager = NotesManager(repo_root=self.config_dir, data_manager=self.data_manager)
         self.tool_launcher = ToolLaunchService()
         self.tool_config_exchange = ToolConfigExchangeService(self.data_manager)
         self.import_controller = ImportController(self)
@@ -134,6 +141,11 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         self.usage_flush_timer = QTimer(self)
         self.usage_flush_timer.setSingleShot(True)
         self.usage_flush_timer.timeout.connect(self._flush_pending_usage_updates)
+
+        self.journal_compact_interval_ms = 30000
+        self.journal_compact_timer = QTimer(self)
+        self.journal_compact_timer.setSingleShot(True)
+        self.journal_compact_timer.timeout.connect(self._compact_tools_journal)
         self._background_tasks = {}
         self._background_idle_callbacks = []
         self._close_after_background_tasks = False
@@ -243,7 +255,7 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         self.view_runtime_log_action = QAction("查看运行日志", self)
         self.view_runtime_log_action.triggered.connect(self.on_show_runtime_log)
 
-        self.batch_delete_tools_action = QAction("批量删除工具", self)
+        self.batch_delete_tools_action = QAction("批量管理工具", self)
         self.batch_delete_tools_action.triggered.connect(self.on_batch_delete_tools)
 
         self.delete_all_tools_action = QAction("删除全部工具", self)
@@ -588,8 +600,8 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         self.category_info_label.setText("首页工作台")
         self.view_mode_label.setText("视图: 首页")
         if tools is None:
-            tools = self.data_manager.load_tools()
-        self._startup_tools_snapshot = list(tools or [])
+            tools = self.data_manager.get_tools_view()
+        self._startup_tools_snapshot = tools if isinstance(tools, ToolLibraryView) else list(tools or [])
         if hasattr(self, "dashboard_container"):
             self.dashboard_container.display_tools(tools)
         self.refresh_tool_count()
@@ -1001,6 +1013,7 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
             # 保存工具
             new_tool = self.data_manager.add_tool(tool_data)
             if new_tool:
+                self._schedule_journal_compaction()
                 self._notify_success("工具创建成功")
                 # 刷新当前视图
                 self.refresh_current_view()
@@ -1207,15 +1220,16 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         )
 
     def on_batch_delete_tools(self):
-        """批量删除选中的工具配置。"""
+        """批量删除、收藏或移动选中的工具配置。"""
         tools = self.data_manager.load_tools()
         if not tools:
-            self._notify_info("无可删除工具", "当前工具库中没有可删除的工具")
+            self._notify_info("无可管理工具", "当前工具库中没有工具")
             return
 
+        category_index = self.data_manager.get_category_index()
         dialog = ToolBulkDeleteDialog(
             tools,
-            self.data_manager.load_categories(),
+            category_index,
             theme_name=self.current_theme,
             parent=self,
         )
@@ -1226,6 +1240,11 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         if not selected_ids:
             return
 
+        action, target = dialog.get_selected_action()
+        if action != BULK_ACTION_DELETE:
+            self._apply_bulk_tool_edit(selected_ids, action, target, category_index)
+            return
+
         selected_id_set = set(selected_ids)
         preview_names = [
             str(tool.get("name") or "").strip()
@@ -1253,6 +1272,26 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
             f"已删除 {result.get('deleted', 0)} 个工具，剩余 {result.get('remaining', 0)} 个",
         )
 
+    def _apply_bulk_tool_edit(self, tool_ids, action, target, category_index):
+        """批量收藏 / 取消收藏 / 移动分类，一次写入后刷新界面。"""
+        if action == BULK_ACTION_MOVE:
+            category_id, subcategory_id = target
+            result = self.data_manager.move_tools_to_category(tool_ids, category_id, subcategory_id)
+            target_label = category_index.labels.get((category_id, subcategory_id), "")
+            title, message = "移动完成", f"已将 {result.get('updated', 0)} 个工具移动到 {target_label}"
+        else:
+            is_favorite = action == BULK_ACTION_FAVORITE
+            result = self.data_manager.set_favorites(tool_ids, is_favorite)
+            title = "收藏完成" if is_favorite else "取消收藏完成"
+            message = f"已更新 {result.get('updated', 0)} 个工具"
+
+        if not result.get("success"):
+            QMessageBox.warning(self, "修改失败", "批量修改工具失败。")
+            return
+
+        self.refresh_all()
+        self._notify_success(title, message)
+
     def on_delete_all_tools(self):
         """删除当前工具库中的全部工具。"""
         tools = self.data_manager.load_tools()
@@ -1532,6 +1571,7 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
             
             # 更新工具
             if self.data_manager.update_tool(updated_tool['id'], updated_tool):
+                self._schedule_journal_compaction()
                 self._notify_success("工具更新成功")
                 self.refresh_current_view()
             else:
@@ -1606,7 +1646,8 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
     def on_toggle_favorite(self, tool_id):
         """切换收藏状态"""
         if tool_id:
-            self.data_manager.toggle_favorite(tool_id)
+            if self.data_manager.toggle_favorite(tool_id):
+                self._schedule_journal_compaction()
             self.refresh_current_view()
 
     def on_tool_order_changed(self, ordered_tool_ids):
@@ -1630,6 +1671,7 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
             selected_image = dialog.get_selected_image()
             tool["background_image"] = selected_image
             if self.data_manager.update_tool(tool_id, tool):
+                self._schedule_journal_compaction()
                 self.refresh_current_view()
     
     def on_delete_tool(self, tool_id):
@@ -1749,7 +1791,12 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
     
     def on_show_notes(self):
         """打开笔记列表。"""
-        dialog = NotesListDialog(repo_root=self.config_dir, theme_name=self.current_theme, parent=self)
+        dialog = NotesListDialog(
+            repo_root=self.config_dir,
+            theme_name=self.current_theme,
+            parent=self,
+            notes_manager=self.notes_manager,
+        )
         dialog.exec_()
         self.refresh_current_view()
 
@@ -1884,6 +1931,17 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         except Exception as e:
             logger.warning("写回工具使用统计失败: %s", str(e))
 
+    def _schedule_journal_compaction(self):
+        """空闲一段时间后把工具变更日志合并回 tools.json。"""
+        if hasattr(self, "journal_compact_timer"):
+            self.journal_compact_timer.start(self.journal_compact_interval_ms)
+
+    def _compact_tools_journal(self):
+        try:
+            self.data_manager.compact_tools_journal()
+        except Exception as e:
+            logger.warning("压缩工具变更日志失败: %s", str(e))
+
     def closeEvent(self, event):
         """在主窗口退出前清理后台 Qt 资源。"""
         if self._has_active_background_task():
@@ -1903,6 +1961,8 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         try:
             if hasattr(self, 'usage_flush_timer'):
                 self.usage_flush_timer.stop()
+            if hasattr(self, 'journal_compact_timer'):
+                self.journal_compact_timer.stop()
             self._flush_pending_usage_updates()
         except Exception as e:
             logger.warning("关闭前写回工具使用统计失败: %s", str(e))
@@ -1913,6 +1973,12 @@ class MainWindow(MainWindowViewMixin, MainWindowNavigationMixin, MainWindowSearc
         except Exception as e:
             logger.warning("关闭数据加载线程失败: %s", str(e))
 
+        try:
+            if hasattr(self, 'notes_manager') and self.notes_manager is not None:
+                self.notes_manager.close()
+        except Exception as e:
+            logger.warning("关闭笔记索引失败: %s", str(e))
+
         try:
             self._stop_background_tasks()
         except Exception as e:
@@ -47,10 +47,18 @@ class RuntimeBackupController:
     def get_default_backup_path(self):
         return self.service().get_default_backup_path()
 
+    def _release_data_storage(self):
+        data_manager = getattr(self.window, "data_manager", None)
+        close_storage = getattr(data_manager, "close_storage", None)
+        if callable(close_storage):
+            close_storage()
+
     def create_backup(self, file_path):
+        self._release_data_storage()
         return self.service().create_backup(file_path)
 
     def restore_backup(self, file_path):
+        self._release_data_storage()
         return self.service().restore_backup(file_path)
 
 
@@ -76,11 +76,11 @@ class MainWindowNavigationMixin:
 
         if self.is_in_favorites:
             self.is_in_favorites = False
-            self.show_dashboard(self.data_manager.load_tools())
+            self.show_dashboard(self.data_manager.get_tools_view())
             return
 
         if getattr(self, "current_view_mode", "") == "dashboard":
-            self.show_dashboard(self.data_manager.load_tools())
+            self.show_dashboard(self.data_manager.get_tools_view())
             return
 
         current_category = getattr(self.category_view, "current_category", None) or getattr(self, "current_category", None)
@@ -1,8 +1,23 @@
-import difflib
-import re
-
-
-_SEARCH_TOKEN_RE = re.compile(r"[\w\u4e00-\u9fff]+", re.UNICODE)
+from collections.abc import Mapping
+
+from core.fuzzy_match import FuzzyMatcher
+from core.pinyin_index import (
+    PINYIN_MATCH_BOUNDARY,
+    PINYIN_MATCH_EXACT,
+    PINYIN_MATCH_PREFIX,
+    get_pinyin_cache,
+    normalize_pinyin_query,
+)
+from core.tool_record import ToolLibraryView, ToolRecord
+from core.tool_search_index import ToolSearchIndex, build_fuzzy_candidates
+
+# 拼音命中按名称的得分档处理：完整拼音 / 首字母等同名称相同，从首个音节开始等同名称前缀，
+# 从中间音节开始等同名称包含查询词
+PINYIN_MATCH_SCORES = {
+    PINYIN_MATCH_EXACT: 120,
+    PINYIN_MATCH_PREFIX: 104,
+    PINYIN_MATCH_BOUNDARY: 92,
+}
 
 
 class MainWindowSearchMixin:
@@ -82,24 +97,14 @@ class MainWindowSearchMixin:
         self.current_view_mode = "search"
         self._apply_view_state_layout()
         self._show_search_labels()
-        search_entries = self._get_tool_search_index()
-        base_tools = [entry["tool"] for entry in search_entries]
+        search_index = self._get_tool_search_index()
         query = query.lower()
 
         filtered_tools = []
         matched_ids = set()
-        for entry in search_entries:
+        for entry, score in self._match_search_index(search_index, query):
             tool = entry["tool"]
-            score = self._score_tool_match_text(
-                entry["name"],
-                entry["description"],
-                query,
-                entry.get("fuzzy_candidates"),
-            )
-            if score <= 0:
-                continue
-
-            tool_copy = dict(tool)
+            tool_copy = ToolRecord(tool)
             tool_copy["_search_score"] = score
             filtered_tools.append(tool_copy)
             if tool.get("id") is not None:
@@ -123,14 +128,15 @@ class MainWindowSearchMixin:
             if tool.get("id") is not None:
                 matched_ids.add(tool.get("id"))
 
-        for tool in base_tools:
+        for entry in search_index if note_hits_by_key else ():
+            tool = entry["tool"]
             tool_key = self.notes_manager.get_note_key(tool.get("id"), tool.get("name", ""))
             tool_id = tool.get("id")
             note_hit = note_hits_by_key.get(tool_key)
             if not note_hit or tool_id in matched_ids:
                 continue
 
-            tool_copy = dict(tool)
+            tool_copy = ToolRecord(tool)
             excerpt = note_hit.get("excerpt") or note_hit.get("summary") or tool.get("description", "")
             tool_copy["_display_description"] = f"笔记命中：{excerpt}"
             tool_copy["_search_score"] = 58
@@ -151,6 +157,36 @@ class MainWindowSearchMixin:
         self._display_tools(filtered_tools)
         self.refresh_tool_count()
 
+    def _match_search_index(self, search_index, query):
+        """只对倒排索引给出的候选条目打分，返回 [(条目, 得分)]，得分规则与 _score_tool_match_text 相同。
+
+        名称含汉字的工具还会按拼音全拼或首字母匹配，得分见 PINYIN_MATCH_SCORES。
+        """
+        matches = {}
+        for entry in search_index.substring_candidates(query):
+            score = self._score_tool_match_text(entry["name"], entry["description"], query, ())
+            if score > 0:
+                matches[id(entry)] = (entry, score)
+
+        pinyin_query = normalize_pinyin_query(query)
+        if pinyin_query:
+            for entry, level in search_index.pinyin_matches(pinyin_query):
+                score = PINYIN_MATCH_SCORES.get(level, 0)
+                if score and score > matches.get(id(entry), (None, 0))[1]:
+                    matches[id(entry)] = (entry, score)
+
+        if len(query) > 2:
+            # 模糊匹配：对去重后的候选词表打分一次，再取含有足够相似候选词的条目
+            ratios = self._score_fuzzy_vocabulary(search_index.fuzzy_tokens(query, 0.60), query)
+            for entry in search_index.entries_for_tokens(ratios):
+                if id(entry) in matches:
+                    continue
+                best_ratio = max(ratios.get(candidate, 0.0) for candidate in entry["fuzzy_candidates"])
+                score = self._fuzzy_score_tier(best_ratio)
+                if score > 0:
+                    matches[id(entry)] = (entry, score)
+        return list(matches.values())
+
     def _score_tool_match(self, tool, query):
         name = (tool.get("name") or "").lower()
         description = (tool.get("description") or "").lower()
@@ -175,30 +211,42 @@ class MainWindowSearchMixin:
             return score
 
         fuzzy_score = self._score_fuzzy_candidate_tokens(name, description, query, fuzzy_candidates)
+        return max(score, self._fuzzy_score_tier(fuzzy_score))
 
+    @staticmethod
+    def _fuzzy_score_tier(fuzzy_score):
         if fuzzy_score >= 0.85:
-            score = max(score, 64)
-        elif fuzzy_score >= 0.72:
-            score = max(score, 52)
-        elif fuzzy_score >= 0.60:
-            score = max(score, 38)
+            return 64
+        if fuzzy_score >= 0.72:
+            return 52
+        if fuzzy_score >= 0.60:
+            return 38
+        return 0
+
+    @staticmethod
+    def _fuzzy_candidate_in_range(candidate_len, query_len):
+        if candidate_len <= 1:
+            return False
+        if candidate_len > max(48, query_len * 4) and query_len < 12:
+            return False
+        return abs(candidate_len - query_len) <= max(10, query_len * 2)
 
-        return score
+    def _score_fuzzy_vocabulary(self, tokens, query):
+        """返回 {候选词: 相似度}，只包含相似度达到最低档（0.60）的词。"""
+        query_len = len(query)
+        matcher = FuzzyMatcher(query)
+        ratios = {}
+        for token in tokens:
+            # 含有查询词的候选词所在条目已经按子串命中，不必再算相似度
+            if query in token or not self._fuzzy_candidate_in_range(len(token), query_len):
+                continue
+            ratio = matcher.ratio(token, 0.60)
+            if ratio:
+                ratios[token] = ratio
+        return ratios
 
     def _build_search_fuzzy_candidates(self, name, description):
-        candidates = [name]
-        candidates.extend(_SEARCH_TOKEN_RE.findall(name))
-        candidates.extend(_SEARCH_TOKEN_RE.findall(description)[:16])
-
-        seen = set()
-        result = []
-        for candidate in candidates:
-            candidate = str(candidate or "").strip()
-            if not candidate or candidate in seen:
-                continue
-            seen.add(candidate)
-            result.append(candidate)
-        return tuple(result)
+        return build_fuzzy_candidates(name, description)
 
     def _score_fuzzy_candidate_tokens(self, name, description, query, fuzzy_candidates=None):
         query_len = len(query)
@@ -206,65 +254,61 @@ class MainWindowSearchMixin:
         if candidates is None:
             candidates = self._build_search_fuzzy_candidates(name, description)
 
+        matcher = FuzzyMatcher(query)
         best_score = 0.0
         for candidate in candidates:
             candidate = str(candidate or "").strip()
             if not candidate:
                 continue
 
-            candidate_len = len(candidate)
-            if candidate_len <= 1:
-                continue
-            if candidate_len > max(48, query_len * 4) and query_len < 12:
-                continue
-            if abs(candidate_len - query_len) > max(10, query_len * 2):
+            if not self._fuzzy_candidate_in_range(len(candidate), query_len):
                 continue
 
-            ratio = difflib.SequenceMatcher(None, query, candidate).ratio()
+            ratio = matcher.ratio(candidate)
             if ratio > best_score:
                 best_score = ratio
                 if best_score >= 0.95:
                     break
         return best_score
 
-    def _build_tool_search_index(self, tools=None):
-        tools = list(self._get_search_scope_tools() if tools is None else tools)
-        signature = tuple(
+    @staticmethod
+    def _tool_search_signature(tools):
+        if isinstance(tools, ToolLibraryView):
+            # 同一版本的工具库快照内容不变，不必逐条比较
+            return ("version", tools.version)
+        return tuple(
             (
                 tool.get("id"),
                 tool.get("name") or "",
                 tool.get("description") or "",
             )
             for tool in tools
-            if isinstance(tool, dict)
+            if isinstance(tool, Mapping)
         )
+
+    def _build_tool_search_index(self, tools=None):
+        """让倒排索引与 tools 同步；已有索引时只处理新增或名称、描述变化的工具。"""
+        tools = self._get_search_scope_tools() if tools is None else tools
+        if not isinstance(tools, ToolLibraryView):
+            tools = list(tools)
+        signature = self._tool_search_signature(tools)
+        search_index = getattr(self, "_tool_search_index", None)
+        pinyin_cache = self._get_pinyin_cache()
+        if search_index is None:
+            search_index = ToolSearchIndex(pinyin=pinyin_cache.keys)
+            self._tool_search_index = search_index
+        search_index.sync(tools, signature)
         self._tool_search_index_signature = signature
-        self._tool_search_index = [
-            {
-                "tool": tool,
-                "name": (tool.get("name") or "").lower(),
-                "description": (tool.get("description") or "").lower(),
-                "fuzzy_candidates": self._build_search_fuzzy_candidates(
-                    (tool.get("name") or "").lower(),
-                    (tool.get("description") or "").lower(),
-                ),
-            }
-            for tool in tools
-            if isinstance(tool, dict)
-        ]
-        return self._tool_search_index
+        # 新增或改名的工具转换了拼音时写回磁盘缓存，下次启动不必重新转换
+        pinyin_cache.flush()
+        return search_index
+
+    def _get_pinyin_cache(self):
+        return get_pinyin_cache(getattr(self, "config_dir", None))
 
     def _get_tool_search_index(self):
         tools = self._get_search_scope_tools()
-        signature = tuple(
-            (
-                tool.get("id"),
-                tool.get("name") or "",
-                tool.get("description") or "",
-            )
-            for tool in tools
-            if isinstance(tool, dict)
-        )
+        signature = self._tool_search_signature(tools)
         if (
             getattr(self, "_tool_search_index", None) is None
             or getattr(self, "_tool_search_index_signature", None) != signature
@@ -273,7 +317,7 @@ class MainWindowSearchMixin:
         return self._tool_search_index
 
     def invalidate_search_index(self):
-        self._tool_search_index = None
+        # 保留倒排索引本身，下次搜索时按工具记录增量同步
         self._tool_search_index_signature = None
         self._note_search_cache = {}
 
@@ -298,7 +342,7 @@ class MainWindowSearchMixin:
 
     def _get_search_scope_tools(self):
         """获取全局搜索范围内的工具列表。"""
-        return self.data_manager.load_tools()
+        return self.data_manager.get_tools_view()
 
     def _get_base_tool_list_for_current_view(self):
         """获取当前视图基础工具列表。"""
@@ -213,12 +213,20 @@ class MarkdownHighlighter(QSyntaxHighlighter):
 class MarkdownNoteDialog(QDialog):
     IMAGE_PATTERN = QRegularExpression(r'!\[[^\]]*\]\(([^\)]+)\)')
 
-    def __init__(self, tool_id=None, tool_name: str = '', repo_root: str = None, parent=None, theme_name: str = None):
+    def __init__(
+        self,
+        tool_id=None,
+        tool_name: str = '',
+        repo_root: str = None,
+        parent=None,
+        theme_name: str = None,
+        notes_manager: NotesManager = None,
+    ):
         super().__init__(parent)
         self.tool_id = tool_id
         self.tool_name = tool_name or 'untitled'
         self.theme = theme_name or getattr(parent, 'current_theme', 'dark_green')
-        self.notes = NotesManager(repo_root=repo_root)
+        self.notes = notes_manager or NotesManager(repo_root=repo_root)
 
         self._dirty = False
         self._last_saved_content = ''
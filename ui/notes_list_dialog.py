@@ -14,9 +14,10 @@ from ui.record_list_model import RECORD_ROLE, RecordListDelegate, RecordListMode
 
 
 class NotesListDialog(QDialog):
-    def __init__(self, repo_root=None, theme_name=None, parent=None):
+    def __init__(self, repo_root=None, theme_name=None, parent=None, notes_manager=None):
         super().__init__(parent)
-        self.notes = NotesManager(repo_root=repo_root)
+        # 共用主窗口的 NotesManager，保存笔记后主窗口的笔记索引也随之更新
+        self.notes = notes_manager or NotesManager(repo_root=repo_root)
         self.theme_name = theme_name or getattr(parent, 'current_theme', 'dark_green') if parent is not None else 'dark_green'
         self.note_records = []
 
@@ -96,6 +97,7 @@ class NotesListDialog(QDialog):
             repo_root=self.notes.repo_root,
             parent=self,
             theme_name=self.theme_name,
+            notes_manager=self.notes,
         )
         dialog.exec_()
         self.refresh_list()
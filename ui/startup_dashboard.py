@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Startup dashboard with recent and favorite tool sections."""
 
+from collections.abc import Mapping
 from datetime import datetime
 from math import ceil
 
@@ -9,6 +10,7 @@ from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget, QAbstractItemView, QScrollArea, QSizePolicy
 
 from core.style_manager import ThemeManager
+from core.tool_record import ToolRecord
 from ui.tool_model_view import ToolCardContainer
 
 
@@ -90,8 +92,8 @@ class DashboardSection(QWidget):
 
 
 class DashboardContainer(QWidget):
-    run_tool = pyqtSignal(dict)
-    edit_requested = pyqtSignal(dict)
+    run_tool = pyqtSignal(object)
+    edit_requested = pyqtSignal(object)
     deleted = pyqtSignal(int)
     toggle_favorite = pyqtSignal(int)
     tool_order_changed = pyqtSignal(list)
@@ -148,7 +150,7 @@ class DashboardContainer(QWidget):
         self.setStyleSheet(ThemeManager().get_dashboard_style(self.current_theme))
 
     def display_tools(self, tools_data):
-        self._tools = [tool for tool in (tools_data or []) if isinstance(tool, dict)]
+        self._tools = [tool for tool in (tools_data or []) if isinstance(tool, Mapping)]
         self.recent_section.display_tools(self._recent_tools(self._tools))
         self.favorite_section.display_tools(self._favorite_tools(self._tools))
 
@@ -179,9 +181,7 @@ class DashboardContainer(QWidget):
 
     @staticmethod
     def _copy_with_description(tool, description):
-        copied = dict(tool)
-        copied["_display_description"] = str(description or "").strip()
-        return copied
+        return ToolRecord(tool, _display_description=str(description or "").strip())
 
     @staticmethod
     def _last_used_sort_key(value):
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-"""Bulk tool deletion dialog."""
+"""Bulk tool deletion / editing dialog."""
 
 from PyQt5.QtWidgets import (
     QAbstractItemView,
     QDialog,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QListView,
@@ -14,25 +15,40 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
 )
 
+from core.category_index import CategoryIndex
+from core.pinyin_index import get_pinyin_cache, normalize_pinyin_query, pinyin_match_level
 from core.style_manager import ThemeManager
 from ui.record_list_model import RecordListDelegate, RecordListModel
 
+BULK_ACTION_DELETE = "delete"
+BULK_ACTION_FAVORITE = "favorite"
+BULK_ACTION_UNFAVORITE = "unfavorite"
+BULK_ACTION_MOVE = "move"
+
 
 class ToolBulkDeleteDialog(QDialog):
-    """Select multiple tool records for deletion."""
+    """Select multiple tool records for deletion, favoriting or moving to another category."""
+
+    ACTION_DELETE = BULK_ACTION_DELETE
+    ACTION_FAVORITE = BULK_ACTION_FAVORITE
+    ACTION_UNFAVORITE = BULK_ACTION_UNFAVORITE
+    ACTION_MOVE = BULK_ACTION_MOVE
 
     def __init__(self, tools, categories=None, theme_name=None, parent=None):
         super().__init__(parent)
         self.tools = [tool for tool in (tools or []) if isinstance(tool, dict)]
-        self.category_labels = self._build_category_labels(categories or [])
+        self.category_labels = self._build_category_labels(categories)
+        self.pinyin_cache = get_pinyin_cache(getattr(parent, "config_dir", None))
         self.theme_name = theme_name or (
             getattr(parent, "current_theme", "dark_green") if parent is not None else "dark_green"
         )
         self.checked_tool_ids = set()
         self.selected_tool_ids = []
+        self.selected_action = self.ACTION_DELETE
+        self.selected_target = None
         self.visible_tool_ids = []
 
-        self.setWindowTitle("批量删除工具")
+        self.setWindowTitle("批量管理工具")
         self.setMinimumSize(760, 560)
         self._init_ui()
         self._apply_theme_styles()
@@ -43,7 +59,7 @@ class ToolBulkDeleteDialog(QDialog):
         layout.setContentsMargins(18, 18, 18, 16)
         layout.setSpacing(10)
 
-        title = QLabel("选择要从工具箱配置中删除的工具", self)
+        title = QLabel("选择要批量删除、收藏或移动的工具", self)
         title.setObjectName("titleLabel")
         layout.addWidget(title)
 
@@ -54,7 +70,7 @@ class ToolBulkDeleteDialog(QDialog):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("搜索:", self))
         self.search_input = QLineEdit(self)
-        self.search_input.setPlaceholderText("按名称、路径、描述或分类搜索...")
+        self.search_input.setPlaceholderText("按名称、路径、描述或分类搜索，支持拼音...")
         self.search_input.textChanged.connect(self.refresh_list)
         search_layout.addWidget(self.search_input, 1)
         layout.addLayout(search_layout)
@@ -90,9 +106,19 @@ class ToolBulkDeleteDialog(QDialog):
         buttons.addWidget(self.clear_button)
         buttons.addStretch()
 
+        self.favorite_button = QPushButton("收藏选中", self)
+        self.favorite_button.clicked.connect(lambda: self.accept_selected_tools(self.ACTION_FAVORITE))
+        self.unfavorite_button = QPushButton("取消收藏", self)
+        self.unfavorite_button.clicked.connect(lambda: self.accept_selected_tools(self.ACTION_UNFAVORITE))
+        self.move_button = QPushButton("移动到分类...", self)
+        self.move_button.clicked.connect(self.choose_move_target)
+        buttons.addWidget(self.favorite_button)
+        buttons.addWidget(self.unfavorite_button)
+        buttons.addWidget(self.move_button)
+
         self.delete_button = QPushButton("删除选中", self)
         self.delete_button.setObjectName("dangerButton")
-        self.delete_button.clicked.connect(self.accept_selected_tools)
+        self.delete_button.clicked.connect(lambda: self.accept_selected_tools(self.ACTION_DELETE))
         self.close_button = QPushButton("关闭", self)
         self.close_button.clicked.connect(self.reject)
         buttons.addWidget(self.delete_button)
@@ -101,22 +127,10 @@ class ToolBulkDeleteDialog(QDialog):
 
     @staticmethod
     def _build_category_labels(categories):
-        labels = {}
-        for category in categories:
-            if not isinstance(category, dict):
-                continue
-            category_id = category.get("id")
-            category_name = str(category.get("name") or "未命名分类").strip()
-            if category_id is not None:
-                labels[(category_id, None)] = category_name
-            for subcategory in category.get("subcategories", []) or []:
-                if not isinstance(subcategory, dict):
-                    continue
-                subcategory_id = subcategory.get("id")
-                subcategory_name = str(subcategory.get("name") or "未命名子分类").strip()
-                if category_id is not None and subcategory_id is not None:
-                    labels[(category_id, subcategory_id)] = f"{category_name} / {subcategory_name}"
-        return labels
+        """categories 可以是分类列表，也可以是 DataManager.get_category_index() 返回的索引。"""
+        if not isinstance(categories, CategoryIndex):
+            categories = CategoryIndex(categories)
+        return categories.labels
 
     def _tool_category_label(self, tool):
         category_id = tool.get("category_id")
@@ -150,7 +164,14 @@ class ToolBulkDeleteDialog(QDialog):
                 self._tool_category_label(tool),
             )
         ).casefold()
-        return query in haystack
+        if query in haystack:
+            return True
+        # 名称和分类还可以按拼音全拼或首字母搜索
+        pinyin_query = normalize_pinyin_query(query)
+        return bool(pinyin_query) and any(
+            pinyin_match_level(pinyin_query, self.pinyin_cache.keys(str(text or "").casefold()))
+            for text in (tool.get("name"), self._tool_category_label(tool))
+        )
 
     def refresh_list(self):
         query = (self.search_input.text() or "").strip().casefold()
@@ -177,7 +198,9 @@ class ToolBulkDeleteDialog(QDialog):
         self.summary_label.setText(
             f"共 {len(self.tools)} 个工具，当前显示 {visible_count} 个，已选择 {checked_count} 个"
         )
-        self.delete_button.setEnabled(checked_count > 0)
+        for button in (self.delete_button, self.favorite_button, self.unfavorite_button, self.move_button):
+            button.setEnabled(checked_count > 0)
+        self.move_button.setEnabled(checked_count > 0 and bool(self.category_labels))
         self.select_visible_button.setEnabled(visible_count > 0)
         self.clear_button.setEnabled(checked_count > 0)
 
@@ -193,9 +216,20 @@ class ToolBulkDeleteDialog(QDialog):
         self.checked_tool_ids.clear()
         self.refresh_list()
 
-    def accept_selected_tools(self):
+    def choose_move_target(self):
         if not self.checked_tool_ids:
-            QMessageBox.information(self, "未选择", "请先勾选要删除的工具。")
+            QMessageBox.information(self, "未选择", "请先勾选要移动的工具。")
+            return
+        targets = sorted(self.category_labels.items(), key=lambda item: item[1])
+        labels = [label for _, label in targets]
+        label, ok = QInputDialog.getItem(self, "移动到分类", "目标分类:", labels, 0, False)
+        if not ok or label not in labels:
+            return
+        self.accept_selected_tools(self.ACTION_MOVE, targets[labels.index(label)][0])
+
+    def accept_selected_tools(self, action=ACTION_DELETE, target=None):
+        if not self.checked_tool_ids:
+            QMessageBox.information(self, "未选择", "请先勾选要处理的工具。")
             return
 
         ordered_ids = []
@@ -206,10 +240,16 @@ class ToolBulkDeleteDialog(QDialog):
                 ordered_ids.append(tool_id)
                 seen_ids.add(tool_id)
         self.selected_tool_ids = ordered_ids
+        self.selected_action = action
+        self.selected_target = target
         self.accept()
 
     def get_selected_tool_ids(self):
         return list(self.selected_tool_ids)
 
+    def get_selected_action(self):
+        """返回 (操作, 目标)；移动操作的目标为 (分类 id, 子分类 id 或 None)。"""
+        return self.selected_action, self.selected_target
+
     def _apply_theme_styles(self):
         self.setStyleSheet(ThemeManager().get_dialog_list_style(self.theme_name))
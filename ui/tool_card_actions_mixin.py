@@ -1,6 +1,7 @@
 import os
 import subprocess
 import sys
+from collections.abc import Mapping
 
 from PyQt5.QtWidgets import QMessageBox
 from core.tool_launch_service import ToolLaunchService
@@ -55,7 +56,7 @@ class ToolCardActionsMixin:
     def warn_missing_tool_target_dir(self, tool_data=None):
         """提示当前工具没有可用的目录上下文。"""
         tool_name = ""
-        if isinstance(tool_data, dict):
+        if isinstance(tool_data, Mapping):
             tool_name = str(tool_data.get("name", "") or "").strip()
         if not tool_name:
             tool_name = "当前工具"
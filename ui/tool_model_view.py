@@ -5,6 +5,7 @@
 这种实现方式通过虚拟化渲染，可以实现海量数据的毫秒级加载。
 """
 import os
+from collections.abc import Mapping
 from time import monotonic
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QListView, QStyledItemDelegate,
                             QAbstractItemView, QMenu, QMessageBox, QStyle)
@@ -21,6 +22,7 @@ from core.path_status_service import (
 )
 from core.runtime_paths import get_runtime_state_root
 from core.tool_metadata import infer_display_tool_type_label
+from core.tool_record import ToolDisplayTable, ToolRecord
 # 本地笔记对话框（右键笔记功能）
 try:
     from ui.markdown_note_dialog import MarkdownNoteDialog
@@ -139,8 +141,9 @@ class ToolModel(QAbstractListModel):
         self.beginResetModel()
         prepared_tools = []
         for tool in tools or []:
-            if isinstance(tool, dict):
-                prepared_tool = dict(tool)
+            if isinstance(tool, Mapping):
+                # 调用方已经准备好的展示视图直接使用，不再包一层
+                prepared_tool = tool if isinstance(tool, ToolRecord) else ToolRecord(tool)
                 prepared_tool["_display_type_label"] = (
                     prepared_tool.get("_display_type_label")
                     or infer_display_tool_type_label(prepared_tool)
@@ -1355,8 +1358,8 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
     """
 
     # 信号定义 (保持兼容)
-    run_tool = pyqtSignal(dict)
-    edit_requested = pyqtSignal(dict)
+    run_tool = pyqtSignal(object)
+    edit_requested = pyqtSignal(object)
     deleted = pyqtSignal(int)
     toggle_favorite = pyqtSignal(int)
     tool_order_changed = pyqtSignal(list)
@@ -1382,6 +1385,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         self._metadata_cache_ttl_seconds = 30.0
         self._type_label_cache = {}
         self._icon_key_cache = {}
+        self._display_records = ToolDisplayTable()
         self._path_status_generation = 0
         self._async_path_status_enabled = True
         self.path_status_service = PathStatusService(self, ttl_seconds=self._metadata_cache_ttl_seconds)
@@ -1413,7 +1417,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         seen = set()
         tools = self.model.tools() if hasattr(self, "model") else []
         for row_idx, tool in enumerate(tools):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             if tool.get("_path_status") not in (None, PathStatus.UNKNOWN, PathStatus.LOADING):
                 continue
@@ -1436,8 +1440,8 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
 
         self.view = ToolListView()
-        self.model = ToolModel()
-        self.delegate = ToolDelegate(self.current_theme)
+        self.model = ToolModel(parent=self)
+        self.delegate = ToolDelegate(self.current_theme, parent=self.view)
 
         self.view.setModel(self.model)
         self.view.setItemDelegate(self.delegate)
@@ -1648,6 +1652,17 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         self._schedule_path_status_warmup()
         self._request_icon_warmup()
 
+    def _get_precomputed_type_label_source(self):
+        """启动快照里已经算好的类型标签由 DataManager 提供；拿不到时每条都返回 None。"""
+        try:
+            data_manager = getattr(self.window(), "data_manager", None)
+        except Exception:
+            data_manager = None
+        get_tool_type_label = getattr(data_manager, "get_tool_type_label", None)
+        if get_tool_type_label is None:
+            return lambda tool: None
+        return get_tool_type_label
+
     def _resolve_metadata_base_dir(self):
         base_dir = os.fspath(get_runtime_state_root())
         try:
@@ -1743,7 +1758,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         base_dir = self._resolve_metadata_base_dir()
         viewport = self.view.viewport()
         for row, tool in enumerate(self.model.tools()):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             if self._path_status_cache_key(tool, base_dir) != cache_key:
                 continue
@@ -1762,16 +1777,20 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         self._path_status_generation += 1
         self.path_status_service.cancel_generation(self._path_status_generation - 1)
 
+        precomputed_type_label = self._get_precomputed_type_label_source()
+
         prepared_tools = []
         for tool in tools_data or []:
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 prepared_tools.append(tool)
                 continue
-            prepared_tool = dict(tool)
+            prepared_tool = self._display_records.record(tool)
             prepared_tool["_display_type_label"] = self._get_cached_metadata_value(
                 self._type_label_cache,
                 self._type_label_cache_key(prepared_tool, base_dir),
-                lambda tool=prepared_tool: infer_display_tool_type_label(tool),
+                lambda tool=prepared_tool, source=tool: (
+                    precomputed_type_label(source) or infer_display_tool_type_label(tool)
+                ),
                 str(prepared_tool.get("_display_type_label") or ""),
             )
             path_status_key = self._path_status_cache_key(prepared_tool, base_dir)
@@ -1812,7 +1831,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         seen_keys = set()
 
         for row, tool in enumerate(self.model.tools()):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             if tool.get("_path_status") not in (None, PathStatus.UNKNOWN, PathStatus.LOADING):
                 continue
@@ -1846,7 +1865,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
         visible_tools = []
         fallback_tools = []
         for row, tool in enumerate(self.model.tools()):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             cache_key = self._icon_key_cache_key(tool)
             if cache_key in self._icon_warmup_seen:
@@ -1888,7 +1907,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
 
         viewport = self.view.viewport()
         for row, tool in enumerate(self.model.tools()):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             current_icon_key = os.fspath(tool.get("_icon_cache_key") or "")
             if current_icon_key != target_path:
@@ -1901,7 +1920,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
 
     def _update_rows_for_auto_icon(self, icon_path, source_tool):
         target_path = os.fspath(icon_path or "")
-        if not target_path or not isinstance(source_tool, dict):
+        if not target_path or not isinstance(source_tool, Mapping):
             return
 
         source_identity = get_tool_icon_identity(source_tool)
@@ -1910,7 +1929,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
 
         viewport = self.view.viewport()
         for row, tool in enumerate(self.model.tools()):
-            if not isinstance(tool, dict):
+            if not isinstance(tool, Mapping):
                 continue
             if get_tool_icon_identity(tool) != source_identity:
                 continue
@@ -2042,6 +2061,7 @@ class ToolCardContainer(ToolCardActionsMixin, QWidget):
             repo_root=repo_root,
             parent=self,
             theme_name=getattr(self, 'current_theme', None),
+            notes_manager=getattr(self.window(), 'notes_manager', None),
         )
         dialog.exec_()
         window = self.window()